@@ -1,10 +1,13 @@
 # ––– DJANGO IMPORTS
-from django.utils.timezone import now
-from django.utils.translation import gettext_lazy as _
+from django import forms
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils.timezone import localdate
 
 
 # ––– PYTHON UTILITY IMPORTS
 import datetime as dt
+from typing import Tuple
 
 
 # ––– THIRD-PARTY IMPORTS
@@ -15,36 +18,111 @@ import django_filters
 from apps.common import models
 
 
-class OrderDateRangeFilter(django_filters.DateRangeFilter):
-    """ Customize default backwards-looking ranges """
-
-    choices = [
-        ("past_current_year", _(f"YTD ({now().year})")),
-        ("past_years_plus_1", _(f"{now().year - 1}")),
-        ("past_years_plus_2", _(f"{now().year - 2}")),
-        ("past_years_plus_3", _(f"{now().year - 3}")),
-    ]
-
-    filters = {
-        "past_current_year": lambda qs, name: qs.filter(
-            **{
-                "%s__year" % name: now().year,
-                "%s__lt" % name: now(),
-            }
-        ),
-        "past_years_plus_1": lambda qs, name: qs.filter(
-            **{
-                "%s__year" % name: now().year - 1,
-            }
-        ),
-        "past_years_plus_2": lambda qs, name: qs.filter(
-            **{
-                "%s__year" % name: now().year - 2,
-            }
-        ),
-        "past_years_plus_3": lambda qs, name: qs.filter(
-            **{
-                "%s__year" % name: now().year - 3,
-            }
-        ),
+"""
+Date ranges
+- presets and custom "YYYY-MM-DD to YYYY-MM-DD" ranges (end date inclusive) resolve to half-open
+  [start, end) dates, so filters compare the column directly and can use its index
+- presets are resolved per call, so labels and years follow the calendar in long-running workers
+- fiscal years start on the first of FISCAL_YEAR_START_MONTH and are named by the year they end in
+"""
+
+YEARS_BACK = 3
+
+
+def get_fiscal_year_start(*, day: dt.date) -> dt.date:
+    month = settings.FISCAL_YEAR_START_MONTH
+    return dt.date(day.year if day.month >= month else day.year - 1, month, 1)
+
+
+def get_date_range_presets(*, today: dt.date = None) -> dict:
+    """ {key: (label, start, end)} of backwards-looking presets as of today, end exclusive """
+
+    today = today or localdate()
+    presets = {
+        "past_current_year": (f"YTD ({today.year})", dt.date(today.year, 1, 1), today)
     }
+    for years in range(1, YEARS_BACK + 1):
+        year = today.year - years
+        presets[f"past_years_plus_{years}"] = (
+            f"{year}",
+            dt.date(year, 1, 1),
+            dt.date(year + 1, 1, 1),
+        )
+
+    fiscal_year_start = get_fiscal_year_start(day=today)
+    fiscal_year = fiscal_year_start.year + (fiscal_year_start.month > 1)
+    presets["fiscal_current_year"] = (
+        f"FYTD (FY{fiscal_year})",
+        fiscal_year_start,
+        today,
+    )
+    presets["fiscal_prior_year"] = (
+        f"FY{fiscal_year - 1}",
+        fiscal_year_start.replace(year=fiscal_year_start.year - 1),
+        fiscal_year_start,
+    )
+    return presets
+
+
+def get_date_range_choices() -> list:
+    return [(key, label) for key, (label, *_) in get_date_range_presets().items()]
+
+
+def get_date_range(*, value: str, today: dt.date = None) -> Tuple[dt.date, dt.date]:
+    """ Half-open (start, end) of a preset key or a custom range; raises ValueError if neither """
+
+    presets = get_date_range_presets(today=today)
+    if value in presets:
+        return presets[value][1:]
+
+    start, separator, end = value.partition(" to ")
+    if not separator:
+        raise ValueError(f"Malformed date range {value!r}")
+    start, end = (
+        dt.datetime.strptime(date.strip(), "%Y-%m-%d").date() for date in [start, end]
+    )
+    return start, end + dt.timedelta(days=1)
+
+
+def filter_date_range(
+    *, queryset: QuerySet, field: str, start: dt.date, end: dt.date
+) -> QuerySet:
+    return queryset.filter(**{f"{field}__gte": start, f"{field}__lt": end})
+
+
+class DateRangeWidget(forms.Select):
+    """ Presets as options, listed when rendered; a custom range is kept as an extra option """
+
+    def get_context(self, name, value, attrs):
+        self.choices = [("", "---------")] + get_date_range_choices()
+        if value and value not in dict(self.choices):
+            self.choices.append((value, value))
+        return super().get_context(name, value, attrs)
+
+
+class DateRangeField(forms.CharField):
+    """ A preset key or a custom "YYYY-MM-DD to YYYY-MM-DD" range """
+
+    widget = DateRangeWidget
+
+    def validate(self, value):
+        super().validate(value)
+        if value:
+            try:
+                get_date_range(value=value)
+            except ValueError:
+                raise forms.ValidationError("Enter a date range or a preset range.")
+
+
+class OrderDateRangeFilter(django_filters.CharFilter):
+    """ Backwards-looking year and fiscal year presets or a custom range, resolved when filtering """
+
+    field_class = DateRangeField
+
+    def filter(self, qs, value):
+        if not value:
+            return qs
+
+        start, end = get_date_range(value=value)
+        qs = filter_date_range(queryset=qs, field=self.field_name, start=start, end=end)
+        return qs.distinct() if self.distinct else qs
@@ -0,0 +1,68 @@
+# ––– DJANGO IMPORTS
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils.module_loading import import_string
+
+
+# ––– PYTHON UTILITY IMPORTS
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+
+"""
+Background jobs
+A job is a dotted path to a function plus JSON-serializable keyword arguments, run after commit
+JOB_BACKEND selects where jobs run:
+- "celery": sent to the celery worker as apps.common.run_job (requires celery, see config/celery.py)
+- "thread" (default): in-process pool of JOB_THREAD_WORKERS threads, lost if the process exits
+- "sync": inline on commit, for tests and management commands
+"""
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "JOB_THREAD_WORKERS", 2),
+                thread_name_prefix="job",
+            )
+    return _executor
+
+
+def run_job(func_path: str, kwargs: dict) -> None:
+    """ Runs job with fresh database connections; errors are logged, jobs record their own failures """
+
+    close_old_connections()
+    try:
+        import_string(func_path)(**kwargs)
+    except Exception:
+        logger.exception(f"Job {func_path} failed")
+    finally:
+        close_old_connections()
+
+
+def submit_job(func_path: str, kwargs: dict) -> None:
+    backend = getattr(settings, "JOB_BACKEND", "thread")
+
+    if backend == "celery":
+        from apps.common.tasks import run_job_task
+
+        run_job_task.delay(func_path, kwargs)
+    elif backend == "sync":
+        import_string(func_path)(**kwargs)
+    else:
+        get_executor().submit(run_job, func_path, kwargs)
+
+
+def enqueue_job(func_path: str, **kwargs) -> None:
+    """ Submits job once the current transaction commits, so it sees rows created alongside it """
+    transaction.on_commit(lambda: submit_job(func_path, kwargs))
@@ -0,0 +1,45 @@
+# ––– DJANGO IMPORTS
+from django.core.management.base import BaseCommand
+
+
+# ––– APPLICATION IMPORTS
+from apps.common import middleware
+
+
+class Command(BaseCommand):
+    help = "Summarizes buffered query instrumentation records, worst views first"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=20, help="Number of views")
+        parser.add_argument(
+            "--clear", action="store_true", help="Clear buffer after reporting"
+        )
+
+    def handle(self, *args, **options):
+        report = middleware.get_query_report(limit=options["limit"])
+
+        if not report:
+            self.stdout.write("No query records buffered")
+
+        for row in report:
+            self.stdout.write(
+                self.style.WARNING(row["view"]) if row["over_budget"] else row["view"]
+            )
+            self.stdout.write(
+                f"  requests {row['requests']}, "
+                f"queries avg {row['avg_queries']} max {row['max_queries']} "
+                f"(budget {row['budget']}, exceeded {row['over_budget']}x), "
+                f"db time avg {row['avg_time_ms']} ms max {row['max_time_ms']} ms"
+            )
+            if row["cache"]:
+                self.stdout.write(
+                    "  cache "
+                    + ", ".join(
+                        f"{name} {count}" for name, count in row["cache"].items()
+                    )
+                )
+            for sql, count in row["top_sql"]:
+                self.stdout.write(f"  {count:>5}x  {sql[:160]}")
+
+        if options["clear"]:
+            middleware.clear_query_records()
@@ -0,0 +1,191 @@
+# ––– DJANGO IMPORTS
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils import timezone
+
+
+# ––– PYTHON UTILITY IMPORTS
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+import logging
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+"""
+Query instrumentation
+- enable with QUERY_INSTRUMENTATION_ENABLED (env var of same name), otherwise the middleware is skipped
+- per-view budgets (max queries) in QUERY_BUDGETS, keyed by view name ("apps.orders:order_detail")
+- QUERY_BUDGET_ACTION "log" logs a warning when a budget is exceeded, "raise" raises QueryBudgetExceeded
+- one record per request is kept in a ring buffer of QUERY_INSTRUMENTATION_BUFFER_SIZE entries in the
+  default cache; shared across workers with a shared cache (redis, memcached), per process with locmem
+- queries issued while a StreamingHttpResponse is consumed fall outside the request and are not counted
+- application caches report hits and misses per request through record_cache_event
+"""
+
+BUFFER_KEY_PREFIX = "query_instrumentation"
+TOP_SQL_COUNT = 5
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryRecorder:
+    """ Database execute wrapper counting queries, DB time and repeated SQL """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+        self.cache_events = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+
+class QueryInstrumentationMiddleware:
+    """ Records queries per request; recorder is available to views as request.query_recorder """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_INSTRUMENTATION_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        request.query_recorder = recorder
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        view_name = get_view_name(request)
+        budget = getattr(settings, "QUERY_BUDGETS", {}).get(view_name)
+        record = {
+            "view": view_name,
+            "path": request.path,
+            "method": request.method,
+            "status_code": response.status_code,
+            "queries": recorder.count,
+            "time_ms": round(recorder.duration * 1000, 2),
+            "top_sql": recorder.statements.most_common(TOP_SQL_COUNT),
+            "cache": dict(recorder.cache_events),
+            "budget": budget,
+            "over_budget": budget is not None and recorder.count > budget,
+            "timestamp": timezone.now().isoformat(),
+        }
+        push_query_record(record)
+
+        if record["over_budget"]:
+            message = (
+                f"{view_name} issued {recorder.count} queries "
+                f"(budget {budget}) for {request.method} {request.path}"
+            )
+            if getattr(settings, "QUERY_BUDGET_ACTION", "log") == "raise":
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
+
+
+def record_cache_event(request, *, name: str, hit: bool) -> None:
+    """ Counts a hit or miss of cache name against the request; no-op when instrumentation is off """
+
+    logger.debug(f"{name} cache {'hit' if hit else 'miss'} for {request.path}")
+    recorder = getattr(request, "query_recorder", None)
+    if recorder is not None:
+        recorder.cache_events[f"{name}:{'hits' if hit else 'misses'}"] += 1
+
+
+def get_view_name(request) -> str:
+    resolver_match = getattr(request, "resolver_match", None)
+    if resolver_match is None:
+        return request.path
+    return resolver_match.view_name or resolver_match._func_path
+
+
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+# ROLLING BUFFER
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+
+
+def get_buffer_size() -> int:
+    return getattr(settings, "QUERY_INSTRUMENTATION_BUFFER_SIZE", 1000)
+
+
+def push_query_record(record: dict) -> None:
+    """ Writes record to next slot of ring buffer; incr keeps slots distinct across workers """
+
+    cursor_key = f"{BUFFER_KEY_PREFIX}:cursor"
+    cache.add(cursor_key, 0, timeout=None)
+    try:
+        cursor = cache.incr(cursor_key)
+    except ValueError:
+        # cursor evicted between add and incr
+        cache.set(cursor_key, 0, timeout=None)
+        cursor = 0
+
+    cache.set(f"{BUFFER_KEY_PREFIX}:{cursor % get_buffer_size()}", record, timeout=None)
+
+
+def get_query_records() -> list:
+    keys = [f"{BUFFER_KEY_PREFIX}:{slot}" for slot in range(get_buffer_size())]
+    return sorted(cache.get_many(keys).values(), key=lambda record: record["timestamp"])
+
+
+def clear_query_records() -> None:
+    keys = [f"{BUFFER_KEY_PREFIX}:{slot}" for slot in range(get_buffer_size())]
+    cache.delete_many(keys + [f"{BUFFER_KEY_PREFIX}:cursor"])
+
+
+def get_query_report(*, limit: int = 20) -> list:
+    """ Buffered records aggregated per view, worst (most queries in a single request) first """
+
+    records_by_view = defaultdict(list)
+    for record in get_query_records():
+        records_by_view[record["view"]].append(record)
+
+    report = []
+    for view_name, records in records_by_view.items():
+        # most repeated SQL: highest repetition seen within a single request
+        statements = Counter()
+        for record in records:
+            for sql, count in record["top_sql"]:
+                statements[sql] = max(statements[sql], count)
+
+        cache_events = Counter()
+        for record in records:
+            cache_events.update(record.get("cache", {}))
+
+        queries = [record["queries"] for record in records]
+        times = [record["time_ms"] for record in records]
+        report.append(
+            {
+                "view": view_name,
+                "requests": len(records),
+                "budget": records[-1]["budget"],
+                "over_budget": sum(record["over_budget"] for record in records),
+                "avg_queries": round(sum(queries) / len(records), 1),
+                "max_queries": max(queries),
+                "avg_time_ms": round(sum(times) / len(records), 2),
+                "max_time_ms": max(times),
+                "top_sql": statements.most_common(TOP_SQL_COUNT),
+                "cache": dict(sorted(cache_events.items())),
+            }
+        )
+
+    report.sort(key=lambda row: (row["max_queries"], row["avg_time_ms"]), reverse=True)
+
+    return report[:limit]
@@ -1,3 +1,7 @@
+# ––– PYTHON UTILITY IMPORTS
+import re
+
+
 def get_list_display_session_options(
     request, model, filter_by="ALL", order_by_field="name", page_size=10
 ):
@@ -36,3 +40,42 @@ def get_page_context_options(model, bulk_create_available=False, edit_via_xlsx=F
         ] = f"apps.{model._meta.app_label}:{model._meta.model_name}_edit_via_xlsx"
 
     return options
+
+
+"""
+Query plans
+EXPLAIN output of a queryset on its own database, and the tables it walks end to end: SQLite
+"SCAN <table>" and PostgreSQL "Seq Scan on <table>"
+A SQLite walk in index order counts too, unless the queryset is sliced and the walk stops there
+"""
+
+FULL_SCAN_PATTERNS = [
+    re.compile(r"\bSCAN (?!CONSTANT ROW|SUBQUERY)(\w+)$"),
+    re.compile(r"\bSeq Scan on (\w+)"),
+]
+INDEX_SCAN_PATTERNS = [
+    re.compile(r"\bSCAN (\w+) USING (?:COVERING )?INDEX \w+$"),
+]
+
+
+def get_query_plan(*, queryset) -> list:
+    """ EXPLAIN plan of queryset, one line per plan node """
+
+    if queryset.query.is_empty():
+        return []
+    return queryset.explain().splitlines()
+
+
+def get_full_scans(*, queryset) -> list:
+    """ Tables queryset walks end to end, in plan order """
+
+    patterns = FULL_SCAN_PATTERNS
+    if queryset.query.high_mark is None:
+        patterns = FULL_SCAN_PATTERNS + INDEX_SCAN_PATTERNS
+    return [
+        match.group(1)
+        for line in get_query_plan(queryset=queryset)
+        for pattern in patterns
+        for match in [pattern.search(line.strip())]
+        if match
+    ]
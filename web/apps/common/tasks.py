@@ -0,0 +1,11 @@
+# ––– THIRD-PARTY IMPORTS
+from celery import shared_task
+
+
+# ––– APPLICATION IMPORTS
+from apps.common import jobs
+
+
+@shared_task(name="apps.common.run_job")
+def run_job_task(func_path: str, kwargs: dict) -> None:
+    jobs.run_job(func_path, kwargs)
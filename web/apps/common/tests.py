@@ -1,5 +1,152 @@
 # ––– DJANGO IMPORTS
-from django.test import TestCase
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 
 
-# Create your tests here.
+# ––– PYTHON UTILITY IMPORTS
+import datetime as dt
+from io import StringIO
+from unittest import mock
+
+
+# ––– APPLICATION IMPORTS
+from apps.common import filters, middleware
+from apps.orders import filters as orders_filters, models as orders_models
+from apps.users import models as users_models
+
+
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+# QUERY INSTRUMENTATION
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+
+
+@override_settings(QUERY_INSTRUMENTATION_ENABLED=True, QUERY_BUDGETS={})
+class QueryInstrumentationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = users_models.User.objects.create(
+            email="staff@example.com", is_staff=True
+        )
+
+    def setUp(self):
+        middleware.clear_query_records()
+        self.client.force_login(self.user)
+
+    def test_request_is_recorded_per_view(self):
+        self.client.get("/")
+
+        records = middleware.get_query_records()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["view"], "apps.common:index")
+        self.assertGreater(records[0]["queries"], 0)
+        self.assertFalse(records[0]["over_budget"])
+
+    @override_settings(
+        QUERY_BUDGETS={"apps.common:index": 0}, QUERY_BUDGET_ACTION="raise"
+    )
+    def test_exceeded_budget_raises(self):
+        with self.assertRaises(middleware.QueryBudgetExceeded):
+            self.client.get("/")
+
+    @override_settings(QUERY_INSTRUMENTATION_BUFFER_SIZE=3)
+    def test_report_aggregates_rolling_buffer(self):
+        for _ in range(5):
+            self.client.get("/")
+
+        report = middleware.get_query_report()
+        self.assertEqual(len(report), 1)
+        self.assertEqual(report[0]["requests"], 3)
+
+        output = StringIO()
+        call_command("query_report", stdout=output)
+        self.assertIn("apps.common:index", output.getvalue())
+
+
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+# DATE RANGES
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+
+
+@override_settings(FISCAL_YEAR_START_MONTH=7)
+class DateRangeTests(TestCase):
+    def test_presets_follow_today(self):
+        presets = filters.get_date_range_presets(today=dt.date(2024, 1, 2))
+
+        self.assertEqual(
+            presets["past_current_year"],
+            ("YTD (2024)", dt.date(2024, 1, 1), dt.date(2024, 1, 2)),
+        )
+        self.assertEqual(
+            presets["past_years_plus_3"],
+            ("2021", dt.date(2021, 1, 1), dt.date(2022, 1, 1)),
+        )
+        self.assertEqual(
+            presets["fiscal_current_year"],
+            ("FYTD (FY2024)", dt.date(2023, 7, 1), dt.date(2024, 1, 2)),
+        )
+        self.assertEqual(
+            presets["fiscal_prior_year"],
+            ("FY2023", dt.date(2022, 7, 1), dt.date(2023, 7, 1)),
+        )
+
+    def test_custom_range_is_half_open(self):
+        self.assertEqual(
+            filters.get_date_range(value="2021-03-01 to 2021-03-31"),
+            (dt.date(2021, 3, 1), dt.date(2021, 4, 1)),
+        )
+        with self.assertRaises(ValueError):
+            filters.get_date_range(value="2021-03-01")
+
+    def test_order_filter_resolves_presets_per_request(self):
+        orders_models.OrderBase.objects.create(event_date=dt.date(2023, 12, 31))
+        orders_models.OrderBase.objects.create(event_date=dt.date(2024, 1, 1))
+
+        def get_filter(today):
+            with mock.patch.object(filters, "localdate", return_value=today):
+                orderset = orders_filters.OrderFilterSimple(
+                    data={"event_date": "past_years_plus_1"},
+                    queryset=orders_models.OrderBase.objects.all(),
+                )
+                html = str(orderset.form["event_date"])
+                return html, orderset.filters["event_date"].filter(
+                    orderset.queryset, "past_years_plus_1"
+                )
+
+        html, orders = get_filter(dt.date(2024, 12, 31))
+        self.assertIn('value="past_years_plus_1" selected>2023<', html)
+        self.assertEqual(
+            list(orders.values_list("event_date", flat=True)), [dt.date(2023, 12, 31)]
+        )
+        self.assertIn('"event_date" >= 2023-01-01', str(orders.query))
+
+        html, orders = get_filter(dt.date(2025, 1, 1))
+        self.assertIn('value="past_years_plus_1" selected>2024<', html)
+        self.assertEqual(
+            list(orders.values_list("event_date", flat=True)), [dt.date(2024, 1, 1)]
+        )
+
+    def test_order_filter_accepts_custom_ranges(self):
+        orders_models.OrderBase.objects.create(event_date=dt.date(2021, 3, 31))
+        orders_models.OrderBase.objects.create(event_date=dt.date(2021, 4, 1))
+
+        orderset = orders_filters.OrderFilterSimple(
+            data={"event_date": "2021-01-01 to 2021-03-31"},
+            queryset=orders_models.OrderBase.objects.all(),
+        )
+        self.assertTrue(orderset.is_valid(), orderset.errors)
+        orders = orderset.filters["event_date"].filter(
+            orderset.queryset, orderset.form.cleaned_data["event_date"]
+        )
+        self.assertEqual(
+            list(orders.values_list("event_date", flat=True)), [dt.date(2021, 3, 31)]
+        )
+        self.assertIn(
+            'value="2021-01-01 to 2021-03-31" selected',
+            str(orderset.form["event_date"]),
+        )
+
+        orderset = orders_filters.OrderFilterSimple(
+            data={"event_date": "2021-01-01"},
+            queryset=orders_models.OrderBase.objects.all(),
+        )
+        self.assertFalse(orderset.is_valid())
@@ -12,5 +12,6 @@ from apps.common import views
 app_name = "apps.common"
 
 urlpatterns = [
+    path("query-report/", views.QueryReportView.as_view(), name="query_report"),
     path("", views.IndexView.as_view(), name="index"),
 ]
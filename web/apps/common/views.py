@@ -1,5 +1,6 @@
 # ––– DJANGO IMPORTS
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.conf import settings
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 from django.http import JsonResponse
 from django.views.generic import (
@@ -15,7 +16,7 @@ from django_filters.views import FilterView
 
 
 # ––– APPLICATION IMPORTS
-from apps.common import filters, forms, models, services
+from apps.common import filters, forms, middleware, models, services
 
 
 """
@@ -42,6 +43,21 @@ class IndexView(LoginRequiredMixin, TemplateView):
         return self.render_to_response(self.get_context_data())
 
 
+class QueryReportView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
+    """ Staff-only summary of query instrumentation records """
+
+    template_name = "query_report.html"
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get_context_data(self, *args, **kwargs):
+        context = super(QueryReportView, self).get_context_data(*args, **kwargs)
+        context["report"] = middleware.get_query_report()
+        context["enabled"] = getattr(settings, "QUERY_INSTRUMENTATION_ENABLED", False)
+        return context
+
+
 # –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
 # GENERIC VIEWS
 # –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
@@ -58,6 +74,7 @@ class GenericFilteredListView(FilterView):
     - exclude_by_value
     - order_field
     - filterset_class
+    - get_page_context, e.g. for keyset pagination
     """
 
     model = models.Placeholder
@@ -95,8 +112,14 @@ class GenericFilteredListView(FilterView):
         )
 
         # pagination
+        context.update(self.get_page_context(self.filterset.qs, page_size))
+
+        return context
+
+    def get_page_context(self, queryset, page_size):
+        """ Returns context for the requested page of queryset, with the page's rows as data """
         paginator = Paginator(
-            self.filterset.qs,
+            queryset,
             page_size,
             orphans=round(page_size / 3, 0),
         )
@@ -107,6 +130,4 @@ class GenericFilteredListView(FilterView):
             data = paginator.get_page(1)
         except EmptyPage:
             data = paginator.get_page(paginator.num_pages)
-        context["data"] = data
-
-        return context
+        return {"data": data}
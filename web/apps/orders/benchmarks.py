@@ -0,0 +1,390 @@
+# ––– DJANGO IMPORTS
+from django.contrib.staticfiles.handlers import StaticFilesHandler
+from django.db import connection
+from django.test import Client
+from django.test.testcases import LiveServerThread
+from django.test.utils import CaptureQueriesContext, override_settings
+
+
+# ––– PYTHON UTILITY IMPORTS
+import datetime as dt
+import random
+from io import BytesIO
+import statistics
+from tempfile import NamedTemporaryFile
+import time
+import tracemalloc
+
+
+# ––– APPLICATION IMPORTS
+from apps.orders import models, services, synthetic
+from apps.reports import services as reports_services
+from apps.users import models as users_models
+
+
+"""
+Benchmark suite over the synthetic dataset
+- each case is timed over several runs (min and median seconds) and its queries counted (last run)
+- with memory enabled, one extra run under tracemalloc records peak Python allocation (KiB)
+- cases are registered in BENCHMARK_CASES; a failing case records its error instead of stopping the suite
+- run through the run_benchmarks management command, which uses a throwaway database
+"""
+
+BENCHMARK_CASES = {}
+
+
+def benchmark_case(name: str):
+    def register(func):
+        BENCHMARK_CASES[name] = func
+        return func
+
+    return register
+
+
+def get_report_frames(*, range_date: str, verbose: bool = None):
+    """ Filtering and DataFrame steps shared by the CSV and XLSX report exports """
+
+    (
+        orders,
+        billing_records,
+        summary,
+        filter_condition_str,
+        error_flag,
+        tenant_flag,
+    ) = reports_services.filter_billing_records(range_date=range_date)
+    dataframe = reports_services.generate_billing_records_dataframe(
+        records=models.BillingRecord.frames.filter(order__in=orders),
+        filter_condition_str=filter_condition_str,
+        tenant_flag=tenant_flag,
+        verbose=verbose,
+    )
+    return (dataframe, tenant_flag)
+
+
+# ––– COSTS
+
+
+@benchmark_case("order_total_cost")
+def bench_order_total_cost(context: dict):
+    services.calculate_order_total_cost(order=context["order"], status="is_active")
+
+
+@benchmark_case("order_packages_cost")
+def bench_order_packages_cost(context: dict):
+    services.calculate_order_packages_cost(order=context["order"], status="is_active")
+
+
+@benchmark_case("orders_total_cost_bulk")
+def bench_orders_total_cost_bulk(context: dict):
+    services.calculate_orders_total_cost(
+        orders=models.OrderBase.objects.all(), status="is_active"
+    )
+
+
+@benchmark_case("orders_total_cost_vectorized")
+def bench_orders_total_cost_vectorized(context: dict):
+    services.calculate_orders_total_cost_vectorized(
+        orders=models.OrderBase.objects.all(), status="is_active"
+    )
+
+
+# ––– REPORTS
+
+
+@benchmark_case("report_filter")
+def bench_report_filter(context: dict):
+    (
+        orders,
+        billing_records,
+        summary,
+        filter_condition_str,
+        error_flag,
+        tenant_flag,
+    ) = reports_services.filter_billing_records(range_date=context["range_date"])
+    for record in billing_records:
+        record.order.customer.get_full_name
+
+
+@benchmark_case("report_results_view")
+def bench_report_results_view(context: dict):
+    """ First page of the results view, report cache invalidated so filtering runs every time """
+
+    if not context.get("report_params_posted"):
+        context["client"].post("/reports/", {"range_date": context["range_date"]})
+        context["report_params_posted"] = True
+    reports_services.invalidate_report_cache(all_reports=True)
+    response = context["client"].get("/reports/results/")
+    assert response.status_code == 200, response.status_code
+
+
+@benchmark_case("report_dataframe")
+def bench_report_dataframe(context: dict):
+    get_report_frames(range_date=context["range_date"], verbose=False)
+
+
+@benchmark_case("report_dataframe_verbose")
+def bench_report_dataframe_verbose(context: dict):
+    """ Previous frame builder: django_pandas to_dataframe(verbose=True) """
+
+    get_report_frames(range_date=context["range_date"], verbose=True)
+
+
+@benchmark_case("report_export_csv")
+def bench_report_export_csv(context: dict):
+    dataframe, tenant_flag = get_report_frames(range_date=context["range_date"])
+    response = reports_services.generate_billing_records_csv_from_dataframe(
+        dataframe=dataframe, tenant_flag=tenant_flag
+    )
+    b"".join(response)
+
+
+@benchmark_case("report_export_csv_stream")
+def bench_report_export_csv_stream(context: dict):
+    (
+        orders,
+        billing_records,
+        summary,
+        filter_condition_str,
+        error_flag,
+        tenant_flag,
+    ) = reports_services.filter_billing_records(range_date=context["range_date"])
+    response = reports_services.generate_billing_records_csv_stream(
+        records=models.BillingRecord.objects.filter(order__in=orders),
+        filter_condition_str=filter_condition_str,
+        tenant_flag=tenant_flag,
+    )
+    for _ in response:
+        pass
+
+
+@benchmark_case("report_export_xlsx")
+def bench_report_export_xlsx(context: dict):
+    dataframe, tenant_flag = get_report_frames(range_date=context["range_date"])
+    response = reports_services.generate_billing_records_xlsx_from_dataframe(
+        dataframe=dataframe, tenant_flag=tenant_flag
+    )
+    b"".join(response)
+
+
+@benchmark_case("report_export_xlsx_stream")
+def bench_report_export_xlsx_stream(context: dict):
+    (
+        orders,
+        billing_records,
+        summary,
+        filter_condition_str,
+        error_flag,
+        tenant_flag,
+    ) = reports_services.filter_billing_records(range_date=context["range_date"])
+    response = reports_services.generate_billing_records_xlsx_stream(
+        records=models.BillingRecord.objects.filter(order__in=orders),
+        filter_condition_str=filter_condition_str,
+        tenant_flag=tenant_flag,
+    )
+    for _ in response:
+        pass
+    response.close()
+
+
+# ––– ORDERS
+
+
+@benchmark_case("order_pdf")
+def bench_order_pdf(context: dict):
+    services.order_generate_pdf(
+        base_url="http://testserver/", order_id=str(context["order"].id)
+    )
+
+
+@benchmark_case("order_pdf_uncached_resources")
+def bench_order_pdf_uncached_resources(context: dict):
+    """ Previous render path: fresh FontConfiguration and stylesheets, temporary file round-trip """
+
+    order = models.OrderBase.objects.get(id=context["order"].id)
+    html_string, filename = services.get_order_pdf_html(order=order)
+    services.clear_pdf_render_cache()
+    result = services.write_order_pdf(
+        html_string=html_string, base_url="http://testserver/"
+    )
+    with NamedTemporaryFile(delete=True) as output:
+        output.write(result)
+        output.flush()
+        with open(output.name, "rb") as pdf_file:
+            BytesIO().write(pdf_file.read())
+
+
+def get_live_server_url(context: dict) -> str:
+    """ Threaded server with static files, started on first use, so PDF assets can be fetched over HTTP """
+
+    if "live_server" not in context:
+        live_server = LiveServerThread("localhost", StaticFilesHandler)
+        live_server.daemon = True
+        live_server.start()
+        live_server.is_ready.wait()
+        if live_server.error:
+            raise live_server.error
+        context["live_server"] = live_server
+    return f"http://localhost:{context['live_server'].port}/"
+
+
+def render_order_pdf_against_live_server(context: dict):
+    order = models.OrderBase.objects.get(id=context["order"].id)
+    html_string, filename = services.get_order_pdf_html(order=order)
+    services.write_order_pdf(
+        html_string=html_string, base_url=get_live_server_url(context)
+    )
+
+
+@benchmark_case("order_pdf_local_assets")
+def bench_order_pdf_local_assets(context: dict):
+    with override_settings(ORDER_PDF_LOCAL_ASSETS=True):
+        render_order_pdf_against_live_server(context)
+
+
+@benchmark_case("order_pdf_http_assets")
+def bench_order_pdf_http_assets(context: dict):
+    with override_settings(ORDER_PDF_LOCAL_ASSETS=False):
+        render_order_pdf_against_live_server(context)
+
+
+@benchmark_case("order_filter_list_view")
+def bench_order_filter_list_view(context: dict):
+    response = context["client"].get("/orders/")
+    assert response.status_code == 200, response.status_code
+
+
+@benchmark_case("order_filter_list_view_deep")
+def bench_order_filter_list_view_deep(context: dict):
+    """ Page 2,000 at the default 10 orders per page (or the middle page, on smaller datasets) """
+
+    if "deep_order_cursor" not in context:
+        orders = models.OrderBase.objects.order_by(*services.ORDER_LIST_ORDERING)
+        order = orders[min(2000 * 10, orders.count() // 2)]
+        context["deep_order_cursor"] = services.get_order_list_cursor(order=order)
+    response = context["client"].get(
+        "/orders/", {"after": context["deep_order_cursor"]}
+    )
+    assert response.status_code == 200, response.status_code
+
+
+@benchmark_case("order_search")
+def bench_order_search(context: dict):
+    """ Customer name and note prefix, ranked through the search index """
+
+    list(services.search_orders(query=context["search_query"]))
+
+
+@benchmark_case("order_search_list_view")
+def bench_order_search_list_view(context: dict):
+    response = context["client"].get("/orders/", {"search": context["search_query"]})
+    assert response.status_code == 200, response.status_code
+
+
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+# RUNNER
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+
+
+def run_case(*, func, context: dict, repeat: int, memory: bool = False) -> dict:
+    durations = []
+    try:
+        for _ in range(repeat):
+            # the query log is a bounded deque; a full log from data generation would count zero
+            connection.queries_log.clear()
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                func(context)
+                durations.append(time.perf_counter() - start)
+
+        if memory:
+            tracemalloc.start()
+            try:
+                func(context)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    except Exception as exc:
+        return {"error": repr(exc)}
+
+    result = {
+        "seconds_min": round(min(durations), 4),
+        "seconds_median": round(statistics.median(durations), 4),
+        "queries": len(queries),
+    }
+    if memory:
+        result["peak_kib"] = round(peak / 1024, 1)
+
+    return result
+
+
+def get_benchmark_context(*, start_date: dt.date, days: int) -> dict:
+    user, _ = users_models.User.objects.get_or_create(
+        email="benchmark@example.com", defaults={"is_staff": True}
+    )
+    client = Client()
+    client.force_login(user)
+
+    end_date = start_date + dt.timedelta(days=days - 1)
+    order = (
+        models.OrderBase.objects.filter(billing_record__isnull=False)
+        .select_related("customer")
+        .order_by("invoice_number")
+        .first()
+    )
+
+    return {
+        "order": order,
+        "range_date": f"{start_date.isoformat()} to {end_date.isoformat()}",
+        "search_query": f"{order.customer.last_name} vegetar",
+        "client": client,
+    }
+
+
+def run_benchmarks(
+    *,
+    scales: list,
+    repeat: int = 3,
+    seed: int = 0,
+    cases: list = None,
+    start_date: dt.date = dt.date(2021, 1, 1),
+    days: int = 365,
+    memory: bool = False,
+    log=print,
+) -> dict:
+    """
+    Grows the synthetic dataset to each scale (number of orders) in turn and runs cases against it
+    Must run against a disposable database
+    """
+
+    cases = cases or list(BENCHMARK_CASES)
+    rng = random.Random(seed)
+    reference = synthetic.generate_reference_data(rng=rng)
+    results = {}
+
+    for scale in sorted(scales):
+        existing = models.OrderBase.objects.count()
+        log(f"Generating {scale - existing} orders (scale {scale})")
+        synthetic.generate_orders(
+            rng=rng,
+            reference=reference,
+            count=scale - existing,
+            start_date=start_date,
+            days=days,
+        )
+        reports_services.rebuild_billing_rollup()
+
+        context = get_benchmark_context(start_date=start_date, days=days)
+        results[str(scale)] = {}
+        for name in cases:
+            log(f"  {name}")
+            results[str(scale)][name] = run_case(
+                func=BENCHMARK_CASES[name],
+                context=context,
+                repeat=repeat,
+                memory=memory,
+            )
+
+        if "live_server" in context:
+            context["live_server"].terminate()
+
+    return results
@@ -1,19 +1,17 @@
-# ––– DJANGO IMPORTS
-from django.db.models import Q
-
-
 # ––– THIRD-PARTY IMPORTS
 import django_filters
 
 
 # ––– APPLICATION IMPORTS
 from apps.common import filters as common_filters
-from apps.orders import models
+from apps.orders import models, services
 from apps.users import models as users_models
 
 
 class OrderFilterSimple(django_filters.FilterSet):
 
+    search = django_filters.CharFilter(method="filter_search", label="Search")
+
     invoice_number = django_filters.CharFilter(lookup_expr="icontains", distinct=True)
 
     event_date = common_filters.OrderDateRangeFilter()
@@ -21,10 +19,12 @@ class OrderFilterSimple(django_filters.FilterSet):
     @property
     def qs(self):
         orders = super().qs
-        return orders.filter(
-            Q(status__status="CONFIRMED") | Q(status__status="CHANGE_REQUEST")
-        )
+        return orders.filter(current_status__in=models.REPORTABLE_ORDER_STATUSES)
+
+    def filter_search(self, queryset, name, value):
+        # ranked by the search index, best match first
+        return services.search_orders(query=value, orders=queryset)
 
     class Meta:
         model = models.OrderBase
-        fields = ["invoice_number", "customer__tenant", "event_date"]
+        fields = ["search", "invoice_number", "customer__tenant", "event_date"]
@@ -0,0 +1,21 @@
+# ––– DJANGO IMPORTS
+from django.core.management.base import BaseCommand
+
+
+# ––– APPLICATION IMPORTS
+from apps.orders import services
+
+
+class Command(BaseCommand):
+    help = "Parses billing record payment references into the PTAEO columns where they are out of date"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        updated = services.backfill_billing_record_ptaeo(
+            batch_size=options["batch_size"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated PTAEO columns of {updated} billing records")
+        )
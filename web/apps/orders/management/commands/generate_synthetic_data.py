@@ -0,0 +1,52 @@
+# ––– DJANGO IMPORTS
+from django.core.management.base import BaseCommand
+
+
+# ––– PYTHON UTILITY IMPORTS
+import datetime as dt
+import random
+
+
+# ––– APPLICATION IMPORTS
+from apps.orders import synthetic
+from apps.reports import services as reports_services
+
+
+class Command(BaseCommand):
+    help = "Generates a synthetic catering dataset (tenants, users, menus and orders)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--tenants", type=int, default=20)
+        parser.add_argument("--users-per-tenant", type=int, default=10)
+        parser.add_argument("--menu-items", type=int, default=200)
+        parser.add_argument(
+            "--start-date",
+            type=dt.date.fromisoformat,
+            default=dt.date(dt.date.today().year, 1, 1),
+            help="First event date (YYYY-MM-DD)",
+        )
+        parser.add_argument("--days", type=int, default=365)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+
+        reference = synthetic.generate_reference_data(
+            rng=rng,
+            tenants_count=options["tenants"],
+            users_per_tenant=options["users_per_tenant"],
+            menu_items_count=options["menu_items"],
+        )
+        created = synthetic.generate_orders(
+            rng=rng,
+            reference=reference,
+            count=options["orders"],
+            start_date=options["start_date"],
+            days=options["days"],
+        )
+
+        # bulk-created records bypass the signals maintaining the rollup
+        reports_services.rebuild_billing_rollup()
+
+        self.stdout.write(self.style.SUCCESS(f"Generated {created} orders"))
@@ -0,0 +1,17 @@
+# ––– DJANGO IMPORTS
+from django.core.management.base import BaseCommand
+
+
+# ––– APPLICATION IMPORTS
+from apps.orders import services
+
+
+class Command(BaseCommand):
+    help = "Rewrites order search documents that are missing or out of date, e.g. after bulk inserts"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        written = services.rebuild_search_documents(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} order search documents"))
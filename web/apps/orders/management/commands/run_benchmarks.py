@@ -0,0 +1,95 @@
+# ––– DJANGO IMPORTS
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, teardown_databases
+from django.utils import timezone
+
+
+# ––– PYTHON UTILITY IMPORTS
+import json
+from pathlib import Path
+import subprocess
+
+
+# ––– APPLICATION IMPORTS
+from apps.orders import benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs the benchmark suite against synthetic data in a throwaway test database "
+        "and saves results as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scales", type=int, nargs="+", default=[1000, 10000, 100000]
+        )
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--cases",
+            nargs="+",
+            choices=sorted(benchmarks.BENCHMARK_CASES),
+            help="Subset of cases (default all)",
+        )
+        parser.add_argument(
+            "--memory",
+            action="store_true",
+            help="Also record peak memory of each case (one extra run under tracemalloc)",
+        )
+        parser.add_argument(
+            "--output",
+            default=None,
+            help="JSON file (default benchmarks/results-<timestamp>.json)",
+        )
+
+    def handle(self, *args, **options):
+        if any(scale <= 0 for scale in options["scales"]):
+            raise CommandError("Scales must be positive numbers of orders")
+
+        started_at = timezone.now()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            results = benchmarks.run_benchmarks(
+                scales=options["scales"],
+                repeat=options["repeat"],
+                seed=options["seed"],
+                cases=options["cases"],
+                memory=options["memory"],
+                log=self.stdout.write,
+            )
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+        output = Path(
+            options["output"]
+            or f"benchmarks/results-{started_at.strftime('%Y%m%d-%H%M%S')}.json"
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(
+            json.dumps(
+                {
+                    "started_at": started_at.isoformat(),
+                    "revision": get_revision(),
+                    "repeat": options["repeat"],
+                    "seed": options["seed"],
+                    "memory": options["memory"],
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"Results saved to {output}"))
+
+
+def get_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,55 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:06
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderLogisticsCostSnapshot',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+                ('total_estimated_cost', models.DecimalField(blank=True, decimal_places=2, default=0.0, max_digits=12)),
+                ('cost_food_internal', models.DecimalField(blank=True, decimal_places=2, default=0.0, max_digits=12)),
+                ('cost_food_external', models.DecimalField(blank=True, decimal_places=2, default=0.0, max_digits=12)),
+                ('cost_beverage', models.DecimalField(blank=True, decimal_places=2, default=0.0, max_digits=12)),
+                ('cost_labor', models.DecimalField(blank=True, decimal_places=2, default=0.0, max_digits=12)),
+                ('cost_rentals', models.DecimalField(blank=True, decimal_places=2, default=0.0, max_digits=12)),
+                ('packages', models.JSONField(blank=True, default=list, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('addons_staff', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('logistics', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='cost_snapshot', to='orders.orderlogistics')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='logistics_cost_snapshots', to='orders.orderbase')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='OrderCostSnapshot',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+                ('total_estimated_cost', models.DecimalField(blank=True, decimal_places=2, default=0.0, max_digits=12)),
+                ('cost_food_internal', models.DecimalField(blank=True, decimal_places=2, default=0.0, max_digits=12)),
+                ('cost_food_external', models.DecimalField(blank=True, decimal_places=2, default=0.0, max_digits=12)),
+                ('cost_beverage', models.DecimalField(blank=True, decimal_places=2, default=0.0, max_digits=12)),
+                ('cost_labor', models.DecimalField(blank=True, decimal_places=2, default=0.0, max_digits=12)),
+                ('cost_rentals', models.DecimalField(blank=True, decimal_places=2, default=0.0, max_digits=12)),
+                ('order', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='cost_snapshot', to='orders.orderbase')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_order_cost_snapshots'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderPdf',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+                ('state_hash', models.CharField(max_length=64)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='PENDING', max_length=16)),
+                ('pdf', models.FileField(blank=True, null=True, upload_to='order_pdfs/')),
+                ('filename', models.CharField(blank=True, max_length=128)),
+                ('error', models.TextField(blank=True)),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pdfs', to='orders.orderbase')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='orderpdf',
+            constraint=models.UniqueConstraint(fields=('order', 'state_hash'), name='unique_order_pdf_state'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:40
+
+from django.db import migrations, models
+
+
+PTAEO_FIELDS = ["project", "task", "award", "expenditure", "organization"]
+
+
+def backfill_ptaeo(apps, schema_editor):
+    # copy of orders.models.parse_ptaeo, so the migration does not follow later changes to it
+    BillingRecord = apps.get_model("orders", "BillingRecord")
+    records = []
+    for record in BillingRecord.objects.only("payment_reference").iterator(chunk_size=1000):
+        segments = [segment.strip() for segment in (record.payment_reference or "").split("-")]
+        if len(segments) != len(PTAEO_FIELDS):
+            continue
+        for field, value in zip(PTAEO_FIELDS, segments):
+            setattr(record, field, value)
+        records.append(record)
+    BillingRecord.objects.bulk_update(records, PTAEO_FIELDS, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_order_pdfs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='billingrecord',
+            name='award',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='Award', max_length=96),
+        ),
+        migrations.AddField(
+            model_name='billingrecord',
+            name='expenditure',
+            field=models.CharField(blank=True, default='', help_text='Expenditure', max_length=96),
+        ),
+        migrations.AddField(
+            model_name='billingrecord',
+            name='organization',
+            field=models.CharField(blank=True, default='', help_text='Organization', max_length=96),
+        ),
+        migrations.AddField(
+            model_name='billingrecord',
+            name='project',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='Project', max_length=96),
+        ),
+        migrations.AddField(
+            model_name='billingrecord',
+            name='task',
+            field=models.CharField(blank=True, default='', help_text='Task', max_length=96),
+        ),
+        migrations.RunPython(backfill_ptaeo, migrations.RunPython.noop),
+    ]
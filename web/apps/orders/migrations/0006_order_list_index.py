@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0005_billing_record_ptaeo'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='orderbase',
+            index=models.Index(fields=['event_date', 'invoice_number'], name='orders_orde_event_d_ddde57_idx'),
+        ),
+    ]
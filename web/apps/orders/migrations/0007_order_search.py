@@ -0,0 +1,106 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+SQLITE_INDEX_SQL = [
+    "CREATE VIRTUAL TABLE orders_ordersearch_fts USING fts5("
+    "order_id UNINDEXED, document, tokenize = 'unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER orders_ordersearch_fts_insert AFTER INSERT ON orders_ordersearchdocument BEGIN "
+    "INSERT INTO orders_ordersearch_fts(rowid, order_id, document) "
+    "VALUES (NEW.rowid, NEW.order_id, NEW.document); END",
+    "CREATE TRIGGER orders_ordersearch_fts_update AFTER UPDATE ON orders_ordersearchdocument BEGIN "
+    "UPDATE orders_ordersearch_fts SET order_id = NEW.order_id, document = NEW.document "
+    "WHERE rowid = OLD.rowid; END",
+    "CREATE TRIGGER orders_ordersearch_fts_delete AFTER DELETE ON orders_ordersearchdocument BEGIN "
+    "DELETE FROM orders_ordersearch_fts WHERE rowid = OLD.rowid; END",
+]
+
+SQLITE_DROP_SQL = [
+    "DROP TRIGGER IF EXISTS orders_ordersearch_fts_insert",
+    "DROP TRIGGER IF EXISTS orders_ordersearch_fts_update",
+    "DROP TRIGGER IF EXISTS orders_ordersearch_fts_delete",
+    "DROP TABLE IF EXISTS orders_ordersearch_fts",
+]
+
+POSTGRES_INDEX_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "ALTER TABLE orders_ordersearchdocument ADD COLUMN search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('simple', document)) STORED",
+    "CREATE INDEX orders_ordersearch_vector_idx ON orders_ordersearchdocument USING gin (search_vector)",
+    "CREATE INDEX orders_ordersearch_trgm_idx ON orders_ordersearchdocument "
+    "USING gin (document gin_trgm_ops)",
+]
+
+POSTGRES_DROP_SQL = [
+    "DROP INDEX IF EXISTS orders_ordersearch_trgm_idx",
+    "DROP INDEX IF EXISTS orders_ordersearch_vector_idx",
+    "ALTER TABLE orders_ordersearchdocument DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def run_vendor_sql(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+def build_search_documents(apps, schema_editor):
+    # copy of orders.services.get_order_search_documents, so the migration does not follow later changes to it
+    OrderBase = apps.get_model("orders", "OrderBase")
+    OrderNote = apps.get_model("orders", "OrderNote")
+    OrderSearchDocument = apps.get_model("orders", "OrderSearchDocument")
+
+    parts = {}
+    for order_id, *fields in OrderBase.objects.values_list(
+        "id", "invoice_number", "cis_numbers", "nickname", "order_contact",
+        "customer__first_name", "customer__last_name", "customer__email",
+    ).iterator(chunk_size=1000):
+        parts[order_id] = list(fields)
+    for order_id, logistics_order_id, note in OrderNote.objects.values_list(
+        "order_id", "logistics__order_id", "note"
+    ).iterator(chunk_size=1000):
+        if (order_id or logistics_order_id) in parts:
+            parts[order_id or logistics_order_id].append(note)
+
+    OrderSearchDocument.objects.bulk_create(
+        [
+            OrderSearchDocument(
+                order_id=order_id, document=" ".join(str(field) for field in fields if field)
+            )
+            for order_id, fields in parts.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_order_list_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderSearchDocument',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+                ('document', models.TextField(blank=True, default='')),
+                ('order', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='search_document', to='orders.orderbase')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.RunPython(
+            run_vendor_sql({"sqlite": SQLITE_INDEX_SQL, "postgresql": POSTGRES_INDEX_SQL}),
+            run_vendor_sql({"sqlite": SQLITE_DROP_SQL, "postgresql": POSTGRES_DROP_SQL}),
+        ),
+        migrations.RunPython(build_search_documents, migrations.RunPython.noop),
+    ]
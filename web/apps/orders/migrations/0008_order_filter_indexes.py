@@ -0,0 +1,57 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0007_order_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='billingrecord',
+            index=models.Index(condition=models.Q(('food_internal__gt', 0)), fields=['event_date', 'order'], name='orders_billing_food_inte_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='billingrecord',
+            index=models.Index(condition=models.Q(('food_external__gt', 0)), fields=['event_date', 'order'], name='orders_billing_food_exte_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='billingrecord',
+            index=models.Index(condition=models.Q(('alcohol_beverages__gt', 0)), fields=['event_date', 'order'], name='orders_billing_alcohol_b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='billingrecord',
+            index=models.Index(condition=models.Q(('labor__gt', 0)), fields=['event_date', 'order'], name='orders_billing_labor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='billingrecord',
+            index=models.Index(condition=models.Q(('rentals__gt', 0)), fields=['event_date', 'order'], name='orders_billing_rentals_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderbase',
+            index=models.Index(fields=['event_date', 'flag_active'], name='orders_orde_event_d_209e26_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderbase',
+            index=models.Index(fields=['customer', 'event_date'], name='orders_orde_custome_cd4e4c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderbase',
+            index=models.Index(condition=models.Q(('flag_active', True)), fields=['event_date'], name='orders_active_event_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderlogistics',
+            index=models.Index(fields=['order', 'event_start'], name='orders_orde_order_i_3e7068_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderpackage',
+            index=models.Index(fields=['logistics', 'sort_order'], name='orders_orde_logisti_ccf3cd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderstatus',
+            index=models.Index(condition=models.Q(('status__in', ['CONFIRMED', 'CHANGE_REQUEST'])), fields=['order'], name='orders_reportable_status_idx'),
+        ),
+    ]
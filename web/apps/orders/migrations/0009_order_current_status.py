@@ -0,0 +1,47 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:40
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_current_status(apps, schema_editor):
+    OrderBase = apps.get_model("orders", "OrderBase")
+    OrderStatus = apps.get_model("orders", "OrderStatus")
+
+    statuses = OrderStatus.objects.filter(order=OuterRef("pk"))
+    OrderBase.objects.update(
+        current_status=Coalesce(
+            Subquery(statuses.values("status")[:1]), Value("")
+        ),
+        date_status_changed=Subquery(statuses.values("date_changed")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0008_order_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='orderstatus',
+            name='orders_reportable_status_idx',
+        ),
+        migrations.AddField(
+            model_name='orderbase',
+            name='current_status',
+            field=models.CharField(blank=True, default='', help_text='Current Status', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='orderbase',
+            name='date_status_changed',
+            field=models.DateTimeField(blank=True, help_text='Date Status Changed', null=True, verbose_name='Status Changed'),
+        ),
+        migrations.RunPython(backfill_current_status, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='orderbase',
+            index=models.Index(condition=models.Q(('current_status__in', ['CONFIRMED', 'CHANGE_REQUEST'])), fields=['event_date', 'invoice_number'], name='orders_reportable_list_idx'),
+        ),
+    ]
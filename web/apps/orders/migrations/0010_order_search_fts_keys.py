@@ -0,0 +1,90 @@
+from django.db import migrations
+
+
+# full-text rows were keyed on the implicit rowid of orders_ordersearchdocument, which has a UUID
+# primary key, so VACUUM could renumber it; they are now keyed on an INTEGER PRIMARY KEY per order
+
+SQLITE_DROP_ROWID_SQL = [
+    "DROP TRIGGER IF EXISTS orders_ordersearch_fts_insert",
+    "DROP TRIGGER IF EXISTS orders_ordersearch_fts_update",
+    "DROP TRIGGER IF EXISTS orders_ordersearch_fts_delete",
+    "DROP TABLE IF EXISTS orders_ordersearch_fts",
+]
+
+SQLITE_FTS_TABLE_SQL = (
+    "CREATE VIRTUAL TABLE orders_ordersearch_fts USING fts5("
+    "order_id UNINDEXED, document, tokenize = 'unicode61 remove_diacritics 2')"
+)
+
+FTS_KEY = "(SELECT id FROM orders_ordersearch_fts_key WHERE order_id = {}.order_id)"
+INSERT_FTS_ROW = (
+    "INSERT OR IGNORE INTO orders_ordersearch_fts_key(order_id) VALUES (NEW.order_id); "
+    "INSERT INTO orders_ordersearch_fts(rowid, order_id, document) "
+    f"VALUES ({FTS_KEY.format('NEW')}, NEW.order_id, NEW.document); "
+)
+DELETE_FTS_ROW = (
+    f"DELETE FROM orders_ordersearch_fts WHERE rowid = {FTS_KEY.format('OLD')}; "
+)
+
+SQLITE_KEYED_SQL = [
+    "CREATE TABLE orders_ordersearch_fts_key ("
+    "id integer NOT NULL PRIMARY KEY, order_id char(32) NOT NULL UNIQUE)",
+    SQLITE_FTS_TABLE_SQL,
+    "CREATE TRIGGER orders_ordersearch_fts_insert AFTER INSERT ON orders_ordersearchdocument BEGIN "
+    f"{INSERT_FTS_ROW}END",
+    "CREATE TRIGGER orders_ordersearch_fts_update AFTER UPDATE ON orders_ordersearchdocument BEGIN "
+    f"{DELETE_FTS_ROW}"
+    "DELETE FROM orders_ordersearch_fts_key "
+    "WHERE order_id = OLD.order_id AND OLD.order_id IS NOT NEW.order_id; "
+    f"{INSERT_FTS_ROW}END",
+    "CREATE TRIGGER orders_ordersearch_fts_delete AFTER DELETE ON orders_ordersearchdocument BEGIN "
+    f"{DELETE_FTS_ROW}"
+    "DELETE FROM orders_ordersearch_fts_key WHERE order_id = OLD.order_id; END",
+    "INSERT INTO orders_ordersearch_fts_key(order_id) "
+    "SELECT order_id FROM orders_ordersearchdocument",
+    "INSERT INTO orders_ordersearch_fts(rowid, order_id, document) "
+    "SELECT fts_key.id, document.order_id, document.document "
+    "FROM orders_ordersearchdocument document "
+    "JOIN orders_ordersearch_fts_key fts_key ON fts_key.order_id = document.order_id",
+]
+
+SQLITE_DROP_KEYED_SQL = SQLITE_DROP_ROWID_SQL + [
+    "DROP TABLE IF EXISTS orders_ordersearch_fts_key",
+]
+
+# as created by 0007_order_search
+SQLITE_ROWID_SQL = [
+    SQLITE_FTS_TABLE_SQL,
+    "CREATE TRIGGER orders_ordersearch_fts_insert AFTER INSERT ON orders_ordersearchdocument BEGIN "
+    "INSERT INTO orders_ordersearch_fts(rowid, order_id, document) "
+    "VALUES (NEW.rowid, NEW.order_id, NEW.document); END",
+    "CREATE TRIGGER orders_ordersearch_fts_update AFTER UPDATE ON orders_ordersearchdocument BEGIN "
+    "UPDATE orders_ordersearch_fts SET order_id = NEW.order_id, document = NEW.document "
+    "WHERE rowid = OLD.rowid; END",
+    "CREATE TRIGGER orders_ordersearch_fts_delete AFTER DELETE ON orders_ordersearchdocument BEGIN "
+    "DELETE FROM orders_ordersearch_fts WHERE rowid = OLD.rowid; END",
+    "INSERT INTO orders_ordersearch_fts(rowid, order_id, document) "
+    "SELECT rowid, order_id, document FROM orders_ordersearchdocument",
+]
+
+
+def run_vendor_sql(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0009_order_current_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_vendor_sql({"sqlite": SQLITE_DROP_ROWID_SQL + SQLITE_KEYED_SQL}),
+            run_vendor_sql({"sqlite": SQLITE_DROP_KEYED_SQL + SQLITE_ROWID_SQL}),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+
+# trigram similarity only ranks full-text matches now, so the trigram index is no longer read
+
+POSTGRES_DROP_TRGM_SQL = ["DROP INDEX IF EXISTS orders_ordersearch_trgm_idx"]
+
+POSTGRES_TRGM_SQL = [
+    "CREATE INDEX orders_ordersearch_trgm_idx ON orders_ordersearchdocument "
+    "USING gin (document gin_trgm_ops)",
+]
+
+
+def run_vendor_sql(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0010_order_search_fts_keys'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_vendor_sql({"postgresql": POSTGRES_DROP_TRGM_SQL}),
+            run_vendor_sql({"postgresql": POSTGRES_TRGM_SQL}),
+        ),
+    ]
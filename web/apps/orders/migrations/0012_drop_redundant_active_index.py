@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:53
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0011_drop_order_search_trgm_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='orderbase',
+            name='orders_orde_event_d_209e26_idx',
+        ),
+    ]
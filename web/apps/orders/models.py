@@ -1,9 +1,10 @@
 # ––– DJANGO IMPORTS
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models, transaction
 from django.db.models import Q
 from django.db.models.enums import Choices
-from django.db.models.signals import post_delete, post_save, pre_save
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
 from django.dispatch import receiver, Signal
 from django.urls import reverse, reverse_lazy
 from django.utils.functional import cached_property
@@ -37,6 +38,8 @@ DEFAULT_DATE = DEFAULT_DATETIME.date()
 DEFAULT_START_TIME = dt.time(8, 0)  # offset for UTC comparisons
 DEFAULT_END_TIME = dt.time(17, 0)  # offset for UTC comparisons
 
+REPORTABLE_ORDER_STATUSES = ["CONFIRMED", "CHANGE_REQUEST"]
+
 # ––– MODELS
 
 """
@@ -73,6 +76,7 @@ OrderNote
 OrderPackage
 OrderPayment
 OrderRepeat
+OrderSearchDocument
 OrderStatus
 
 SETTINGS
@@ -148,6 +152,14 @@ class CostType(common_models.SortableBaseModel):
         ordering = ["sort_order"]
 
 
+@receiver([post_save, post_delete], sender=CostType)
+def clear_cost_buckets_cache(sender, **kwargs):
+    """ Cost bucket map is cached per process by services.get_cost_buckets_by_type_id """
+    from apps.orders import services
+
+    services.clear_cost_buckets_cache()
+
+
 class TagDisplayManager(models.Manager):
     def all(self):
         # Squarespace-specific allergen tags
@@ -692,13 +704,14 @@ def increment_invoice_id():
 
 class OrderObjectsManager(models.Manager):
     def is_active(self):
-        # Return only objects where flag_active is False
-        queryset = self.get_queryset().exclude(flag_active=False)
+        # Return only objects where flag_active is True
+        # (an equality, so partial indexes on flag_active = true can match)
+        queryset = self.get_queryset().filter(flag_active=True)
         return queryset
 
     def is_draft(self):
         # Return only objects where flag_active is False
-        queryset = self.get_queryset().exclude(flag_active=True)
+        queryset = self.get_queryset().filter(flag_active=False)
         return queryset
 
 
@@ -769,6 +782,20 @@ class OrderBase(common_models.AbstractBaseModel):
     flag_active = models.BooleanField(default=False, help_text="Is Active")
     flag_custom = models.BooleanField(default=False, help_text="Is Custom Order")
 
+    # mirrored from OrderStatus by its post_save/post_delete receivers, so lists and reports filter
+    # without the join; OrderStatus queryset update() skips them and is unsupported
+    current_status = models.CharField(
+        max_length=32, blank=True, default="", help_text="Current Status"
+    )
+    date_status_changed = models.DateTimeField(
+        "Status Changed",
+        auto_now_add=False,
+        auto_now=False,
+        null=True,
+        blank=True,
+        help_text="Date Status Changed",
+    )
+
     customer = models.ForeignKey(
         users_models.User,
         on_delete=models.CASCADE,
@@ -812,6 +839,20 @@ class OrderBase(common_models.AbstractBaseModel):
 
     class Meta:
         ordering = ["event_date"]
+        indexes = [
+            models.Index(fields=["event_date", "invoice_number"]),
+            models.Index(fields=["customer", "event_date"]),
+            models.Index(
+                fields=["event_date"],
+                condition=Q(flag_active=True),
+                name="orders_active_event_date_idx",
+            ),
+            models.Index(
+                fields=["event_date", "invoice_number"],
+                condition=Q(current_status__in=REPORTABLE_ORDER_STATUSES),
+                name="orders_reportable_list_idx",
+            ),
+        ]
 
 
 class OrderPayment(common_models.AbstractBaseModel):
@@ -1081,6 +1122,7 @@ class OrderLogistics(common_models.AbstractBaseModel):
     class Meta:
         get_latest_by = ["-event_start"]
         ordering = ["event_start"]
+        indexes = [models.Index(fields=["order", "event_start"])]
         verbose_name_plural = "Order logistics"
 
 
@@ -1217,6 +1259,7 @@ class OrderPackage(common_models.SortableBaseModel):
 
     class Meta:
         ordering = ["sort_order", "package__name"]
+        indexes = [models.Index(fields=["logistics", "sort_order"])]
 
 
 class OrderCourse(common_models.AbstractBaseModel):
@@ -1326,6 +1369,7 @@ class OrderCourseModification(common_models.AbstractBaseModel):
     )
 
     objects = MenuObjectsManager()
+    frames = DataFrameManager()
 
     def __str__(self):
         return "{0}-{1}".format(
@@ -1417,6 +1461,7 @@ class OrderAddOn(common_models.SortableBaseModel):
     )
 
     objects = OrderObjectsManager()
+    frames = DataFrameManager()
 
     def __str__(self):
         return str(self.order.invoice_number) + "-" + str(self.name)
@@ -1504,11 +1549,52 @@ class OrderStatus(common_models.AbstractBaseModel):
             + str(self.date_changed.strftime("%Y-%m-%d-%I:%M %p"))
         )
 
+    def set_order_current_status(self, deleted=False):
+        fields = {
+            "current_status": "" if deleted else self.status,
+            "date_status_changed": None if deleted else self.date_changed,
+        }
+        OrderBase.objects.filter(id=self.order_id).update(**fields)
+        if OrderStatus.order.is_cached(self):
+            for field, value in fields.items():
+                setattr(self.order, field, value)
+
     class Meta:
         ordering = ["-date_changed"]
         verbose_name_plural = "Order statuses"
 
 
+"""
+Current status mirror
+OrderBase.current_status and date_status_changed follow the order's OrderStatus on save and on any
+delete (instance, queryset or cascade); these receivers connect before the billing rollup's, so its
+on-commit updates see the mirrored status
+Queryset update()/bulk_create() of OrderStatus bypass signals and are unsupported
+"""
+
+
+@receiver(post_save, sender=OrderStatus)
+def mirror_order_current_status(sender, instance, **kwargs):
+    instance.set_order_current_status()
+
+
+@receiver(post_delete, sender=OrderStatus)
+def clear_order_current_status(sender, instance, **kwargs):
+    instance.set_order_current_status(deleted=True)
+
+
+PTAEO_FIELDS = ["project", "task", "award", "expenditure", "organization"]
+
+
+def parse_ptaeo(payment_reference: str) -> dict:
+    """ PTAEO segments of a "project-task-award-expenditure-organization" reference, blank otherwise """
+
+    segments = [segment.strip() for segment in (payment_reference or "").split("-")]
+    if len(segments) != len(PTAEO_FIELDS):
+        segments = [""] * len(PTAEO_FIELDS)
+    return dict(zip(PTAEO_FIELDS, segments))
+
+
 class BillingRecord(common_models.AbstractBaseModel):
     event_date = models.DateField(
         auto_now=False,
@@ -1519,6 +1605,21 @@ class BillingRecord(common_models.AbstractBaseModel):
     payment_reference = models.CharField(max_length=96, blank=True)
     payment_note = models.CharField(max_length=96, blank=True)
 
+    # payment_reference parsed on save, for references in PTAEO format
+    project = models.CharField(
+        max_length=96, blank=True, default="", db_index=True, help_text="Project"
+    )
+    task = models.CharField(max_length=96, blank=True, default="", help_text="Task")
+    award = models.CharField(
+        max_length=96, blank=True, default="", db_index=True, help_text="Award"
+    )
+    expenditure = models.CharField(
+        max_length=96, blank=True, default="", help_text="Expenditure"
+    )
+    organization = models.CharField(
+        max_length=96, blank=True, default="", help_text="Organization"
+    )
+
     total_cost = models.DecimalField(
         max_digits=12,
         decimal_places=2,
@@ -1586,8 +1687,300 @@ class BillingRecord(common_models.AbstractBaseModel):
     def __str__(self):
         return "{0}".format(self.order.invoice_number)
 
+    def set_ptaeo(self):
+        for field, value in parse_ptaeo(self.payment_reference).items():
+            setattr(self, field, value)
+
+    def save(self, *args, **kwargs):
+        self.set_ptaeo()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "payment_reference" in update_fields:
+            kwargs["update_fields"] = {*update_fields, *PTAEO_FIELDS}
+        return super().save(*args, **kwargs)
+
     class Meta:
         ordering = ["event_date", "order__invoice_number"]
+        # one partial index per cost bucket, for the cost type report filter
+        indexes = [
+            models.Index(
+                fields=["event_date", "order"],
+                condition=Q(**{f"{field}__gt": 0}),
+                name=f"orders_billing_{field[:9]}_idx",
+            )
+            for field in [
+                "food_internal",
+                "food_external",
+                "alcohol_beverages",
+                "labor",
+                "rentals",
+            ]
+        ]
+
+
+class CostSnapshotBaseModel(common_models.AbstractBaseModel):
+    """ Active-status costs, denormalized from the order tree """
+
+    total_estimated_cost = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0.00, blank=True
+    )
+    cost_food_internal = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0.00, blank=True
+    )
+    cost_food_external = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0.00, blank=True
+    )
+    cost_beverage = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0.00, blank=True
+    )
+    cost_labor = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0.00, blank=True
+    )
+    cost_rentals = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0.00, blank=True
+    )
+
+    class Meta:
+        abstract = True
+
+
+class OrderCostSnapshot(CostSnapshotBaseModel):
+    """ Order totals: active logistics snapshots plus order-level addons """
+
+    order = models.OneToOneField(
+        OrderBase, on_delete=models.CASCADE, related_name="cost_snapshot"
+    )
+
+    def __str__(self):
+        return "{0}".format(self.order.invoice_number)
+
+
+class OrderLogisticsCostSnapshot(CostSnapshotBaseModel):
+    """ Logistics totals, plus package and addon rows as rendered by detail and PDF views """
+
+    packages = models.JSONField(default=list, blank=True, encoder=DjangoJSONEncoder)
+    addons_staff = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+
+    logistics = models.OneToOneField(
+        OrderLogistics, on_delete=models.CASCADE, related_name="cost_snapshot"
+    )
+    order = models.ForeignKey(
+        OrderBase, on_delete=models.CASCADE, related_name="logistics_cost_snapshots"
+    )
+
+    def __str__(self):
+        return "{0}".format(self.logistics)
+
+
+"""
+Cost snapshot maintenance
+Any saved or deleted cost-bearing row recomputes only its own logistics subtree, then the order totals
+Recomputation runs on commit, once per subtree, so cascades and multi-row edits are not repeated
+Saved or deleted catalog rows priced into snapshots delete the snapshots that use them; they are rebuilt
+on their next read (a cost type change deletes all of them, as it moves costs between buckets)
+Queryset update()/bulk_create() bypass signals: call services.update_cost_snapshots afterwards
+"""
+
+
+def get_snapshot_keys(instance) -> tuple:
+    """ (order_id, logistics_id) whose snapshots depend on instance; logistics_id None for order-level rows """
+
+    if isinstance(instance, OrderLogistics):
+        return (instance.order_id, instance.id)
+    if isinstance(instance, OrderPackage):
+        return (instance.order_id, instance.logistics_id)
+    if isinstance(instance, OrderAddOn):
+        if instance.logistics_id:
+            return (instance.order_id, instance.logistics_id)
+        if not instance.package_id:
+            return (instance.order_id, None)
+        package_id = instance.package_id
+    elif isinstance(instance, (OrderCourse, OrderMenuItem)):
+        package_id = instance.package_id
+    elif isinstance(instance, OrderCourseModification):
+        package_id = (
+            OrderMenuItem.objects.filter(id=instance.menu_item_id)
+            .values_list("package_id", flat=True)
+            .first()
+        )
+
+    return OrderPackage.objects.filter(id=package_id).values_list(
+        "order_id", "logistics_id"
+    ).first() or (None, None)
+
+
+@receiver(post_init, sender=OrderLogistics)
+def stash_logistics_cost_fields(sender, instance, **kwargs):
+    # __dict__ avoids loading deferred fields
+    instance._snapshot_cost_fields = (
+        instance.__dict__.get("guest_count"),
+        instance.__dict__.get("flag_active"),
+    )
+
+
+@receiver(post_save, sender=OrderLogistics)
+def update_logistics_cost_snapshot(sender, instance, created, **kwargs):
+    cost_fields = (instance.guest_count, instance.flag_active)
+    if created or cost_fields != instance._snapshot_cost_fields:
+        from apps.orders import services
+
+        services.schedule_cost_snapshots_update(
+            order_id=instance.order_id, logistics_id=instance.id
+        )
+    instance._snapshot_cost_fields = cost_fields
+
+
+@receiver(post_delete, sender=OrderLogistics)
+def update_order_cost_snapshot(sender, instance, **kwargs):
+    from apps.orders import services
+
+    services.schedule_cost_snapshots_update(order_id=instance.order_id)
+
+
+@receiver([post_save, post_delete], sender=OrderPackage)
+@receiver([post_save, post_delete], sender=OrderCourse)
+@receiver([post_save, post_delete], sender=OrderMenuItem)
+@receiver([post_save, post_delete], sender=OrderCourseModification)
+@receiver([post_save, post_delete], sender=OrderAddOn)
+def update_cost_snapshots(sender, instance, **kwargs):
+    from apps.orders import services
+
+    order_id, logistics_id = get_snapshot_keys(instance)
+    if order_id:
+        services.schedule_cost_snapshots_update(
+            order_id=order_id, logistics_id=logistics_id
+        )
+
+
+def get_catalog_snapshot_logistics_ids(instance) -> list:
+    """ Ids of logistics whose snapshots are priced from instance, a catalog row """
+
+    if isinstance(instance, MenuItem):
+        rows = OrderMenuItem.objects.filter(menu_item=instance)
+        field = "package__logistics_id"
+    elif isinstance(instance, Course):
+        rows = OrderCourse.objects.filter(course=instance)
+        field = "package__logistics_id"
+    elif isinstance(instance, Package):
+        rows = OrderPackage.objects.filter(package=instance)
+        field = "logistics_id"
+    else:
+        rows = OrderCourseModification.objects.filter(modification=instance)
+        field = "menu_item__package__logistics_id"
+    return list(rows.values_list(field, flat=True).distinct())
+
+
+@receiver([post_save, post_delete], sender=MenuItem)
+@receiver([post_save, post_delete], sender=Course)
+@receiver([post_save, post_delete], sender=Package)
+@receiver([post_save, post_delete], sender=CourseModificationOption)
+def delete_catalog_cost_snapshots(sender, instance, **kwargs):
+    logistics_ids = get_catalog_snapshot_logistics_ids(instance)
+    if logistics_ids:
+        OrderCostSnapshot.objects.filter(order__logistics__in=logistics_ids).delete()
+        OrderLogisticsCostSnapshot.objects.filter(logistics__in=logistics_ids).delete()
+
+
+@receiver([post_save, post_delete], sender=CostType)
+def delete_cost_snapshots(sender, **kwargs):
+    OrderCostSnapshot.objects.all().delete()
+    OrderLogisticsCostSnapshot.objects.all().delete()
+
+
+class OrderPdf(common_models.AbstractBaseModel):
+    """ Rendered order PDF, keyed by a hash of the order state it was rendered from """
+
+    STATUS_CHOICES = (
+        ("PENDING", "Pending"),
+        ("RUNNING", "Running"),
+        ("DONE", "Done"),
+        ("FAILED", "Failed"),
+    )
+
+    state_hash = models.CharField(max_length=64)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default="PENDING")
+    pdf = models.FileField(upload_to="order_pdfs/", null=True, blank=True)
+    filename = models.CharField(max_length=128, blank=True)
+    error = models.TextField(blank=True)
+
+    order = models.ForeignKey(OrderBase, on_delete=models.CASCADE, related_name="pdfs")
+
+    def __str__(self):
+        return "{0}".format(self.filename or self.state_hash)
+
+    class Meta:
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["order", "state_hash"], name="unique_order_pdf_state"
+            )
+        ]
+
+
+class OrderSearchDocument(common_models.AbstractBaseModel):
+    """ Searchable text of an order, its customer and notes, indexed by the database's full-text search """
+
+    document = models.TextField(blank=True, default="")
+
+    order = models.OneToOneField(
+        OrderBase, on_delete=models.CASCADE, related_name="search_document"
+    )
+
+    def __str__(self):
+        return "{0}".format(self.order_id)
+
+
+"""
+Search document maintenance
+Saved orders, saved or deleted notes and renamed customers rewrite the documents of the orders they touch,
+on commit and once per order
+Queryset update()/bulk_create() bypass signals: run the rebuild_order_search command afterwards
+"""
+
+
+@receiver(post_save, sender=OrderBase)
+def update_order_search_document(sender, instance, **kwargs):
+    from apps.orders import services
+
+    services.schedule_search_documents_update(order_ids=[instance.id])
+
+
+@receiver([post_save, post_delete], sender=OrderNote)
+def update_note_search_document(sender, instance, **kwargs):
+    from apps.orders import services
+
+    order_id = instance.order_id
+    if order_id is None and instance.logistics_id:
+        order_id = (
+            OrderLogistics.objects.filter(id=instance.logistics_id)
+            .values_list("order_id", flat=True)
+            .first()
+        )
+    if order_id:
+        services.schedule_search_documents_update(order_ids=[order_id])
+
+
+@receiver(post_init, sender=users_models.User)
+def stash_customer_search_fields(sender, instance, **kwargs):
+    # __dict__ avoids loading deferred fields
+    instance._search_fields = (
+        instance.__dict__.get("first_name"),
+        instance.__dict__.get("last_name"),
+        instance.__dict__.get("email"),
+    )
+
+
+@receiver(post_save, sender=users_models.User)
+def update_customer_search_documents(sender, instance, created, **kwargs):
+    search_fields = (instance.first_name, instance.last_name, instance.email)
+    if not created and search_fields != instance._search_fields:
+        from apps.orders import services
+
+        services.schedule_search_documents_update(
+            order_ids=OrderBase.objects.filter(customer=instance).values_list(
+                "id", flat=True
+            )
+        )
+    instance._search_fields = search_fields
 
 
 # –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
@@ -1,21 +1,40 @@
 # ––– DJANGO IMPORTS
-from django.db.models import Model, QuerySet
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.contrib.staticfiles import finders
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import connections, transaction
+from django.db.models import Case, IntegerField, Model, Prefetch, Q, QuerySet, Sum, When
 from django.core.files import File
+from django.core.files.base import ContentFile
 from django.http import HttpResponse
 from django.template.loader import get_template, render_to_string
 from django.utils import timezone
+from django.utils._os import safe_join
 
 
 # ––– PYTHON UTILITY IMPORTS
-from collections import deque
+from collections import defaultdict, deque
+from concurrent.futures import as_completed, ProcessPoolExecutor
 import csv
 import datetime
 import datetime as dt
 import decimal
+import functools
+import hashlib
 from decimal import Decimal as D
+import itertools
 import json
-from tempfile import NamedTemporaryFile
+import logging
+import mimetypes
+import multiprocessing
+import os
+import re
+import threading
 from typing import Tuple
+from urllib.parse import unquote, urlsplit
+import uuid
 
 
 # ––– THIRD-PARTY IMPORTS
@@ -23,14 +42,19 @@ from openpyxl import load_workbook, Workbook
 from openpyxl.utils import absolute_coordinate, quote_sheetname
 from openpyxl.worksheet.cell_range import CellRange
 from openpyxl.worksheet.datavalidation import DataValidation
+import pandas as pd
 import pytz
-from weasyprint import HTML, CSS
+from weasyprint import default_url_fetcher, HTML, CSS
 from weasyprint.fonts import FontConfiguration
 
 
 # ––– APPLICATION IMPORTS
 from apps.orders import forms, models
-from apps.common import services as common_services
+from apps.common import jobs, services as common_services
+from apps.users import models as users_models
+
+
+logger = logging.getLogger(__name__)
 
 
 # --- PARAMETERS
@@ -42,6 +66,63 @@ EASTERN_TZ = pytz.timezone("US/Eastern")
 # –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
 
 
+"""
+Cost buckets
+Each CostType is routed to one of five buckets by name; the id -> bucket map is built once
+per process and cleared whenever a CostType is saved or deleted (see models.CostType receivers)
+"""
+
+COST_BUCKETS_BY_TYPE_NAME = {
+    "Food (Internal)": "food_internal",
+    "Food (External)": "food_external",
+    "Alcohol and NA Beverages": "beverage",
+    "Labor": "labor",
+    "Equipment and Rentals": "rentals",
+    "Rentals": "rentals",
+}
+
+_cost_buckets_by_type_id = None
+
+
+def get_cost_buckets_by_type_id(*, refresh: bool = False) -> dict:
+    """ Returns cached map of CostType id -> bucket (None for unbucketed cost types) """
+
+    global _cost_buckets_by_type_id
+
+    if refresh or _cost_buckets_by_type_id is None:
+        _cost_buckets_by_type_id = {
+            cost_type_id: COST_BUCKETS_BY_TYPE_NAME.get(name)
+            for cost_type_id, name in models.CostType.objects.values_list("id", "name")
+        }
+
+    return _cost_buckets_by_type_id
+
+
+def clear_cost_buckets_cache() -> None:
+    global _cost_buckets_by_type_id
+    _cost_buckets_by_type_id = None
+
+
+def get_cost_bucket(*, cost_type_id) -> str:
+    """ Bucket for cost type id, no query unless the id is unknown to this process """
+
+    if cost_type_id is None:
+        return None
+
+    cost_buckets = get_cost_buckets_by_type_id()
+    if cost_type_id not in cost_buckets:
+        cost_buckets = get_cost_buckets_by_type_id(refresh=True)
+
+    return cost_buckets.get(cost_type_id)
+
+
+def get_cost_column(*, cost_type_id) -> str:
+    """ Key of cost dicts (cost_food_internal, ...) for cost type id """
+
+    cost_bucket = get_cost_bucket(cost_type_id=cost_type_id)
+    return f"cost_{cost_bucket}" if cost_bucket else None
+
+
 def calculate_logistics_cost(*, logistics: models.OrderLogistics, status: str) -> dict:
     """
     For each package, calculate package, course, and menu item costs
@@ -49,11 +130,7 @@ def calculate_logistics_cost(*, logistics: models.OrderLogistics, status: str) -
     """
 
     logistics_estimated_cost = 0
-    cost_food_internal = 0
-    cost_food_external = 0
-    cost_beverage = 0
-    cost_labor = 0
-    cost_rentals = 0
+    costs = get_empty_costs()
 
     if status == "review":
         addons = logistics.addons_staff.all().filter(package__isnull=True)
@@ -107,24 +184,17 @@ def calculate_logistics_cost(*, logistics: models.OrderLogistics, status: str) -
 
         addons_staff.append(temp)
 
-        if addon.cost_type.name == "Food (Internal)":
-            cost_food_internal += addon_cost
-        elif addon.cost_type.name == "Food (External)":
-            cost_food_external += addon_cost
-        elif addon.cost_type.name == "Alcohol and NA Beverages":
-            cost_beverage += addon_cost
-        elif addon.cost_type.name == "Labor":
-            cost_labor += addon_cost
-        elif addon.cost_type.name == "Equipment and Rentals":
-            cost_rentals += addon_cost
+        add_to_cost_bucket(
+            costs=costs, cost_type_id=addon.cost_type_id, amount=addon_cost
+        )
 
     return {
         "addons_staff": addons_staff,
-        "cost_food_internal": cost_food_internal,
-        "cost_food_external": cost_food_external,
-        "cost_beverage": cost_beverage,
-        "cost_labor": cost_labor,
-        "cost_rentals": cost_rentals,
+        "cost_food_internal": costs["cost_food_internal"],
+        "cost_food_external": costs["cost_food_external"],
+        "cost_beverage": costs["cost_beverage"],
+        "cost_labor": costs["cost_labor"],
+        "cost_rentals": costs["cost_rentals"],
     }
 
 
@@ -137,11 +207,7 @@ def calculate_package_cost(*, orderpackage: models.OrderPackage, status: str) ->
     from apps.orders.models import OrderCourse, OrderMenuItem, OrderAddOn
 
     package_estimated_cost = 0
-    cost_food_internal = 0
-    cost_food_external = 0
-    cost_beverage = 0
-    cost_labor = 0
-    cost_rentals = 0
+    costs = get_empty_costs()
 
     if status == "review":
         courses = orderpackage.courses.all()
@@ -260,323 +326,1143 @@ def calculate_package_cost(*, orderpackage: models.OrderPackage, status: str) ->
         temp["logistics_id"] = addon.logistics_id
         addons_staff.append(temp)
 
-        if addon.cost_type.name == "Food (Internal)":
-            cost_food_internal += addon_cost
-        elif addon.cost_type.name == "Food (External)":
-            cost_food_external += addon_cost
-        elif addon.cost_type.name == "Alcohol and NA Beverages":
-            cost_beverage += addon_cost
-        elif addon.cost_type.name == "Labor":
-            cost_labor += addon_cost
-        elif addon.cost_type.name == "Equipment and Rentals":
-            cost_rentals += addon_cost
-
-    if orderpackage.package.cost_type.name == "Food (Internal)":
-        cost_food_internal += package_estimated_cost
-    elif orderpackage.package.cost_type.name == "Food (External)":
-        cost_food_external += package_estimated_cost
-    elif orderpackage.package.cost_type.name == "Alcohol and NA Beverages":
-        cost_beverage += package_estimated_cost
-    elif orderpackage.package.cost_type.name == "Labor":
-        cost_labor += package_estimated_cost
-    elif orderpackage.package.cost_type.name == "Equipment and Rentals":
-        cost_rentals += package_estimated_cost
+        add_to_cost_bucket(
+            costs=costs, cost_type_id=addon.cost_type_id, amount=addon_cost
+        )
+
+    add_to_cost_bucket(
+        costs=costs,
+        cost_type_id=orderpackage.package.cost_type_id,
+        amount=package_estimated_cost,
+    )
 
     return {
         "cost": package_estimated_cost,
         "guest_count": orderpackage.logistics.guest_count,
         "price_descriptive": price_descriptive,
         "addons_staff": addons_staff,
-        "cost_food_internal": cost_food_internal,
-        "cost_food_external": cost_food_external,
-        "cost_beverage": cost_beverage,
-        "cost_labor": cost_labor,
-        "cost_rentals": cost_rentals,
+        "cost_food_internal": costs["cost_food_internal"],
+        "cost_food_external": costs["cost_food_external"],
+        "cost_beverage": costs["cost_beverage"],
+        "cost_labor": costs["cost_labor"],
+        "cost_rentals": costs["cost_rentals"],
     }
 
 
-def calculate_order_total_cost(*, order: models.OrderBase, status: str) -> dict:
+"""
+Status filters applied at each level of the order tree
+- order-level rows (logistics, order addons) treat add_package as is_active
+- package-level rows (packages, courses, menu items, package/logistics addons) treat add_package as is_draft
+"""
+
+ORDER_STATUS_FILTERS = {
+    "review": "all",
+    "is_active": "is_active",
+    "is_draft": "is_draft",
+    "add_package": "is_active",
+}
+
+PACKAGE_STATUS_FILTERS = {
+    "review": "all",
+    "is_active": "is_active",
+    "is_draft": "is_draft",
+    "add_package": "is_draft",
+}
+
+
+def filter_by_status(*, model: Model, filters: dict, status: str) -> QuerySet:
+    """ Returns model queryset filtered by manager method mapped to status """
+    return getattr(model.objects, filters.get(status, "all"))()
+
+
+def get_logistics_cost_prefetches(*, status: str) -> list:
     """
-    For each package, calculate package, course, and menu item costs
-    For order, calculate addon costs
-    Valid status choices: review, submitted
+    Prefetch lookups loading every cost-bearing row below a logistics queryset
+    One query per table regardless of number of logistics, packages or items
+    Results are stored under cost_* attributes, leaving related managers untouched
     """
-    from apps.orders.models import OrderAddOn, OrderCourse, OrderMenuItem
 
-    total_estimated_cost = 0
-    cost_food_internal = 0
-    cost_food_external = 0
-    cost_beverage = 0
-    cost_labor = 0
-    cost_rentals = 0
+    packages = filter_by_status(
+        model=models.OrderPackage, filters=PACKAGE_STATUS_FILTERS, status=status
+    ).select_related("package")
+    courses = filter_by_status(
+        model=models.OrderCourse, filters=PACKAGE_STATUS_FILTERS, status=status
+    ).select_related("course")
+    menu_items = filter_by_status(
+        model=models.OrderMenuItem, filters=PACKAGE_STATUS_FILTERS, status=status
+    ).select_related("menu_item")
+    modifications = models.OrderCourseModification.objects.all()
+    package_addons = filter_by_status(
+        model=models.OrderAddOn, filters=PACKAGE_STATUS_FILTERS, status=status
+    ).filter(logistics__isnull=True)
+    logistics_addons = filter_by_status(
+        model=models.OrderAddOn, filters=PACKAGE_STATUS_FILTERS, status=status
+    ).filter(package__isnull=True)
+
+    return [
+        Prefetch("packages", queryset=packages, to_attr="cost_packages"),
+        Prefetch("cost_packages__courses", queryset=courses, to_attr="cost_courses"),
+        Prefetch(
+            "cost_packages__items", queryset=menu_items, to_attr="cost_menu_items"
+        ),
+        Prefetch(
+            "cost_packages__cost_menu_items__modifications",
+            queryset=modifications,
+            to_attr="cost_modifications",
+        ),
+        Prefetch(
+            "cost_packages__addons_staff",
+            queryset=package_addons,
+            to_attr="cost_addons",
+        ),
+        Prefetch("addons_staff", queryset=logistics_addons, to_attr="cost_addons"),
+    ]
 
-    if status == "review":
-        logistics_set = order.logistics.all()
-        addons_set = order.addons_staff.all().filter(
-            logistics__isnull=True, package__isnull=True
-        )
-    elif status == "is_active":
-        logistics_set = order.logistics.is_active()
-        addons_set = order.addons_staff.is_active().filter(
-            logistics__isnull=True, package__isnull=True
+
+def get_order_cost_querysets(*, status: str) -> Tuple[QuerySet, QuerySet]:
+    """
+    Returns (logistics, order addons) querysets for status, not yet filtered by order
+    Logistics carry the prefetches needed by calculate_logistics_tree_cost
+    """
+
+    logistics_set = filter_by_status(
+        model=models.OrderLogistics, filters=ORDER_STATUS_FILTERS, status=status
+    ).prefetch_related(*get_logistics_cost_prefetches(status=status))
+    addons_set = filter_by_status(
+        model=models.OrderAddOn, filters=ORDER_STATUS_FILTERS, status=status
+    ).filter(logistics__isnull=True, package__isnull=True)
+
+    return (logistics_set, addons_set)
+
+
+COST_BUCKET_KEYS = [
+    "cost_food_internal",
+    "cost_food_external",
+    "cost_beverage",
+    "cost_labor",
+    "cost_rentals",
+]
+
+
+def get_empty_costs() -> dict:
+    return {
+        "total_estimated_cost": 0,
+        "cost_food_internal": 0,
+        "cost_food_external": 0,
+        "cost_beverage": 0,
+        "cost_labor": 0,
+        "cost_rentals": 0,
+    }
+
+
+def add_to_cost_bucket(*, costs: dict, cost_type_id, amount) -> None:
+    cost_column = get_cost_column(cost_type_id=cost_type_id)
+    if cost_column is not None:
+        costs[cost_column] += amount
+
+
+def calculate_orderpackage_tree_cost(
+    *, orderpackage: models.OrderPackage, guest_count: int
+) -> dict:
+    """
+    In-memory cost of a prefetched package, its courses and menu items (not addons)
+    Mirrors the arithmetic of calculate_package_cost
+    """
+
+    package_estimated_cost = (
+        orderpackage.price_numeric * guest_count
+    ) + orderpackage.price_numeric_fixed
+    combined_per_person_cost = orderpackage.price_numeric
+    combined_fixed_cost = orderpackage.price_numeric_fixed
+
+    # for now, over_limit costs refer only to menu selections
+    menu_items_count = len(orderpackage.cost_menu_items)
+    if menu_items_count > orderpackage.selection_quantity:
+        package_estimated_cost += orderpackage.price_over_limit_numeric * (
+            (menu_items_count - orderpackage.selection_quantity) * guest_count
         )
-    elif status == "is_draft":
-        logistics_set = order.logistics.is_draft()
-        addons_set = order.addons_staff.is_draft().filter(
-            logistics__isnull=True, package__isnull=True
+        combined_per_person_cost += orderpackage.price_over_limit_numeric * (
+            menu_items_count - orderpackage.selection_quantity
         )
-    elif status == "add_package":
-        logistics_set = order.logistics.is_active()
-        addons_set = order.addons_staff.is_active().filter(
-            logistics__isnull=True, package__isnull=True
+
+    # course
+    for course in orderpackage.cost_courses:
+        package_estimated_cost += (
+            course.course.price_numeric_per_person * guest_count
+        ) + course.course.price_numeric_fixed
+        combined_per_person_cost += course.course.price_numeric_per_person
+        combined_fixed_cost += course.course.price_numeric_fixed
+
+    # menu item, including any modifications
+    for menu_item in orderpackage.cost_menu_items:
+        per_person_cost = menu_item.menu_item.price_numeric_per_person
+        for mod in menu_item.cost_modifications:
+            per_person_cost += mod.price_numeric_per_person
+        package_estimated_cost += (
+            per_person_cost * guest_count
+        ) + menu_item.menu_item.price_numeric_fixed
+        combined_per_person_cost += per_person_cost
+        combined_fixed_cost += menu_item.menu_item.price_numeric_fixed
+
+    return {
+        "cost": package_estimated_cost,
+        "combined_per_person_cost": combined_per_person_cost,
+        "combined_fixed_cost": combined_fixed_cost,
+    }
+
+
+def calculate_logistics_tree_cost(*, logistics: models.OrderLogistics) -> dict:
+    """
+    In-memory cost of a prefetched logistics subtree: packages, package addons, logistics addons
+    Logistics must come from get_order_cost_querysets so no further queries are issued
+    """
+
+    costs = get_empty_costs()
+
+    for orderpackage in logistics.cost_packages:
+        package_estimated_cost = calculate_orderpackage_tree_cost(
+            orderpackage=orderpackage, guest_count=logistics.guest_count
+        )["cost"]
+
+        """
+        package_estimated_cost to this point is only package, not addons
+        since (conceivably) cost_type for a package_addon could set differently than that of package,
+        apply package_estimated_cost to cost_type totals, then do so separately/individually for each addon
+        """
+        add_to_cost_bucket(
+            costs=costs,
+            cost_type_id=orderpackage.package.cost_type_id,
+            amount=package_estimated_cost,
         )
-    else:
-        logistics_set = order.logistics.all()
-        addons_set = order.addons_staff.all().filter(
-            logistics__isnull=True, package__isnull=True
+
+        # package addons
+        for addon in orderpackage.cost_addons:
+            addon_cost = (
+                addon.price_numeric * logistics.guest_count
+            ) + addon.price_numeric_fixed
+            package_estimated_cost += addon_cost
+            add_to_cost_bucket(
+                costs=costs, cost_type_id=addon.cost_type_id, amount=addon_cost
+            )
+
+        costs["total_estimated_cost"] += package_estimated_cost
+
+    # addons (per logistics)
+    for orderaddon in logistics.cost_addons:
+        orderaddon_cost = (
+            orderaddon.price_numeric * logistics.guest_count
+        ) + orderaddon.price_numeric_fixed
+        costs["total_estimated_cost"] += orderaddon_cost
+        add_to_cost_bucket(
+            costs=costs, cost_type_id=orderaddon.cost_type_id, amount=orderaddon_cost
         )
 
-    # ––– PACKAGES ––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+    return costs
+
+
+def sum_order_tree_cost(*, logistics_set, addons_set) -> dict:
+    """ In-memory order total from prefetched logistics and order-level addons """
+
+    costs = get_empty_costs()
+
     for logistics in logistics_set:
+        logistics_costs = calculate_logistics_tree_cost(logistics=logistics)
+        for key, value in logistics_costs.items():
+            costs[key] += value
 
-        if status == "review":
-            packages = logistics.packages.all()
-            addons_logistics = logistics.addons_staff.all().filter(package__isnull=True)
-        elif status == "is_active":
-            packages = logistics.packages.is_active()
-            addons_logistics = logistics.addons_staff.is_active().filter(
-                package__isnull=True
-            )
-        elif status == "is_draft":
-            packages = logistics.packages.is_draft()
-            addons_logistics = logistics.addons_staff.is_draft().filter(
-                package__isnull=True
-            )
-        elif status == "add_package":
-            packages = logistics.packages.is_draft()
-            addons_logistics = logistics.addons_staff.is_draft().filter(
-                package__isnull=True
+    # addons (per order) are flat fees only
+    for orderaddon in addons_set:
+        costs["total_estimated_cost"] += orderaddon.price_numeric_fixed
+        add_to_cost_bucket(
+            costs=costs,
+            cost_type_id=orderaddon.cost_type_id,
+            amount=orderaddon.price_numeric_fixed,
+        )
+
+    return costs
+
+
+def calculate_order_total_cost(*, order: models.OrderBase, status: str) -> dict:
+    """
+    For each package, calculate package, course, and menu item costs
+    For order, calculate addon costs
+    Valid status choices: review, is_active, is_draft, add_package
+    Whole order tree is loaded in a fixed number of queries, then totalled in memory
+    """
+
+    logistics_set, addons_set = get_order_cost_querysets(status=status)
+
+    return sum_order_tree_cost(
+        logistics_set=logistics_set.filter(order=order),
+        addons_set=addons_set.filter(order=order),
+    )
+
+
+def calculate_orders_total_cost(
+    *, orders: QuerySet, status: str, batch_size: int = 500
+) -> dict:
+    """
+    Bulk version of calculate_order_total_cost, keyed by order id
+    Each table is read once per batch of orders instead of once per order
+    """
+
+    order_ids = list(orders.values_list("id", flat=True))
+    logistics_set, addons_set = get_order_cost_querysets(status=status)
+    costs_by_order = {}
+
+    for idx in range(0, len(order_ids), batch_size):
+        batch_ids = order_ids[idx : idx + batch_size]
+
+        logistics_by_order = defaultdict(list)
+        for logistics in logistics_set.filter(order__in=batch_ids):
+            logistics_by_order[logistics.order_id].append(logistics)
+
+        addons_by_order = defaultdict(list)
+        for orderaddon in addons_set.filter(order__in=batch_ids):
+            addons_by_order[orderaddon.order_id].append(orderaddon)
+
+        for order_id in batch_ids:
+            costs_by_order[order_id] = sum_order_tree_cost(
+                logistics_set=logistics_by_order[order_id],
+                addons_set=addons_by_order[order_id],
             )
-        else:
-            packages = logistics.packages.all()
-            addons_logistics = logistics.addons_staff.all().filter(package__isnull=True)
-
-        for orderpackage in packages:
-
-            if status == "review":
-                courses = orderpackage.courses.all()
-                menu_items = orderpackage.items.all()
-                addons = orderpackage.addons_staff.all().filter(logistics__isnull=True)
-            elif status == "is_active":
-                courses = orderpackage.courses.is_active()
-                menu_items = orderpackage.items.is_active()
-                addons = orderpackage.addons_staff.is_active().filter(
-                    logistics__isnull=True
-                )
-            elif status == "is_draft":
-                courses = orderpackage.courses.is_draft()
-                menu_items = orderpackage.items.is_draft()
-                addons = orderpackage.addons_staff.is_draft().filter(
-                    logistics__isnull=True
-                )
-            elif status == "add_package":
-                courses = orderpackage.courses.is_draft()
-                menu_items = orderpackage.items.is_draft()
-                addons = orderpackage.addons_staff.is_draft().filter(
-                    logistics__isnull=True
-                )
-            else:
-                courses = orderpackage.courses.all()
-                menu_items = orderpackage.items.all()
-                addons = orderpackage.addons_staff.all().filter(logistics__isnull=True)
 
-            package_estimated_cost = 0
-            combined_per_person_cost = 0
-            combined_fixed_cost = 0
+    return costs_by_order
 
-            # ––– PACKAGE –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
-            package_estimated_cost += (
-                orderpackage.price_numeric * logistics.guest_count
-            ) + orderpackage.price_numeric_fixed
-            combined_per_person_cost += orderpackage.price_numeric
-            combined_fixed_cost += orderpackage.price_numeric_fixed
-
-            """
-            (3) possibilities:
-            - if selection_quantity == 0 // NO CHOICE
-            - elif selection_quantity == 999 // ARBITRARY NUMBER OF CHOICES
-            – else selection_quantity specific
-            if there are courses -> then selection_quantity refers to courses
-            else selection_quantity refers to menu_items
-            """
-
-            # for now, over_limit costs refer only to menu selections
-            if menu_items.count() > orderpackage.selection_quantity:
-                package_estimated_cost += orderpackage.price_over_limit_numeric * (
-                    (menu_items.count() - orderpackage.selection_quantity)
-                    * logistics.guest_count
-                )
-                combined_per_person_cost += orderpackage.price_over_limit_numeric * (
-                    menu_items.count() - orderpackage.selection_quantity
-                )
 
-            # course
-            if courses:
-                for course in courses:
-                    package_estimated_cost += (
-                        course.course.price_numeric_per_person * logistics.guest_count
-                    ) + course.course.price_numeric_fixed
-                    combined_per_person_cost += course.course.price_numeric_per_person
-                    combined_fixed_cost += course.course.price_numeric_fixed
-            else:
-                pass
-
-            # menu item
-            for menu_item in menu_items:
-                # if menu item modification
-                if menu_item.modifications.count() > 0:
-                    per_person_cost = menu_item.menu_item.price_numeric_per_person
-                    for mod in menu_item.modifications.all():
-                        per_person_cost += mod.price_numeric_per_person
-                    package_estimated_cost += (
-                        per_person_cost * logistics.guest_count
-                    ) + menu_item.menu_item.price_numeric_fixed
-                    combined_per_person_cost += per_person_cost
-                    combined_fixed_cost += menu_item.menu_item.price_numeric_fixed
-                else:
-                    package_estimated_cost += (
-                        menu_item.menu_item.price_numeric_per_person
-                        * logistics.guest_count
-                    ) + menu_item.menu_item.price_numeric_fixed
-                    combined_per_person_cost += (
-                        menu_item.menu_item.price_numeric_per_person
-                    )
-                    combined_fixed_cost += menu_item.menu_item.price_numeric_fixed
-
-            """
-            package_estimated_cost to this point is only package, not addons
-            since (conceivably) cost_type for a package_addon could set differently than that of package,
-            apply package_estimated_cost to cost_type totals, then do so separately/individually for each addon
-            """
-
-            if orderpackage.package.cost_type.name == "Food (Internal)":
-                cost_food_internal += package_estimated_cost
-            elif orderpackage.package.cost_type.name == "Food (External)":
-                cost_food_external += package_estimated_cost
-            elif orderpackage.package.cost_type.name == "Alcohol and NA Beverages":
-                cost_beverage += package_estimated_cost
-            elif orderpackage.package.cost_type.name == "Labor":
-                cost_labor += package_estimated_cost
-            elif orderpackage.package.cost_type.name == "Equipment and Rentals":
-                cost_rentals += package_estimated_cost
-
-            # package addons
-            for addon in addons:
-                addon_cost = (
-                    addon.price_numeric * logistics.guest_count
-                ) + addon.price_numeric_fixed
-                package_estimated_cost += addon_cost
-
-                if addon.cost_type.name == "Food (Internal)":
-                    cost_food_internal += addon_cost
-                elif addon.cost_type.name == "Food (External)":
-                    cost_food_external += addon_cost
-                elif addon.cost_type.name == "Alcohol and NA Beverages":
-                    cost_beverage += addon_cost
-                elif addon.cost_type.name == "Labor":
-                    cost_labor += addon_cost
-                elif addon.cost_type.name == "Equipment and Rentals":
-                    cost_rentals += addon_cost
-
-            total_estimated_cost += package_estimated_cost
-
-        # ––– ADDONS (per logistics) ––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
-
-        for orderaddon in addons_logistics:
-            orderaddon_cost = (
-                orderaddon.price_numeric * orderaddon.logistics.guest_count
-            ) + orderaddon.price_numeric_fixed
-            total_estimated_cost += orderaddon_cost
-            if orderaddon.cost_type.name == "Food (Internal)":
-                cost_food_internal += orderaddon_cost
-            elif orderaddon.cost_type.name == "Food (External)":
-                cost_food_external += orderaddon_cost
-            elif orderaddon.cost_type.name == "Alcohol and NA Beverages":
-                cost_beverage += orderaddon_cost
-            elif orderaddon.cost_type.name == "Labor":
-                cost_labor += orderaddon_cost
-            elif orderaddon.cost_type.name == "Equipment and Rentals":
-                cost_rentals += orderaddon_cost
-
-    # ––– ADDONS (per order) ––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+"""
+Vectorized pricing, for repricing many orders at once
+- line items are read through the frames (DataFrameManager) of each model, one query per table
+- money is carried as integer cents so every sum is exact and matches the Decimal loop
+- costs are computed per row, then grouped by order and logistics
+"""
+
+COST_COLUMNS = [
+    "total_estimated_cost",
+    "cost_food_internal",
+    "cost_food_external",
+    "cost_beverage",
+    "cost_labor",
+    "cost_rentals",
+]
+
+
+def filter_frames_by_status(*, model: Model, filters: dict, status: str) -> QuerySet:
+    """ Same filtering as filter_by_status, as a DataFrameQuerySet """
+    return model.frames.all() & filter_by_status(
+        model=model, filters=filters, status=status
+    )
+
+
+def read_cost_frame(
+    *, queryset: QuerySet, columns: dict, money: list = ()
+) -> pd.DataFrame:
+    """
+    Reads queryset fields (keys of columns) into a DataFrame, renamed to values of columns
+    Columns listed in money are converted from Decimal to integer cents
+    """
+
+    frame = queryset.to_dataframe(fieldnames=list(columns), verbose=False).rename(
+        columns=columns
+    )
+    for column in money:
+        frame[column] = (frame[column].astype(float) * 100).round().astype("int64")
+
+    return frame
+
+
+def get_order_cost_frames(*, orders: QuerySet, status: str) -> dict:
+    """
+    Returns DataFrames of every cost-bearing row below orders, filtered as in get_order_cost_querysets
+    Child rows are restricted to their (filtered) parents, as when walking the tree
+    """
+
+    logistics_set = filter_frames_by_status(
+        model=models.OrderLogistics, filters=ORDER_STATUS_FILTERS, status=status
+    ).filter(order__in=orders)
+    packages = filter_frames_by_status(
+        model=models.OrderPackage, filters=PACKAGE_STATUS_FILTERS, status=status
+    ).filter(logistics__in=logistics_set)
+    menu_items = filter_frames_by_status(
+        model=models.OrderMenuItem, filters=PACKAGE_STATUS_FILTERS, status=status
+    ).filter(package__in=packages)
+    package_addons = filter_frames_by_status(
+        model=models.OrderAddOn, filters=PACKAGE_STATUS_FILTERS, status=status
+    )
 
-    for orderaddon in addons_set:
-        total_estimated_cost += orderaddon.price_numeric_fixed
-        if orderaddon.cost_type.name == "Food (Internal)":
-            cost_food_internal += orderaddon.price_numeric_fixed
-        elif orderaddon.cost_type.name == "Food (External)":
-            cost_food_external += orderaddon.price_numeric_fixed
-        elif orderaddon.cost_type.name == "Alcohol and NA Beverages":
-            cost_beverage += orderaddon.price_numeric_fixed
-        elif orderaddon.cost_type.name == "Labor":
-            cost_labor += orderaddon.price_numeric_fixed
-        elif orderaddon.cost_type.name == "Equipment and Rentals":
-            cost_rentals += orderaddon.price_numeric_fixed
-
-    # return total_estimated_cost
     return {
-        "total_estimated_cost": total_estimated_cost,
-        "cost_food_internal": cost_food_internal,
-        "cost_food_external": cost_food_external,
-        "cost_beverage": cost_beverage,
-        "cost_labor": cost_labor,
-        "cost_rentals": cost_rentals,
+        "logistics": read_cost_frame(
+            queryset=logistics_set,
+            columns={
+                "id": "logistics_id",
+                "order": "order_id",
+                "guest_count": "guest_count",
+            },
+        ),
+        "packages": read_cost_frame(
+            queryset=packages,
+            columns={
+                "id": "package_id",
+                "logistics": "logistics_id",
+                "package__cost_type": "cost_type",
+                "price_numeric": "per_person",
+                "price_numeric_fixed": "fixed",
+                "price_over_limit_numeric": "over_limit",
+                "selection_quantity": "selection_quantity",
+            },
+            money=["per_person", "fixed", "over_limit"],
+        ),
+        "courses": read_cost_frame(
+            queryset=filter_frames_by_status(
+                model=models.OrderCourse, filters=PACKAGE_STATUS_FILTERS, status=status
+            ).filter(package__in=packages),
+            columns={
+                "package": "package_id",
+                "course__price_numeric_per_person": "per_person",
+                "course__price_numeric_fixed": "fixed",
+            },
+            money=["per_person", "fixed"],
+        ),
+        "menu_items": read_cost_frame(
+            queryset=menu_items,
+            columns={
+                "id": "menu_item_id",
+                "package": "package_id",
+                "menu_item__price_numeric_per_person": "per_person",
+                "menu_item__price_numeric_fixed": "fixed",
+            },
+            money=["per_person", "fixed"],
+        ),
+        "modifications": read_cost_frame(
+            queryset=models.OrderCourseModification.frames.filter(
+                menu_item__in=menu_items
+            ),
+            columns={
+                "menu_item": "menu_item_id",
+                "price_numeric_per_person": "per_person",
+            },
+            money=["per_person"],
+        ),
+        "package_addons": read_cost_frame(
+            queryset=package_addons.filter(
+                logistics__isnull=True, package__in=packages
+            ),
+            columns={
+                "package": "package_id",
+                "cost_type": "cost_type",
+                "price_numeric": "per_person",
+                "price_numeric_fixed": "fixed",
+            },
+            money=["per_person", "fixed"],
+        ),
+        "logistics_addons": read_cost_frame(
+            queryset=package_addons.filter(
+                package__isnull=True, logistics__in=logistics_set
+            ),
+            columns={
+                "logistics": "logistics_id",
+                "cost_type": "cost_type",
+                "price_numeric": "per_person",
+                "price_numeric_fixed": "fixed",
+            },
+            money=["per_person", "fixed"],
+        ),
+        "order_addons": read_cost_frame(
+            queryset=filter_frames_by_status(
+                model=models.OrderAddOn, filters=ORDER_STATUS_FILTERS, status=status
+            ).filter(logistics__isnull=True, package__isnull=True, order__in=orders),
+            columns={
+                "order": "order_id",
+                "cost_type": "cost_type",
+                "price_numeric_fixed": "fixed",
+            },
+            money=["fixed"],
+        ),
     }
 
 
-def calculate_order_packages_cost(*, order: models.OrderBase, status: str) -> list:
+def sum_cost_entries(*, entries: pd.DataFrame, index: list) -> pd.DataFrame:
+    """ Groups cost entries (index columns, cost_type, amount) into COST_COLUMNS, in cents """
 
-    EASTERN_TZ = pytz.timezone("US/Eastern")
-    packages_estimated_cost = []
+    cost_columns = {
+        cost_type_id: get_cost_column(cost_type_id=cost_type_id)
+        for cost_type_id in entries["cost_type"].dropna().unique()
+    }
+    totals = entries.groupby(index)["amount"].sum().rename("total_estimated_cost")
+    buckets = (
+        entries.assign(cost_column=entries["cost_type"].map(cost_columns))
+        .dropna(subset=["cost_column"])
+        .groupby(index + ["cost_column"])["amount"]
+        .sum()
+        .unstack("cost_column")
+    )
 
-    for idx, logistics in enumerate(order.logistics.is_active(), start=1):
-        l_temp = {}
-
-        l_temp["id"] = logistics.id
-        formatted_start = (
-            logistics.event_start.astimezone(EASTERN_TZ)
-            .strftime("%I:%M %p")
-            .lstrip("0")
-            .replace(" 0", " ")
+    return (
+        totals.to_frame()
+        .join(buckets)
+        .reindex(columns=COST_COLUMNS)
+        .fillna(0)
+        .astype("int64")
+    )
+
+
+def calculate_orders_cost_frames(
+    *, orders: QuerySet, status: str
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Returns (costs by order, costs by logistics) as DataFrames of COST_COLUMNS in integer cents
+    Costs by logistics are indexed by (order_id, logistics_id) and exclude order-level addons
+    Same arithmetic as calculate_orderpackage_tree_cost and calculate_logistics_tree_cost
+    """
+
+    frames = get_order_cost_frames(orders=orders, status=status)
+    logistics = frames["logistics"]
+
+    # menu item per-person cost includes its modifications
+    menu_items = frames["menu_items"]
+    menu_items["per_person"] += (
+        menu_items["menu_item_id"]
+        .map(frames["modifications"].groupby("menu_item_id")["per_person"].sum())
+        .fillna(0)
+        .astype("int64")
+    )
+    menu_items_by_package = menu_items.groupby("package_id").agg(
+        menu_items_count=("menu_item_id", "size"),
+        menu_items_per_person=("per_person", "sum"),
+        menu_items_fixed=("fixed", "sum"),
+    )
+    courses_by_package = (
+        frames["courses"]
+        .groupby("package_id")[["per_person", "fixed"]]
+        .sum()
+        .add_prefix("courses_")
+    )
+
+    packages = (
+        frames["packages"]
+        .merge(logistics, on="logistics_id")
+        .join(menu_items_by_package, on="package_id")
+        .join(courses_by_package, on="package_id")
+    )
+    tree_columns = list(menu_items_by_package.columns) + list(
+        courses_by_package.columns
+    )
+    packages[tree_columns] = packages[tree_columns].fillna(0).astype("int64")
+
+    # for now, over_limit costs refer only to menu selections
+    over_limit_count = (
+        packages["menu_items_count"] - packages["selection_quantity"]
+    ).clip(lower=0)
+    packages["amount"] = (
+        packages["per_person"]
+        + packages["over_limit"] * over_limit_count
+        + packages["courses_per_person"]
+        + packages["menu_items_per_person"]
+    ) * packages["guest_count"] + (
+        packages["fixed"] + packages["courses_fixed"] + packages["menu_items_fixed"]
+    )
+
+    package_addons = frames["package_addons"].merge(
+        packages[["package_id", "logistics_id", "order_id", "guest_count"]],
+        on="package_id",
+    )
+    logistics_addons = frames["logistics_addons"].merge(logistics, on="logistics_id")
+    for addons in (package_addons, logistics_addons):
+        addons["amount"] = (
+            addons["per_person"] * addons["guest_count"] + addons["fixed"]
         )
-        l_temp[
-            "description"
-        ] = f"Setup/Delivery {idx} at {formatted_start} for {logistics.guest_count} guests"
 
+    entry_columns = ["order_id", "logistics_id", "cost_type", "amount"]
+    logistics_entries = pd.concat(
+        [
+            packages[entry_columns],
+            package_addons[entry_columns],
+            logistics_addons[entry_columns],
+        ],
+        ignore_index=True,
+    )
+
+    # addons (per order) are flat fees only
+    order_addons = frames["order_addons"].rename(columns={"fixed": "amount"})
+    order_entries = pd.concat(
+        [
+            logistics_entries[["order_id", "cost_type", "amount"]],
+            order_addons[["order_id", "cost_type", "amount"]],
+        ],
+        ignore_index=True,
+    )
+
+    costs_by_logistics = sum_cost_entries(
+        entries=logistics_entries, index=["order_id", "logistics_id"]
+    ).reindex(
+        pd.MultiIndex.from_frame(logistics[["order_id", "logistics_id"]]),
+        fill_value=0,
+    )
+    costs_by_order = sum_cost_entries(
+        entries=order_entries, index=["order_id"]
+    ).reindex(
+        pd.Index(orders.values_list("id", flat=True), name="order_id"), fill_value=0
+    )
+
+    return (costs_by_order, costs_by_logistics)
+
+
+def calculate_orders_total_cost_vectorized(*, orders: QuerySet, status: str) -> dict:
+    """
+    Vectorized version of calculate_orders_total_cost, keyed by order id
+    Returns the same Decimal values as the loop
+    """
+
+    costs_by_order, _ = calculate_orders_cost_frames(orders=orders, status=status)
+
+    return {
+        order_id: {column: D(int(cents)).scaleb(-2) for column, cents in costs.items()}
+        for order_id, costs in costs_by_order.to_dict("index").items()
+    }
+
+
+def get_logistics_description(*, logistics: models.OrderLogistics, idx: int) -> str:
+    formatted_start = (
+        logistics.event_start.astimezone(EASTERN_TZ)
+        .strftime("%I:%M %p")
+        .lstrip("0")
+        .replace(" 0", " ")
+    )
+    return (
+        f"Setup/Delivery {idx} at {formatted_start} for {logistics.guest_count} guests"
+    )
+
+
+def calculate_logistics_packages_cost(
+    *, logistics: models.OrderLogistics, status: str
+) -> Tuple[dict, dict]:
+    """
+    Returns (packages and addons as displayed for logistics, cost totals for logistics)
+    Display dict lacks description, which depends on position of logistics within order
+    """
+
+    costs = get_empty_costs()
     packages = []
 
     for op in logistics.packages.is_active():
         temp = {}
         temp["id"] = op.id
         temp["name"] = op.package.name
-        package_cost = calculate_package_cost(orderpackage=op, status="is_active")
+        package_cost = calculate_package_cost(orderpackage=op, status=status)
         temp["cost"] = package_cost["cost"]
         temp["price_descriptive"] = package_cost["price_descriptive"]
         temp["guest_count"] = package_cost["guest_count"]
         temp["addons_staff"] = package_cost["addons_staff"]
         packages.append(temp)
 
-    l_temp["packages"] = packages
+        costs["total_estimated_cost"] += package_cost["cost"] + sum(
+            addon["cost"] for addon in package_cost["addons_staff"]
+        )
+        for key in COST_BUCKET_KEYS:
+            costs[key] += package_cost[key]
 
-    l_temp["addons_staff"] = calculate_logistics_cost(
-        logistics=logistics, status="is_active"
+    addons_staff = calculate_logistics_cost(logistics=logistics, status=status)
+    costs["total_estimated_cost"] += sum(
+        addon["cost"] for addon in addons_staff["addons_staff"]
     )
+    for key in COST_BUCKET_KEYS:
+        costs[key] += addons_staff[key]
 
-    packages_estimated_cost.append(l_temp)
+    l_temp = {"id": logistics.id, "packages": packages, "addons_staff": addons_staff}
+
+    return (l_temp, costs)
+
+
+def calculate_order_packages_cost(*, order: models.OrderBase, status: str) -> list:
+    packages_estimated_cost = []
+
+    for idx, logistics in enumerate(order.logistics.is_active(), start=1):
+        l_temp, _ = calculate_logistics_packages_cost(
+            logistics=logistics, status=status
+        )
+        l_temp["description"] = get_logistics_description(logistics=logistics, idx=idx)
+        packages_estimated_cost.append(l_temp)
 
     return packages_estimated_cost
 
 
+"""
+Cost snapshots
+Per-order and per-logistics costs for status is_active, as read by detail and PDF views
+- kept current by signals on the order tree (see models), one logistics subtree at a time
+- missing snapshots (orders predating them) are built on first read
+"""
+
+SNAPSHOT_STATUS = "is_active"
+
+SNAPSHOT_DECIMAL_KEYS = {
+    "cost",
+    "price_numeric",
+    "price_numeric_fixed",
+    "total_estimated_cost",
+    *COST_BUCKET_KEYS,
+}
+
+SNAPSHOT_UUID_KEYS = {"id", "cost_type_id", "package_id", "logistics_id"}
+
+_pending_snapshot_updates = threading.local()
+
+
+def decode_snapshot_value(key: str, value):
+    """ JSON stores money and ids as strings; restore Decimals and UUIDs for templates """
+
+    if isinstance(value, list):
+        return [decode_snapshot_value(None, item) for item in value]
+    if isinstance(value, dict):
+        return {
+            item_key: decode_snapshot_value(item_key, item)
+            for item_key, item in value.items()
+        }
+    if value is None:
+        return value
+    if key in SNAPSHOT_DECIMAL_KEYS:
+        return D(value)
+    if key in SNAPSHOT_UUID_KEYS:
+        return uuid.UUID(value)
+    return value
+
+
+def update_logistics_cost_snapshot(
+    *, logistics: models.OrderLogistics
+) -> models.OrderLogisticsCostSnapshot:
+    l_temp, costs = calculate_logistics_packages_cost(
+        logistics=logistics, status=SNAPSHOT_STATUS
+    )
+    snapshot, _ = models.OrderLogisticsCostSnapshot.objects.update_or_create(
+        logistics=logistics,
+        defaults={
+            "order_id": logistics.order_id,
+            "packages": l_temp["packages"],
+            "addons_staff": l_temp["addons_staff"],
+            **costs,
+        },
+    )
+    return snapshot
+
+
+def update_order_cost_snapshot(*, order: models.OrderBase) -> models.OrderCostSnapshot:
+    """ Sums snapshots of active logistics (building any missing) and order-level addons """
+
+    active_logistics = order.logistics.is_active()
+    for logistics in active_logistics.filter(cost_snapshot__isnull=True):
+        update_logistics_cost_snapshot(logistics=logistics)
+
+    costs = get_empty_costs()
+    totals = models.OrderLogisticsCostSnapshot.objects.filter(
+        logistics__in=active_logistics
+    ).aggregate(*[Sum(key) for key in costs])
+    for key in costs:
+        costs[key] += totals[f"{key}__sum"] or 0
+
+    # addons (per order) are flat fees only
+    order_addons = (
+        order.addons_staff.is_active()
+        .filter(logistics__isnull=True, package__isnull=True)
+        .values("cost_type")
+        .annotate(Sum("price_numeric_fixed"))
+    )
+    for addon in order_addons:
+        costs["total_estimated_cost"] += addon["price_numeric_fixed__sum"]
+        add_to_cost_bucket(
+            costs=costs,
+            cost_type_id=addon["cost_type"],
+            amount=addon["price_numeric_fixed__sum"],
+        )
+
+    snapshot, _ = models.OrderCostSnapshot.objects.update_or_create(
+        order=order, defaults=costs
+    )
+    return snapshot
+
+
+def update_cost_snapshots(*, order_id, logistics_id=None) -> models.OrderCostSnapshot:
+    """
+    Recomputes logistics subtree (if given) and order totals
+    Rows deleted in the meantime (e.g. by cascade) are skipped
+    """
+
+    order = models.OrderBase.objects.filter(id=order_id).first()
+    if order is None:
+        return None
+
+    if logistics_id:
+        logistics = models.OrderLogistics.objects.filter(id=logistics_id).first()
+        if logistics is not None:
+            update_logistics_cost_snapshot(logistics=logistics)
+
+    return update_order_cost_snapshot(order=order)
+
+
+def flush_cost_snapshots_updates() -> None:
+    pending = getattr(_pending_snapshot_updates, "keys", set())
+    _pending_snapshot_updates.keys = set()
+
+    logistics_ids_by_order = defaultdict(set)
+    for order_id, logistics_id in pending:
+        logistics_ids_by_order[order_id].add(logistics_id)
+
+    for order_id, logistics_ids in logistics_ids_by_order.items():
+        order = models.OrderBase.objects.filter(id=order_id).first()
+        if order is None:
+            continue
+        for logistics in models.OrderLogistics.objects.filter(id__in=logistics_ids):
+            update_logistics_cost_snapshot(logistics=logistics)
+        update_order_cost_snapshot(order=order)
+
+
+def schedule_cost_snapshots_update(*, order_id, logistics_id=None) -> None:
+    """ Queues update_cost_snapshots until commit; repeated keys within a transaction run once """
+
+    if not hasattr(_pending_snapshot_updates, "keys"):
+        _pending_snapshot_updates.keys = set()
+    _pending_snapshot_updates.keys.add((order_id, logistics_id))
+
+    transaction.on_commit(flush_cost_snapshots_updates)
+
+
+def get_order_cost_snapshot(*, order: models.OrderBase) -> Tuple[D, list]:
+    """
+    Returns (total_estimated_cost, packages_estimated_cost) from snapshots
+    Same values as calculate_order_total_cost and calculate_order_packages_cost for is_active
+    """
+
+    try:
+        order_snapshot = order.cost_snapshot
+    except ObjectDoesNotExist:
+        order_snapshot = update_order_cost_snapshot(order=order)
+
+    packages_estimated_cost = []
+    for idx, logistics in enumerate(
+        order.logistics.is_active().select_related("cost_snapshot"), start=1
+    ):
+        try:
+            snapshot = logistics.cost_snapshot
+        except ObjectDoesNotExist:
+            snapshot = update_logistics_cost_snapshot(logistics=logistics)
+
+        packages_estimated_cost.append(
+            {
+                "id": logistics.id,
+                "description": get_logistics_description(logistics=logistics, idx=idx),
+                "packages": decode_snapshot_value("packages", snapshot.packages),
+                "addons_staff": decode_snapshot_value(
+                    "addons_staff", snapshot.addons_staff
+                ),
+            }
+        )
+
+    return (order_snapshot.total_estimated_cost, packages_estimated_cost)
+
+
+"""
+PTAEO columns
+BillingRecord.save parses payment_reference into project/task/award/expenditure/organization; rows written
+around save (bulk_create, queryset update, raw SQL) are brought up to date by backfill_billing_record_ptaeo
+"""
+
+
+def backfill_billing_record_ptaeo(*, batch_size: int = 1000) -> int:
+    """ Re-parses every billing record's payment reference, writing rows whose columns differ """
+
+    stale = []
+    for billing_record in models.BillingRecord.objects.only(
+        "payment_reference", *models.PTAEO_FIELDS
+    ).iterator(chunk_size=batch_size):
+        parsed = models.parse_ptaeo(billing_record.payment_reference)
+        if any(
+            getattr(billing_record, field) != value for field, value in parsed.items()
+        ):
+            billing_record.set_ptaeo()
+            stale.append(billing_record)
+
+    models.BillingRecord.objects.bulk_update(
+        stale, models.PTAEO_FIELDS, batch_size=batch_size
+    )
+    return len(stale)
+
+
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+# ORDER LIST
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+
+"""
+Order list pages
+- keyset pagination on (event date, invoice number), unique per order, so a deep page costs the same as the
+  first instead of an ever larger OFFSET
+- a cursor is the "<event date>:<invoice number>" of the last (next page) or first (previous page) order;
+  the last page is read backwards from the end
+- customers, their tenants and statuses are joined, as each row renders OrderBase.__str__
+- the total count is cached per filtered query for ORDERS_LIST_COUNT_CACHE_TIMEOUT, so moving between pages
+  does not count again
+"""
+
+ORDER_LIST_ORDERING = ["event_date", "invoice_number"]
+ORDER_LIST_COUNT_KEY_PREFIX = "orders_list_count"
+
+
+def get_order_list_cursor(*, order: models.OrderBase) -> str:
+    return f"{order.event_date.isoformat()}:{order.invoice_number}"
+
+
+def parse_order_list_cursor(*, cursor: str) -> Tuple[dt.date, str]:
+    """ (event date, invoice number) of cursor; raises ValueError if malformed """
+
+    event_date, separator, invoice_number = cursor.partition(":")
+    if not separator or not invoice_number:
+        raise ValueError(f"Malformed cursor {cursor!r}")
+    return (dt.date.fromisoformat(event_date), invoice_number)
+
+
+def get_order_list_page(
+    *,
+    orders: QuerySet,
+    page_size: int,
+    after: str = None,
+    before: str = None,
+    last: bool = False,
+) -> dict:
+    """
+    Page of orders after (or before) a cursor, or the last page, with cursors of neighbouring pages
+    A malformed cursor returns the first page
+    """
+
+    orders = orders.select_related("customer__tenant").order_by(*ORDER_LIST_ORDERING)
+
+    cursor = None
+    if after or before:
+        try:
+            cursor = parse_order_list_cursor(cursor=after or before)
+        except ValueError:
+            after = before = None
+
+    if cursor:
+        event_date, invoice_number = cursor
+        following = Q(event_date__gt=event_date) | Q(
+            event_date=event_date, invoice_number__gt=invoice_number
+        )
+        preceding = Q(event_date__lt=event_date) | Q(
+            event_date=event_date, invoice_number__lt=invoice_number
+        )
+
+    if before or (last and not after):
+        # walk backwards from the cursor (or the end), then restore display order
+        if before:
+            orders = orders.filter(preceding)
+        page = list(orders.reverse()[: page_size + 1])
+        has_previous, has_next = len(page) > page_size, bool(before)
+        page = page[:page_size][::-1]
+    else:
+        if after:
+            orders = orders.filter(following)
+        page = list(orders[: page_size + 1])
+        has_previous, has_next = bool(after), len(page) > page_size
+        page = page[:page_size]
+
+    return {
+        "records": page,
+        "previous_cursor": get_order_list_cursor(order=page[0])
+        if page and has_previous
+        else None,
+        "next_cursor": get_order_list_cursor(order=page[-1])
+        if page and has_next
+        else None,
+    }
+
+
+def get_order_list_count(*, orders: QuerySet) -> int:
+    """ Count of orders, cached per query (SQL and parameters) """
+
+    sql, params = orders.order_by().query.sql_with_params()
+    key = hashlib.md5(f"{sql}|{params!r}".encode()).hexdigest()
+    return cache.get_or_set(
+        f"{ORDER_LIST_COUNT_KEY_PREFIX}:{key}",
+        orders.count,
+        getattr(settings, "ORDERS_LIST_COUNT_CACHE_TIMEOUT", 60),
+    )
+
+
+"""
+Order search
+- each order has an OrderSearchDocument: invoice number, CIS numbers, nickname, order contact, customer
+  name and email, and the text of its notes
+- the documents are indexed by the database: an FTS5 table kept in sync by triggers on SQLite, its rows
+  keyed per order by orders_ordersearch_fts_key; a generated tsvector column with a GIN index on
+  PostgreSQL (see migrations 0007_order_search, 0010_order_search_fts_keys and
+  0011_drop_order_search_trgm_index)
+- search_orders ranks matches in the index (bm25, or ts_rank plus trigram word similarity), keeps the best
+  ORDERS_SEARCH_LIMIT, then joins them back to an orders queryset in rank order
+- every term must match, as a word prefix
+"""
+
+ORDER_SEARCH_FTS_TABLE = "orders_ordersearch_fts"
+ORDER_SEARCH_BATCH_SIZE = 500
+
+_pending_search_updates = threading.local()
+
+
+def get_order_search_documents(*, order_ids: list) -> dict:
+    """ Search document text of each order in order_ids, keyed by order id """
+
+    orders = models.OrderBase.objects.filter(id__in=order_ids).values_list(
+        "id",
+        "invoice_number",
+        "cis_numbers",
+        "nickname",
+        "order_contact",
+        "customer__first_name",
+        "customer__last_name",
+        "customer__email",
+    )
+    parts = defaultdict(list)
+    for order_id, *fields in orders:
+        parts[order_id].extend(fields)
+
+    notes = models.OrderNote.objects.filter(
+        Q(order_id__in=order_ids) | Q(logistics__order_id__in=order_ids)
+    ).values_list("order_id", "logistics__order_id", "note")
+    for order_id, logistics_order_id, note in notes:
+        order_id = order_id or logistics_order_id
+        if order_id in parts:
+            parts[order_id].append(note)
+
+    return {
+        order_id: " ".join(str(field) for field in fields if field)
+        for order_id, fields in parts.items()
+    }
+
+
+def update_search_documents(*, order_ids) -> int:
+    """ Rewrites the search documents of order_ids that are missing or out of date; returns rows written """
+
+    order_ids = list(order_ids)
+    written = 0
+    for start in range(0, len(order_ids), ORDER_SEARCH_BATCH_SIZE):
+        documents = get_order_search_documents(
+            order_ids=order_ids[start : start + ORDER_SEARCH_BATCH_SIZE]
+        )
+        existing = {
+            search_document.order_id: search_document
+            for search_document in models.OrderSearchDocument.objects.filter(
+                order_id__in=documents
+            ).only("order_id", "document")
+        }
+
+        stale = []
+        for order_id, document in documents.items():
+            search_document = existing.get(order_id)
+            if search_document and search_document.document != document:
+                search_document.document = document
+                search_document.updated_at = timezone.now()
+                stale.append(search_document)
+        models.OrderSearchDocument.objects.bulk_update(
+            stale, ["document", "updated_at"]
+        )
+        created = models.OrderSearchDocument.objects.bulk_create(
+            [
+                models.OrderSearchDocument(order_id=order_id, document=document)
+                for order_id, document in documents.items()
+                if order_id not in existing
+            ]
+        )
+        written += len(stale) + len(created)
+
+    return written
+
+
+def rebuild_search_documents(*, batch_size: int = 1000) -> int:
+    order_ids = models.OrderBase.objects.values_list("id", flat=True).iterator(
+        chunk_size=batch_size
+    )
+    written = 0
+    while True:
+        batch = list(itertools.islice(order_ids, batch_size))
+        if not batch:
+            return written
+        written += update_search_documents(order_ids=batch)
+
+
+def flush_search_documents_updates() -> None:
+    pending = getattr(_pending_search_updates, "order_ids", set())
+    _pending_search_updates.order_ids = set()
+    update_search_documents(order_ids=pending)
+
+
+def schedule_search_documents_update(*, order_ids) -> None:
+    """ Queues update_search_documents until commit; repeated orders within a transaction run once """
+
+    if not hasattr(_pending_search_updates, "order_ids"):
+        _pending_search_updates.order_ids = set()
+    _pending_search_updates.order_ids.update(order_ids)
+
+    transaction.on_commit(flush_search_documents_updates)
+
+
+def get_search_terms(*, query: str) -> list:
+    return re.findall(r"\w+", query.lower())
+
+
+def get_ranked_order_ids(*, query: str, limit: int) -> list:
+    """ Ids of orders whose search documents match every term of query, best match first """
+
+    terms = get_search_terms(query=query)
+    if not terms:
+        return []
+
+    connection = connections["default"]
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT order_id FROM orders_ordersearchdocument, "
+                "to_tsquery('simple', %s) query "
+                "WHERE search_vector @@ query "
+                "ORDER BY ts_rank(search_vector, query) + word_similarity(%s, document) DESC "
+                "LIMIT %s",
+                [" & ".join(f"{term}:*" for term in terms), " ".join(terms), limit],
+            )
+        else:
+            cursor.execute(
+                f"SELECT order_id FROM {ORDER_SEARCH_FTS_TABLE} "
+                f"WHERE {ORDER_SEARCH_FTS_TABLE} MATCH %s ORDER BY rank LIMIT %s",
+                [" ".join(f'"{term}"*' for term in terms), limit],
+            )
+        rows = cursor.fetchall()
+
+    return [uuid.UUID(str(order_id)) for order_id, in rows]
+
+
+def search_orders(
+    *, query: str, orders: QuerySet = None, limit: int = None
+) -> QuerySet:
+    """ orders (default all) matching query, best match first, at most limit (ORDERS_SEARCH_LIMIT) """
+
+    if orders is None:
+        orders = models.OrderBase.objects.all()
+    limit = limit or getattr(settings, "ORDERS_SEARCH_LIMIT", 500)
+
+    ranked = get_ranked_order_ids(query=query, limit=limit)
+    if not ranked:
+        return orders.none()
+
+    return (
+        orders.filter(id__in=ranked)
+        .annotate(
+            search_rank=Case(
+                *[
+                    When(id=order_id, then=position)
+                    for position, order_id in enumerate(ranked)
+                ],
+                output_field=IntegerField(),
+            )
+        )
+        .order_by("search_rank")
+    )
+
+
 # –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
 # EXPORT
 # –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
@@ -588,22 +1474,16 @@ WeasyPrint currently (v.52.5, as of 2021-4-19) has not yet implemented CSS Grid
 """
 
 
-def order_generate_pdf(*, base_url: str, order_id: str) -> HttpResponse:
-    # Retrieve/calculate context
-    obj = models.OrderBase.objects.get(id=order_id)
-    form = forms.OrderForm(instance=obj)
-    options = common_services.get_page_context_options(models.OrderBase)
+def get_order_pdf_html(*, order: Model) -> Tuple[str, str]:
+    """ Renders the PDF template for order; returns (html, filename) """
 
-    total_estimated_cost = calculate_order_total_cost(order=obj, status="is_active")[
-        "total_estimated_cost"
-    ]
+    form = forms.OrderForm(instance=order)
+    options = common_services.get_page_context_options(models.OrderBase)
 
-    packages_estimated_cost = calculate_order_packages_cost(
-        order=obj, status="is_active"
-    )
+    total_estimated_cost, packages_estimated_cost = get_order_cost_snapshot(order=order)
 
     if (
-        obj.addons_staff.is_active()
+        order.addons_staff.is_active()
         .filter(logistics__isnull=True, package__isnull=True)
         .count()
         > 0
@@ -617,12 +1497,10 @@ def order_generate_pdf(*, base_url: str, order_id: str) -> HttpResponse:
     )
     printed_as_of = f"As of {time_now_str}"
 
-    # Render PDF
-    font_config = FontConfiguration()
     html_string = render_to_string(
         "order_detail_pdf.html",
         {
-            "data": obj,
+            "data": order,
             "form": form,
             "options": options,
             "total_estimated_cost": total_estimated_cost,
@@ -631,20 +1509,399 @@ def order_generate_pdf(*, base_url: str, order_id: str) -> HttpResponse:
             "printed_as_of": printed_as_of,
         },
     )
-    html = HTML(string=html_string, base_url=base_url)
-    result = html.write_pdf(font_config=font_config, presentational_hints=True)
 
-    # Generate HTTP response
-    invoice_number = obj.invoice_number
-    event_date = obj.event_date.strftime("%Y-%m-%d")
+    invoice_number = order.invoice_number
+    event_date = order.event_date.strftime("%Y-%m-%d")
     filename = f"{invoice_number}-{event_date}.pdf"
 
+    return (html_string, filename)
+
+
+"""
+Shared render resources
+- one FontConfiguration per process, so @font-face fonts are fetched and loaded once rather than per PDF
+- ORDER_PDF_STYLESHEETS (static paths or absolute URLs) are parsed once against that FontConfiguration
+  and passed to write_pdf, so order_detail_pdf.html does not link them itself
+- a stylesheet that cannot be loaded is skipped and retried on the next render
+- renders are serialized within a process, as FontConfiguration is not safe to share between threads
+"""
+
+_pdf_render_lock = threading.RLock()
+_pdf_font_config = None
+_pdf_stylesheets = {}
+
+
+def get_pdf_font_config() -> FontConfiguration:
+    global _pdf_font_config
+
+    with _pdf_render_lock:
+        if _pdf_font_config is None:
+            _pdf_font_config = FontConfiguration()
+    return _pdf_font_config
+
+
+def load_pdf_stylesheet(*, source: str) -> CSS:
+    font_config = get_pdf_font_config()
+    if "://" in source:
+        return CSS(url=source, font_config=font_config, url_fetcher=fetch_pdf_asset)
+
+    filename = finders.find(source) or os.path.join(settings.STATIC_ROOT, source)
+    if not os.path.exists(filename):
+        raise FileNotFoundError(filename)
+    return CSS(filename=filename, font_config=font_config)
+
+
+def get_pdf_stylesheets() -> list:
+    stylesheets = []
+    with _pdf_render_lock:
+        for source in getattr(settings, "ORDER_PDF_STYLESHEETS", []):
+            if source not in _pdf_stylesheets:
+                try:
+                    _pdf_stylesheets[source] = load_pdf_stylesheet(source=source)
+                except Exception as exc:
+                    logger.warning(f"PDF stylesheet {source} not loaded: {exc!r}")
+                    continue
+            stylesheets.append(_pdf_stylesheets[source])
+    return stylesheets
+
+
+def clear_pdf_render_cache() -> None:
+    global _pdf_font_config
+
+    with _pdf_render_lock:
+        _pdf_font_config = None
+        _pdf_stylesheets.clear()
+        read_local_pdf_asset.cache_clear()
+        fetch_external_pdf_asset.cache_clear()
+
+
+"""
+Resource fetching
+- WeasyPrint fetches each linked asset by URL; STATIC_URL and MEDIA_URL paths on the host being rendered
+  for are read from disk instead (staticfiles finders, then STATIC_ROOT; MEDIA_ROOT), so a render does not
+  call back into the web workers serving the request
+- other URLs, and local paths with no file on disk, go through WeasyPrint's HTTP fetcher
+- fetched assets are kept in a per-process LRU of ORDER_PDF_ASSET_CACHE_SIZE entries; local files are
+  keyed by modification time, so edited files are read again
+- ORDER_PDF_LOCAL_ASSETS = False restores plain HTTP fetching
+"""
+
+
+@functools.lru_cache(maxsize=getattr(settings, "ORDER_PDF_ASSET_CACHE_SIZE", 128))
+def read_local_pdf_asset(path: str, mtime: float) -> dict:
+    with open(path, "rb") as asset_file:
+        return {
+            "string": asset_file.read(),
+            "mime_type": mimetypes.guess_type(path)[0] or "application/octet-stream",
+            "filename": path,
+        }
+
+
+@functools.lru_cache(maxsize=getattr(settings, "ORDER_PDF_ASSET_CACHE_SIZE", 128))
+def fetch_external_pdf_asset(url: str) -> dict:
+    result = default_url_fetcher(url)
+    if "file_obj" in result:
+        result["string"] = result.pop("file_obj").read()
+    return result
+
+
+def get_local_pdf_asset_path(*, url: str, local_hosts: tuple):
+    """ Path on disk for a static or media URL on one of local_hosts, None if not local or not found """
+
+    parts = urlsplit(url)
+    if parts.scheme not in ["http", "https"] or parts.netloc not in local_hosts:
+        return None
+
+    path = unquote(parts.path)
+    if path.startswith(settings.STATIC_URL):
+        relative_path = path[len(settings.STATIC_URL) :]
+        asset_path = finders.find(relative_path)
+        if asset_path is None and settings.STATIC_ROOT:
+            asset_path = safe_join(settings.STATIC_ROOT, relative_path)
+    elif path.startswith(settings.MEDIA_URL):
+        asset_path = safe_join(settings.MEDIA_ROOT, path[len(settings.MEDIA_URL) :])
+    else:
+        return None
+
+    if asset_path and os.path.isfile(asset_path):
+        return asset_path
+    return None
+
+
+def fetch_pdf_asset(url: str, local_hosts: tuple = (), **kwargs) -> dict:
+    asset_path = get_local_pdf_asset_path(url=url, local_hosts=local_hosts)
+    if asset_path:
+        return dict(read_local_pdf_asset(asset_path, os.path.getmtime(asset_path)))
+    return dict(fetch_external_pdf_asset(url))
+
+
+def get_pdf_url_fetcher(*, base_url: str):
+    if not getattr(settings, "ORDER_PDF_LOCAL_ASSETS", True):
+        return default_url_fetcher
+    return functools.partial(fetch_pdf_asset, local_hosts=(urlsplit(base_url).netloc,))
+
+
+def write_order_pdf(*, html_string: str, base_url: str, target=None):
+    """ Renders html to target (file-like, e.g. an HttpResponse); returns bytes if no target """
+
+    html = HTML(
+        string=html_string,
+        base_url=base_url,
+        url_fetcher=get_pdf_url_fetcher(base_url=base_url),
+    )
+    with _pdf_render_lock:
+        return html.write_pdf(
+            target=target,
+            stylesheets=get_pdf_stylesheets(),
+            font_config=get_pdf_font_config(),
+            presentational_hints=True,
+        )
+
+
+def render_order_pdf(*, base_url: str, order_id: str) -> Tuple[bytes, str]:
+    """ Returns (pdf, filename) """
+
+    obj = models.OrderBase.objects.get(id=order_id)
+    html_string, filename = get_order_pdf_html(order=obj)
+    result = write_order_pdf(html_string=html_string, base_url=base_url)
+
+    return (result, filename)
+
+
+def order_generate_pdf(*, base_url: str, order_id: str) -> HttpResponse:
+    obj = models.OrderBase.objects.get(id=order_id)
+    html_string, filename = get_order_pdf_html(order=obj)
+
+    # Render straight into HTTP response
     response = HttpResponse(content_type="application/pdf;")
     response["Content-Transfer-Encoding"] = "binary"
-    with NamedTemporaryFile(delete=True) as output:
-        output.write(result)
-        output.flush()
-        output = open(output.name, "rb")
-        response.write(output.read())
+    write_order_pdf(html_string=html_string, base_url=base_url, target=response)
 
     return (response, filename)
+
+
+"""
+PDF artifacts
+- rendering runs as a background job (apps.common.jobs) and stores the file as an OrderPdf,
+  keyed by order id and a hash of the order state; unchanged orders are served from the stored file
+- the state hash covers updated_at of the order tree rows and the catalog rows they reference,
+  so any saved change produces a new hash (queryset update() and m2m changes do not touch updated_at)
+- billed orders are served from BillingRecord.pdf_as_of_record, filled by the first render after billing
+- pending or running jobs older than ORDER_PDF_JOB_TIMEOUT seconds are assumed lost and re-enqueued
+"""
+
+
+def get_order_state_hash(*, order: Model) -> str:
+    digest = hashlib.sha256()
+    digest.update(f"{order.id}:{order.updated_at.isoformat()}".encode())
+
+    querysets = [
+        # customer and tenant are printed on the invoice
+        users_models.User.objects.filter(id=order.customer_id).values_list(
+            "id",
+            "first_name",
+            "last_name",
+            "email",
+            "updated_at",
+            "tenant__name",
+            "tenant__updated_at",
+        ),
+        models.OrderStatus.objects.filter(order_id=order.id).values_list(
+            "id", "updated_at"
+        ),
+        models.OrderPayment.objects.filter(order_id=order.id).values_list(
+            "id", "updated_at", "payment__updated_at"
+        ),
+        models.BillingRecord.objects.filter(order_id=order.id).values_list(
+            "id", "updated_at"
+        ),
+        models.OrderLogistics.objects.filter(order_id=order.id).values_list(
+            "id", "updated_at", "building__updated_at", "location__updated_at"
+        ),
+        models.OrderNote.objects.filter(order_id=order.id).values_list(
+            "id", "updated_at"
+        ),
+        models.OrderPackage.objects.filter(order_id=order.id).values_list(
+            "id", "updated_at", "package__updated_at"
+        ),
+        models.OrderCourse.objects.filter(order_id=order.id).values_list(
+            "id", "updated_at", "course__updated_at"
+        ),
+        models.OrderMenuItem.objects.filter(order_id=order.id).values_list(
+            "id", "updated_at", "menu_item__updated_at"
+        ),
+        models.OrderCourseModification.objects.filter(
+            course__order_id=order.id
+        ).values_list("id", "updated_at", "modification__updated_at"),
+        models.OrderAddOn.objects.filter(order_id=order.id).values_list(
+            "id", "updated_at"
+        ),
+    ]
+    for queryset in querysets:
+        for row in queryset.order_by("id"):
+            digest.update(repr(row).encode())
+        digest.update(b"|")
+
+    return digest.hexdigest()
+
+
+def get_billed_order_pdf(*, order: Model):
+    """ PDF stored with the billing record, if order is billed and one was stored """
+
+    try:
+        billing_record = order.billing_record
+    except ObjectDoesNotExist:
+        return None
+    if billing_record.date_billed and billing_record.pdf_as_of_record:
+        return billing_record.pdf_as_of_record
+    return None
+
+
+def request_order_pdf(*, order: Model, base_url: str) -> Model:
+    """ OrderPdf for current order state, enqueuing a render unless one is done or in progress """
+
+    order_pdf, created = models.OrderPdf.objects.get_or_create(
+        order=order, state_hash=get_order_state_hash(order=order)
+    )
+
+    timeout = getattr(settings, "ORDER_PDF_JOB_TIMEOUT", 600)
+    expired = order_pdf.updated_at < timezone.now() - dt.timedelta(seconds=timeout)
+    stale = order_pdf.status in ["PENDING", "RUNNING"] and expired
+    if created or stale or order_pdf.status == "FAILED":
+        order_pdf.status = "PENDING"
+        order_pdf.error = ""
+        order_pdf.save()
+        jobs.enqueue_job(
+            "apps.orders.services.render_order_pdf_job",
+            order_pdf_id=str(order_pdf.id),
+            base_url=base_url,
+        )
+
+    return order_pdf
+
+
+def render_order_pdf_job(*, order_pdf_id: str, base_url: str) -> None:
+    claimed = models.OrderPdf.objects.filter(id=order_pdf_id, status="PENDING").update(
+        status="RUNNING", updated_at=timezone.now()
+    )
+    if not claimed:
+        return
+
+    order_pdf = models.OrderPdf.objects.select_related("order").get(id=order_pdf_id)
+    try:
+        result, filename = render_order_pdf(
+            base_url=base_url, order_id=order_pdf.order_id
+        )
+    except Exception as exc:
+        logger.exception(f"Rendering PDF for order {order_pdf.order_id} failed")
+        order_pdf.status = "FAILED"
+        order_pdf.error = repr(exc)
+        order_pdf.save()
+        return
+
+    order_pdf.pdf.save(
+        f"{order_pdf.order_id}/{order_pdf.state_hash}.pdf",
+        ContentFile(result),
+        save=False,
+    )
+    order_pdf.filename = filename
+    order_pdf.status = "DONE"
+    order_pdf.save()
+
+    # superseded renders of the same order
+    for previous in order_pdf.order.pdfs.filter(
+        status__in=["DONE", "FAILED"], created_at__lt=order_pdf.created_at
+    ):
+        previous.pdf.delete(save=False)
+        previous.delete()
+
+    billing_record = models.BillingRecord.objects.filter(
+        order_id=order_pdf.order_id, date_billed__isnull=False
+    ).first()
+    if billing_record and not billing_record.pdf_as_of_record:
+        billing_record.pdf_as_of_record.save(filename, ContentFile(result))
+
+
+def get_order_pdf_status(*, order_pdf: Model) -> dict:
+    return {
+        "id": str(order_pdf.id),
+        "order": str(order_pdf.order_id),
+        "status": order_pdf.status,
+        "state_hash": order_pdf.state_hash,
+        "filename": order_pdf.filename,
+        "error": order_pdf.error,
+    }
+
+
+"""
+Batch rendering
+- orders with a stored PDF for their current state (or a billed PDF) are not rendered again
+- the rest run render_order_pdf_job across a process pool of ORDER_PDF_PROCESSES workers, as WeasyPrint
+  is CPU-bound; 0 renders in-process (required under tests, where the test database is per-connection)
+- workers are spawned rather than forked from this process, which may be running job threads;
+  each sets Django up and opens its own database connections
+"""
+
+
+def get_rendered_order_pdf(*, order_pdf_id: str):
+    order_pdf = models.OrderPdf.objects.get(id=order_pdf_id)
+    if order_pdf.status == "DONE":
+        return order_pdf.pdf
+    return None
+
+
+def render_orders_pdfs(*, orders: QuerySet, base_url: str, processes: int = None):
+    """ Yields (order, pdf file, cached) as PDFs become available; pdf file is None if rendering failed """
+
+    if processes is None:
+        processes = getattr(settings, "ORDER_PDF_PROCESSES", 0)
+
+    pending = []
+    for order in orders.select_related("billing_record"):
+        billed_pdf = get_billed_order_pdf(order=order)
+        if billed_pdf:
+            yield (order, billed_pdf, True)
+            continue
+
+        order_pdf, _ = models.OrderPdf.objects.get_or_create(
+            order=order, state_hash=get_order_state_hash(order=order)
+        )
+        if order_pdf.status == "DONE":
+            yield (order, order_pdf.pdf, True)
+            continue
+
+        models.OrderPdf.objects.filter(id=order_pdf.id).update(
+            status="PENDING", error="", updated_at=timezone.now()
+        )
+        pending.append((order, str(order_pdf.id)))
+
+    if not processes:
+        for order, order_pdf_id in pending:
+            render_order_pdf_job(order_pdf_id=order_pdf_id, base_url=base_url)
+            yield (order, get_rendered_order_pdf(order_pdf_id=order_pdf_id), False)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=django.setup,
+    ) as executor:
+        futures = {
+            executor.submit(
+                render_order_pdf_job, order_pdf_id=order_pdf_id, base_url=base_url
+            ): (order, order_pdf_id)
+            for order, order_pdf_id in pending
+        }
+        try:
+            for future in as_completed(futures):
+                order, order_pdf_id = futures[future]
+                if future.exception():
+                    logger.error(
+                        f"Rendering PDF for order {order.id} failed: {future.exception()!r}"
+                    )
+                yield (order, get_rendered_order_pdf(order_pdf_id=order_pdf_id), False)
+        finally:
+            # stops queued renders if the consumer goes away
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
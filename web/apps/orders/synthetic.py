@@ -0,0 +1,464 @@
+# ––– DJANGO IMPORTS
+from django.db import transaction
+from django.utils import timezone
+
+
+# ––– PYTHON UTILITY IMPORTS
+import datetime as dt
+from decimal import Decimal as D
+import random
+import uuid
+
+
+# ––– APPLICATION IMPORTS
+from apps.orders import models, services
+from apps.users import models as users_models
+
+
+"""
+Synthetic catering dataset, for benchmarks and local profiling
+- reference data: buildings, tenants (some universities, billed by PTAEO), tenant groups, users,
+  locations, cost types, categories, tags, menu items, courses, packages, menus, modification options
+- orders: logistics, packages, courses, menu items, modifications, addons, notes, status and BillingRecord
+- rows are bulk-inserted, so cost snapshot signals do not fire; snapshots are built on first read,
+  search documents are written per batch
+- values come from a seeded random.Random, names are prefixed per run so runs do not collide
+"""
+
+COST_TYPE_NAMES = [
+    "Food (Internal)",
+    "Food (External)",
+    "Alcohol and NA Beverages",
+    "Labor",
+    "Equipment and Rentals",
+]
+
+CATEGORY_NAMES = [
+    "Breakfast",
+    "Lunch",
+    "Reception",
+    "Snacks",
+    "Beverages",
+    "Bento Boxes",
+]
+
+TAG_NAMES = [
+    "Vegetarian",
+    "Vegan",
+    "Gluten-Free",
+    "Dairy-Free",
+    "Nut-Free",
+    "Halal",
+    "Kosher",
+    "Spicy",
+    "Seasonal",
+    "Local",
+]
+
+BILLED_STATUSES = ["CONFIRMED", "CHANGE_REQUEST"]
+
+EVENT_NAMES = [
+    "Faculty Meeting",
+    "Board Luncheon",
+    "Alumni Reception",
+    "Department Retreat",
+    "Thesis Defense",
+    "Visiting Speaker",
+    "Orientation Breakfast",
+    "Grant Review Panel",
+]
+
+NOTE_TEXTS = [
+    "Deliver to loading dock; call contact on arrival",
+    "Two guests with severe nut allergies",
+    "Set up buffet along the east wall",
+    "Provide extra vegetarian options",
+    "Pickup of rentals the following morning",
+]
+
+
+def random_price(rng: random.Random, low: int, high: int) -> D:
+    """ Price with cents, between low and high dollars """
+    return D(rng.randint(low * 100, high * 100)).scaleb(-2)
+
+
+def generate_reference_data(
+    *,
+    rng: random.Random,
+    tenants_count: int = 20,
+    users_per_tenant: int = 10,
+    menu_items_count: int = 200,
+    courses_count: int = 40,
+    packages_count: int = 60,
+) -> dict:
+    """ Creates the menu, tenant and customer objects that orders draw from """
+
+    prefix = uuid.uuid4().hex[:6]
+
+    buildings = users_models.Building.objects.bulk_create(
+        [users_models.Building(name=f"Building {prefix}-{idx}") for idx in range(5)]
+    )
+
+    tenants = users_models.Tenant.objects.bulk_create(
+        [
+            users_models.Tenant(
+                name=(
+                    f"{prefix} University {idx}"
+                    if idx % 5 == 0
+                    else f"{prefix} Tenant {idx}"
+                ),
+                building_default=rng.choice(buildings),
+            )
+            for idx in range(tenants_count)
+        ]
+    )
+    tenant_groups = users_models.TenantGroup.objects.bulk_create(
+        [users_models.TenantGroup(name=f"{prefix} Group {idx}") for idx in range(4)]
+    )
+    for tenant in tenants:
+        rng.choice(tenant_groups).tenants.add(tenant)
+
+    users = users_models.User.objects.bulk_create(
+        [
+            users_models.User(
+                email=f"synthetic-{prefix}-{tenant_idx}-{idx}@example.com",
+                first_name=f"First{idx}",
+                last_name=f"Last{tenant_idx}",
+                tenant=tenant,
+            )
+            for tenant_idx, tenant in enumerate(tenants)
+            for idx in range(users_per_tenant)
+        ]
+    )
+
+    locations = models.Location.objects.bulk_create(
+        [
+            models.Location(
+                name=f"Room {idx}",
+                number=str(100 + idx),
+                building=rng.choice(buildings),
+                tenant=rng.choice(tenants),
+            )
+            for idx in range(30)
+        ]
+    )
+
+    cost_types = [
+        models.CostType.objects.get_or_create(name=name)[0] for name in COST_TYPE_NAMES
+    ]
+    categories = models.Category.objects.bulk_create(
+        [models.Category(name=name) for name in CATEGORY_NAMES]
+    )
+    tags = models.Tag.objects.bulk_create([models.Tag(name=name) for name in TAG_NAMES])
+
+    menu_items = models.MenuItem.objects.bulk_create(
+        [
+            models.MenuItem(
+                name=f"Menu Item {prefix}-{idx}",
+                price_numeric_per_person=random_price(rng, 0, 8),
+                price_numeric_fixed=random_price(rng, 0, 2)
+                if idx % 4 == 0
+                else D("0.00"),
+            )
+            for idx in range(menu_items_count)
+        ]
+    )
+    for menu_item in menu_items:
+        menu_item.tags.set(rng.sample(tags, rng.randint(0, 3)))
+
+    courses = models.Course.objects.bulk_create(
+        [
+            models.Course(
+                name=f"Course {prefix}-{idx}",
+                price_numeric_per_person=random_price(rng, 0, 6),
+                price_numeric_fixed=random_price(rng, 0, 25)
+                if idx % 3 == 0
+                else D("0.00"),
+                selection_quantity=rng.randint(1, 3),
+            )
+            for idx in range(courses_count)
+        ]
+    )
+
+    packages = models.Package.objects.bulk_create(
+        [
+            models.Package(
+                name=f"Package {prefix}-{idx}",
+                category=rng.choice(categories),
+                # most packages are internal food
+                cost_type=cost_types[0] if idx % 4 else rng.choice(cost_types),
+            )
+            for idx in range(packages_count)
+        ]
+    )
+    for package in packages:
+        package.tags.set(rng.sample(tags, rng.randint(0, 2)))
+
+    menus = models.Menu.objects.bulk_create(
+        [models.Menu(name=f"Menu {prefix}-{idx}") for idx in range(5)]
+    )
+    for menu in menus:
+        menu.packages.set(rng.sample(packages, len(packages) // 2))
+
+    modification_options = models.CourseModificationOption.objects.bulk_create(
+        [
+            models.CourseModificationOption(
+                name=f"Modification {idx}",
+                price_numeric_per_person=random_price(rng, 0, 3),
+                course=rng.choice(courses),
+                menu=rng.choice(menus),
+            )
+            for idx in range(20)
+        ]
+    )
+
+    return {
+        "users": users,
+        "locations": locations,
+        "cost_types": cost_types,
+        "menu_items": menu_items,
+        "courses": courses,
+        "packages": packages,
+        "modification_options": modification_options,
+    }
+
+
+def get_next_invoice_number() -> int:
+    # numeric max: increment_invoice_id compares strings, which breaks past INV-99999
+    invoice_numbers = models.OrderBase.objects.values_list("invoice_number", flat=True)
+    return (
+        max(
+            (int(number[4:]) for number in invoice_numbers if number[4:].isdigit()),
+            default=12799,
+        )
+        + 1
+    )
+
+
+def build_order_tree(
+    *, rng: random.Random, reference: dict, order: models.OrderBase, rows: dict
+) -> None:
+    """ Appends unsaved logistics, packages, courses, items, modifications and addons of order to rows """
+
+    cost_types = reference["cost_types"]
+
+    for _ in range(rng.choice([1, 1, 1, 2, 2, 3])):
+        event_start = timezone.make_aware(
+            dt.datetime.combine(order.event_date, dt.time(rng.randint(7, 18)))
+        )
+        location = rng.choice(reference["locations"])
+        logistics = models.OrderLogistics(
+            order=order,
+            guest_count=rng.randint(5, 150),
+            event_start=event_start,
+            event_delivery_window=event_start - dt.timedelta(minutes=30),
+            building=location.building,
+            location=location,
+            flag_active=True,
+        )
+        rows["logistics"].append(logistics)
+
+        if rng.random() < 0.3:
+            rows["addons"].append(
+                models.OrderAddOn(
+                    name="Breakdown",
+                    price_numeric_fixed=random_price(rng, 15, 75),
+                    order=order,
+                    logistics=logistics,
+                    cost_type=cost_types[4],
+                )
+            )
+
+        for _ in range(rng.randint(1, 3)):
+            orderpackage = models.OrderPackage(
+                price_numeric=random_price(rng, 8, 40),
+                price_numeric_fixed=random_price(rng, 0, 50),
+                price_over_limit_numeric=random_price(rng, 1, 6),
+                selection_quantity=rng.randint(1, 4),
+                package=rng.choice(reference["packages"]),
+                order=order,
+                logistics=logistics,
+            )
+            rows["packages"].append(orderpackage)
+
+            ordercourses = [
+                models.OrderCourse(
+                    course=course, package=orderpackage, order=order, flag_active=True
+                )
+                for course in rng.sample(reference["courses"], rng.randint(0, 2))
+            ]
+            rows["courses"].extend(ordercourses)
+
+            for menu_item in rng.sample(reference["menu_items"], rng.randint(1, 6)):
+                ordermenuitem = models.OrderMenuItem(
+                    menu_item=menu_item,
+                    course=rng.choice(ordercourses) if ordercourses else None,
+                    package=orderpackage,
+                    order=order,
+                    # a few items left in draft
+                    flag_active=rng.random() < 0.95,
+                )
+                rows["menu_items"].append(ordermenuitem)
+
+                if ordercourses and rng.random() < 0.1:
+                    modification = rng.choice(reference["modification_options"])
+                    rows["modifications"].append(
+                        models.OrderCourseModification(
+                            price_numeric_per_person=modification.price_numeric_per_person,
+                            course=ordermenuitem.course,
+                            menu_item=ordermenuitem,
+                            modification=modification,
+                        )
+                    )
+
+            if rng.random() < 0.2:
+                rows["addons"].append(
+                    models.OrderAddOn(
+                        name="Server",
+                        price_numeric=random_price(rng, 0, 3),
+                        price_numeric_fixed=random_price(rng, 10, 60),
+                        order=order,
+                        package=orderpackage,
+                        cost_type=cost_types[3],
+                    )
+                )
+
+    if rng.random() < 0.2:
+        rows["addons"].append(
+            models.OrderAddOn(
+                name="Delivery",
+                price_numeric_fixed=random_price(rng, 20, 120),
+                order=order,
+                cost_type=rng.choice(cost_types),
+            )
+        )
+
+
+def get_payment_reference(*, rng: random.Random, customer: users_models.User) -> str:
+    if "University" in customer.tenant.name:
+        # PTAEO: project-task-award-expenditure-organization
+        return "-".join(
+            [
+                str(rng.randint(100000, 999999)),
+                str(rng.randint(1, 20)),
+                str(rng.randint(10000, 99999)),
+                str(rng.randint(50000, 59999)),
+                str(rng.randint(1000, 9999)),
+            ]
+        )
+    return f"PO-{rng.randint(10000, 99999)}"
+
+
+def generate_orders(
+    *,
+    rng: random.Random,
+    reference: dict,
+    count: int,
+    start_date: dt.date,
+    days: int = 365,
+    batch_size: int = 1000,
+) -> int:
+    """ Creates count orders with event dates in [start_date, start_date + days) """
+
+    invoice_number = get_next_invoice_number()
+    created = 0
+
+    while created < count:
+        orders = []
+        statuses = []
+        rows = {
+            "logistics": [],
+            "packages": [],
+            "courses": [],
+            "menu_items": [],
+            "modifications": [],
+            "addons": [],
+            "notes": [],
+        }
+
+        for _ in range(min(batch_size, count - created)):
+            event_date = start_date + dt.timedelta(days=rng.randrange(days))
+            customer = rng.choice(reference["users"])
+            order = models.OrderBase(
+                invoice_number=f"INV-{invoice_number}",
+                event_date=event_date,
+                customer=customer,
+                flag_active=rng.random() < 0.95,
+                # picked by invoice number, so the random sequence is unchanged
+                nickname=EVENT_NAMES[invoice_number % len(EVENT_NAMES)],
+                order_contact=customer.get_full_name,
+            )
+            if invoice_number % 4 == 0:
+                rows["notes"].append(
+                    models.OrderNote(
+                        note=NOTE_TEXTS[invoice_number % len(NOTE_TEXTS)],
+                        order=order,
+                        flag_active=True,
+                    )
+                )
+            invoice_number += 1
+            orders.append(order)
+            status = models.OrderStatus(
+                order=order,
+                status=rng.choices(
+                    ["CONFIRMED", "CHANGE_REQUEST", "CANCELLED", "STATE_4"],
+                    weights=[80, 5, 10, 5],
+                )[0],
+                date_changed=timezone.now(),
+            )
+            # bulk_create skips OrderStatus.save(), which mirrors the status onto the order
+            order.current_status = status.status
+            order.date_status_changed = status.date_changed
+            statuses.append(status)
+            build_order_tree(rng=rng, reference=reference, order=order, rows=rows)
+
+        with transaction.atomic():
+            models.OrderBase.objects.bulk_create(orders)
+            models.OrderStatus.objects.bulk_create(statuses)
+            models.OrderLogistics.objects.bulk_create(rows["logistics"])
+            models.OrderPackage.objects.bulk_create(rows["packages"])
+            models.OrderCourse.objects.bulk_create(rows["courses"])
+            models.OrderMenuItem.objects.bulk_create(rows["menu_items"])
+            models.OrderCourseModification.objects.bulk_create(rows["modifications"])
+            models.OrderAddOn.objects.bulk_create(rows["addons"])
+            models.OrderNote.objects.bulk_create(rows["notes"])
+            generate_billing_records(
+                rng=rng,
+                orders=[
+                    order
+                    for order, status in zip(orders, statuses)
+                    if order.flag_active and status.status in BILLED_STATUSES
+                ],
+            )
+            services.update_search_documents(order_ids=[order.id for order in orders])
+
+        created += len(orders)
+
+    return created
+
+
+def generate_billing_records(*, rng: random.Random, orders: list) -> None:
+    costs_by_order = services.calculate_orders_total_cost_vectorized(
+        orders=models.OrderBase.objects.filter(id__in=[order.id for order in orders]),
+        status="is_active",
+    )
+
+    billing_records = [
+        models.BillingRecord(
+            order=order,
+            event_date=order.event_date,
+            payment_reference=get_payment_reference(rng=rng, customer=order.customer),
+            total_cost=costs_by_order[order.id]["total_estimated_cost"],
+            food_internal=costs_by_order[order.id]["cost_food_internal"],
+            food_external=costs_by_order[order.id]["cost_food_external"],
+            alcohol_beverages=costs_by_order[order.id]["cost_beverage"],
+            labor=costs_by_order[order.id]["cost_labor"],
+            rentals=costs_by_order[order.id]["cost_rentals"],
+            date_billed=timezone.now(),
+        )
+        for order in orders
+    ]
+    # bulk_create skips save(), which parses payment references
+    for billing_record in billing_records:
+        billing_record.set_ptaeo()
+    models.BillingRecord.objects.bulk_create(billing_records)
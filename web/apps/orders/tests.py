@@ -1,4 +1,906 @@
 # --- DJANGO IMPORTS
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import connection
+from django.test import override_settings, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
 
-# Create your tests here.
+
+# ––– PYTHON UTILITY IMPORTS
+import datetime as dt
+from decimal import Decimal as D
+import random
+import shutil
+import tempfile
+import time
+from unittest import mock, skipUnless
+
+
+# ––– APPLICATION IMPORTS
+from apps.common import services as common_services
+from apps.orders import filters, models, services, synthetic
+from apps.users import models as users_models
+
+
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+# FINANCIAL
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+
+
+class OrderCostTestMixin:
+    """
+    Builds orders of arbitrary size from one set of menu objects
+    Each package: 20.00 pp + 50.00 fee, 1 selection included, 5.00 pp over limit
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = users_models.User.objects.create(
+            email="customer@example.com", first_name="Test", last_name="Customer"
+        )
+        cls.food_internal = models.CostType.objects.create(name="Food (Internal)")
+        cls.food_external = models.CostType.objects.create(name="Food (External)")
+        cls.labor = models.CostType.objects.create(name="Labor")
+        cls.rentals = models.CostType.objects.create(name="Equipment and Rentals")
+
+        category = models.Category.objects.create(name="Breakfast")
+        menu = models.Menu.objects.create(name="Menu")
+        cls.package = models.Package.objects.create(
+            name="Continental", category=category, cost_type=cls.food_internal
+        )
+        cls.course = models.Course.objects.create(
+            name="Pastries", price_numeric_per_person=D("2.00")
+        )
+        cls.menu_item = models.MenuItem.objects.create(
+            name="Croissant",
+            price_numeric_per_person=D("3.00"),
+            price_numeric_fixed=D("1.00"),
+        )
+        cls.modification_option = models.CourseModificationOption.objects.create(
+            name="Gluten-Free", course=cls.course, menu=menu
+        )
+
+    def build_order(self, *, logistics_count=1, packages_count=1, items_count=2):
+        order = models.OrderBase.objects.create(
+            customer=self.customer, flag_active=True
+        )
+
+        for _ in range(logistics_count):
+            logistics = models.OrderLogistics.objects.create(
+                order=order, guest_count=10, flag_active=True
+            )
+            models.OrderAddOn.objects.create(
+                name="Breakdown",
+                price_numeric_fixed=D("25.00"),
+                order=order,
+                logistics=logistics,
+                cost_type=self.rentals,
+            )
+
+            for _ in range(packages_count):
+                orderpackage = models.OrderPackage.objects.create(
+                    price_numeric=D("20.00"),
+                    price_numeric_fixed=D("50.00"),
+                    price_over_limit_numeric=D("5.00"),
+                    selection_quantity=1,
+                    package=self.package,
+                    order=order,
+                    logistics=logistics,
+                )
+                ordercourse = models.OrderCourse.objects.create(
+                    course=self.course,
+                    package=orderpackage,
+                    order=order,
+                    flag_active=True,
+                )
+                models.OrderAddOn.objects.create(
+                    name="Server",
+                    price_numeric=D("1.00"),
+                    price_numeric_fixed=D("10.00"),
+                    order=order,
+                    package=orderpackage,
+                    cost_type=self.labor,
+                )
+
+                for idx in range(items_count):
+                    ordermenuitem = models.OrderMenuItem.objects.create(
+                        menu_item=self.menu_item,
+                        course=ordercourse,
+                        package=orderpackage,
+                        order=order,
+                        flag_active=True,
+                    )
+                    if idx == 0:
+                        models.OrderCourseModification.objects.create(
+                            price_numeric_per_person=D("0.50"),
+                            course=ordercourse,
+                            menu_item=ordermenuitem,
+                            modification=self.modification_option,
+                        )
+
+        models.OrderAddOn.objects.create(
+            name="Delivery",
+            price_numeric_fixed=D("100.00"),
+            order=order,
+            cost_type=self.food_external,
+        )
+
+        return order
+
+
+class OrderTotalCostTests(OrderCostTestMixin, TestCase):
+    def test_total_cost_of_single_package_order(self):
+        order = self.build_order()
+
+        costs = services.calculate_order_total_cost(order=order, status="is_active")
+
+        # package 250.00 + over limit 50.00 + course 20.00 + items 36.00 and 31.00
+        self.assertEqual(costs["cost_food_internal"], D("387.00"))
+        self.assertEqual(costs["cost_labor"], D("20.00"))
+        self.assertEqual(costs["cost_rentals"], D("25.00"))
+        self.assertEqual(costs["cost_food_external"], D("100.00"))
+        self.assertEqual(costs["cost_beverage"], 0)
+        self.assertEqual(costs["total_estimated_cost"], D("532.00"))
+
+    def test_draft_rows_are_excluded_from_active_total(self):
+        order = self.build_order()
+        order.items.update(flag_active=False)
+
+        costs = services.calculate_order_total_cost(order=order, status="is_active")
+
+        # no items: package 250.00 + course 20.00
+        self.assertEqual(costs["cost_food_internal"], D("270.00"))
+
+    def test_query_count_is_independent_of_order_size(self):
+        small_order = self.build_order()
+        large_order = self.build_order(
+            logistics_count=3, packages_count=4, items_count=5
+        )
+
+        with CaptureQueriesContext(connection) as small_queries:
+            services.calculate_order_total_cost(order=small_order, status="is_active")
+        with CaptureQueriesContext(connection) as large_queries:
+            large_costs = services.calculate_order_total_cost(
+                order=large_order, status="is_active"
+            )
+
+        self.assertEqual(len(small_queries), len(large_queries))
+
+        # package 250.00 + over limit 200.00 + course 20.00 + items 160.00 + addon 20.00
+        package_cost = D("650.00")
+        logistics_cost = 4 * package_cost + D("25.00")
+        self.assertEqual(
+            large_costs["total_estimated_cost"], 3 * logistics_cost + D("100.00")
+        )
+
+
+class OrdersTotalCostBulkTests(OrderCostTestMixin, TestCase):
+    def test_bulk_costs_match_single_order_costs(self):
+        orders = [
+            self.build_order(),
+            self.build_order(logistics_count=2, packages_count=2, items_count=3),
+            self.build_order(logistics_count=0),
+        ]
+
+        costs_by_order = services.calculate_orders_total_cost(
+            orders=models.OrderBase.objects.all(), status="is_active"
+        )
+
+        self.assertEqual(len(costs_by_order), len(orders))
+        for order in orders:
+            self.assertEqual(
+                costs_by_order[order.id],
+                services.calculate_order_total_cost(order=order, status="is_active"),
+            )
+
+    def test_query_count_is_independent_of_number_of_orders(self):
+        self.build_order()
+
+        with CaptureQueriesContext(connection) as few_queries:
+            services.calculate_orders_total_cost(
+                orders=models.OrderBase.objects.all(), status="is_active"
+            )
+
+        for _ in range(5):
+            self.build_order(logistics_count=2)
+
+        with CaptureQueriesContext(connection) as many_queries:
+            services.calculate_orders_total_cost(
+                orders=models.OrderBase.objects.all(), status="is_active"
+            )
+
+        self.assertEqual(len(few_queries), len(many_queries))
+
+
+class OrdersTotalCostVectorizedTests(OrderCostTestMixin, TestCase):
+    def build_orders(self):
+        orders = [
+            self.build_order(),
+            self.build_order(logistics_count=2, packages_count=3, items_count=4),
+            self.build_order(logistics_count=0),
+            self.build_order(packages_count=2, items_count=0),
+        ]
+        # mixed draft and active rows
+        orders[1].items.filter(modifications__isnull=False).update(flag_active=False)
+        orders[1].packages.filter(items__isnull=True).update(flag_active=False)
+        return orders
+
+    def test_vectorized_costs_match_loop_costs(self):
+        self.build_orders()
+        orders = models.OrderBase.objects.all()
+
+        for status in ["review", "is_active", "is_draft", "add_package"]:
+            with self.subTest(status=status):
+                self.assertEqual(
+                    services.calculate_orders_total_cost_vectorized(
+                        orders=orders, status=status
+                    ),
+                    services.calculate_orders_total_cost(orders=orders, status=status),
+                )
+
+    def test_costs_by_logistics_add_up_to_order_costs(self):
+        order = self.build_orders()[1]
+
+        costs_by_order, costs_by_logistics = services.calculate_orders_cost_frames(
+            orders=models.OrderBase.objects.filter(id=order.id), status="is_active"
+        )
+
+        self.assertEqual(len(costs_by_logistics), 2)
+        # only the order-level addon (100.00) is not attributed to a logistics
+        self.assertEqual(
+            costs_by_order.loc[order.id, "total_estimated_cost"],
+            costs_by_logistics["total_estimated_cost"].sum() + 10000,
+        )
+
+
+class CostBucketTests(OrderCostTestMixin, TestCase):
+    def test_bucket_lookup_is_cached(self):
+        services.get_cost_buckets_by_type_id(refresh=True)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                services.get_cost_bucket(cost_type_id=self.labor.id), "labor"
+            )
+            self.assertIsNone(services.get_cost_bucket(cost_type_id=None))
+
+    def test_saving_cost_type_invalidates_cache(self):
+        self.assertEqual(services.get_cost_bucket(cost_type_id=self.labor.id), "labor")
+
+        self.labor.name = "Alcohol and NA Beverages"
+        self.labor.save()
+
+        self.assertEqual(
+            services.get_cost_bucket(cost_type_id=self.labor.id), "beverage"
+        )
+
+    def test_new_cost_type_is_bucketed(self):
+        services.get_cost_buckets_by_type_id(refresh=True)
+        beverage = models.CostType.objects.create(name="Alcohol and NA Beverages")
+
+        self.assertEqual(services.get_cost_bucket(cost_type_id=beverage.id), "beverage")
+
+
+class OrderCostSnapshotTests(OrderCostTestMixin, TestCase):
+    def build_order(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return super().build_order(**kwargs)
+
+    def assertSnapshotMatchesOrder(self, order):
+        (
+            total_estimated_cost,
+            packages_estimated_cost,
+        ) = services.get_order_cost_snapshot(
+            order=models.OrderBase.objects.get(id=order.id)
+        )
+        self.assertEqual(
+            total_estimated_cost,
+            services.calculate_order_total_cost(order=order, status="is_active")[
+                "total_estimated_cost"
+            ],
+        )
+        self.assertEqual(
+            packages_estimated_cost,
+            services.calculate_order_packages_cost(order=order, status="is_active"),
+        )
+
+    def test_snapshot_matches_calculated_costs(self):
+        order = self.build_order(logistics_count=2, packages_count=2, items_count=3)
+
+        self.assertEqual(order.logistics_cost_snapshots.count(), 2)
+        self.assertSnapshotMatchesOrder(order)
+
+    def test_guest_count_change_recomputes_only_its_logistics(self):
+        order = self.build_order(logistics_count=2)
+        changed, unchanged = order.logistics.all()
+        unchanged_updated_at = unchanged.cost_snapshot.updated_at
+
+        with self.captureOnCommitCallbacks(execute=True):
+            changed.guest_count = 20
+            changed.save()
+
+        self.assertEqual(
+            models.OrderLogisticsCostSnapshot.objects.get(
+                logistics=unchanged
+            ).updated_at,
+            unchanged_updated_at,
+        )
+        self.assertSnapshotMatchesOrder(order)
+
+    def test_deleted_menu_item_and_addon_update_snapshot(self):
+        order = self.build_order()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            order.items.first().delete()
+            order.addons_staff.filter(
+                logistics__isnull=True, package__isnull=True
+            ).delete()
+
+        self.assertSnapshotMatchesOrder(order)
+
+    def test_missing_snapshots_are_built_on_read(self):
+        order = super().build_order(logistics_count=2)
+
+        self.assertFalse(models.OrderCostSnapshot.objects.filter(order=order).exists())
+        self.assertSnapshotMatchesOrder(order)
+
+    def test_catalog_price_change_updates_snapshot(self):
+        order = self.build_order()
+        services.get_order_cost_snapshot(order=order)
+
+        self.menu_item.price_numeric_per_person = D("9.00")
+        self.menu_item.save()
+        self.course.price_numeric_per_person = D("7.00")
+        self.course.save()
+
+        self.assertFalse(models.OrderCostSnapshot.objects.filter(order=order).exists())
+        self.assertSnapshotMatchesOrder(order)
+
+
+class BillingRecordPtaeoTests(OrderCostTestMixin, TestCase):
+    def test_payment_reference_is_parsed_on_save(self):
+        billing_record = models.BillingRecord.objects.create(
+            order=self.build_order(), payment_reference="123456-7-89012-54321-1000"
+        )
+
+        billing_record.refresh_from_db()
+        self.assertEqual(
+            [getattr(billing_record, field) for field in models.PTAEO_FIELDS],
+            ["123456", "7", "89012", "54321", "1000"],
+        )
+
+        billing_record.payment_reference = "PO-12345"
+        billing_record.save(update_fields=["payment_reference"])
+
+        billing_record.refresh_from_db()
+        self.assertEqual(billing_record.project, "")
+        self.assertEqual(billing_record.award, "")
+
+    def test_backfill_updates_rows_written_around_save(self):
+        billing_record = models.BillingRecord.objects.create(
+            order=self.build_order(), payment_reference="123456-7-89012-54321-1000"
+        )
+        models.BillingRecord.objects.filter(id=billing_record.id).update(
+            payment_reference="654321-8-21098-55555-2000"
+        )
+
+        self.assertEqual(services.backfill_billing_record_ptaeo(), 1)
+        self.assertEqual(services.backfill_billing_record_ptaeo(), 0)
+        billing_record.refresh_from_db()
+        self.assertEqual(billing_record.project, "654321")
+        self.assertEqual(billing_record.award, "21098")
+
+
+@override_settings(JOB_BACKEND="sync")
+class OrderPdfTests(OrderCostTestMixin, TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def export(self, order):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.get(
+                reverse("apps.orders:export_as_pdf", kwargs={"pk": order.id}),
+                HTTP_ACCEPT="application/json",
+            )
+
+    def test_render_is_queued_then_served_from_storage(self):
+        order = self.build_order(logistics_count=0)
+
+        response = self.export(order)
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()["status"], "PENDING")
+        status = self.client.get(response.json()["status_url"]).json()
+        self.assertEqual(status["status"], "DONE")
+
+        response = self.export(order)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"%PDF"))
+        self.assertEqual(order.pdfs.count(), 1)
+
+    def test_changed_order_is_rendered_again(self):
+        order = self.build_order(logistics_count=0)
+        self.export(order)
+        previous = order.pdfs.get()
+
+        order.nickname = "Changed"
+        order.save()
+
+        self.assertEqual(self.export(order).status_code, 202)
+        self.assertNotEqual(order.pdfs.get().state_hash, previous.state_hash)
+
+    def test_renamed_customer_is_rendered_again(self):
+        order = self.build_order(logistics_count=0)
+        self.export(order)
+        previous = order.pdfs.get()
+
+        self.customer.last_name = "Renamed"
+        self.customer.save()
+
+        self.assertEqual(self.export(order).status_code, 202)
+        self.assertNotEqual(
+            order.pdfs.latest("created_at").state_hash, previous.state_hash
+        )
+
+    def test_billed_order_pdf_is_kept_with_billing_record(self):
+        order = self.build_order(logistics_count=0)
+        billing_record = models.BillingRecord.objects.create(
+            order=order, date_billed=timezone.now()
+        )
+
+        self.export(order)
+        billing_record.refresh_from_db()
+
+        self.assertTrue(billing_record.pdf_as_of_record)
+        order.nickname = "Changed after billing"
+        order.save()
+        self.assertEqual(self.export(order).status_code, 200)
+
+
+def skip_order_pdf_render(*, order_pdf_id, base_url):
+    # stands in for render_order_pdf_job in pool workers, which cannot see the test database
+    return None
+
+
+def slow_order_pdf_render(*, order_pdf_id, base_url):
+    # keeps later jobs queued while the first results are consumed
+    time.sleep(0.5)
+
+
+class OrderPdfBatchTests(OrderCostTestMixin, TestCase):
+    def render(self, orders, job=skip_order_pdf_render):
+        with mock.patch.object(
+            services, "render_order_pdf_job", job
+        ), mock.patch.object(services, "get_rendered_order_pdf", return_value="pdf"):
+            yield from services.render_orders_pdfs(
+                orders=orders, base_url="http://testserver/", processes=2
+            )
+
+    def test_process_pool_renders_every_order(self):
+        orders = [self.build_order(logistics_count=0) for _ in range(3)]
+
+        rendered = list(self.render(models.OrderBase.objects.all()))
+
+        self.assertCountEqual(rendered, [(order, "pdf", False) for order in orders])
+
+    def test_closing_early_cancels_queued_renders(self):
+        for _ in range(8):
+            self.build_order(logistics_count=0)
+
+        futures = []
+        submit = services.ProcessPoolExecutor.submit
+
+        def record_submit(executor, *args, **kwargs):
+            future = submit(executor, *args, **kwargs)
+            futures.append(future)
+            return future
+
+        with mock.patch.object(services.ProcessPoolExecutor, "submit", record_submit):
+            renders = self.render(
+                models.OrderBase.objects.all(), job=slow_order_pdf_render
+            )
+            next(renders)
+            renders.close()
+
+        self.assertEqual(len(futures), 8)
+        # the pool is shut down: every render finished or was cancelled before starting
+        self.assertTrue(all(future.done() for future in futures))
+        self.assertTrue(any(future.cancelled() for future in futures))
+
+
+@override_settings(ORDER_PDF_STYLESHEETS=["css/styles.css", "css/missing.css"])
+class OrderPdfRenderTests(OrderCostTestMixin, TestCase):
+    def setUp(self):
+        services.clear_pdf_render_cache()
+        self.addCleanup(services.clear_pdf_render_cache)
+
+    def test_render_resources_are_shared_between_renders(self):
+        order = self.build_order(logistics_count=0)
+
+        with mock.patch.object(
+            services, "load_pdf_stylesheet", wraps=services.load_pdf_stylesheet
+        ) as load_pdf_stylesheet:
+            response, filename = services.order_generate_pdf(
+                base_url="http://testserver/", order_id=order.id
+            )
+            services.order_generate_pdf(
+                base_url="http://testserver/", order_id=order.id
+            )
+
+        self.assertTrue(response.content.startswith(b"%PDF"))
+        # missing stylesheet is retried, existing one parsed once
+        self.assertEqual(load_pdf_stylesheet.call_count, 3)
+        self.assertEqual(len(services.get_pdf_stylesheets()), 1)
+        self.assertIs(services.get_pdf_font_config(), services.get_pdf_font_config())
+
+
+class PdfAssetFetcherTests(TestCase):
+    def setUp(self):
+        services.clear_pdf_render_cache()
+        self.addCleanup(services.clear_pdf_render_cache)
+
+    def test_static_url_on_rendered_host_is_read_from_disk(self):
+        fetcher = services.get_pdf_url_fetcher(base_url="http://testserver/orders/")
+
+        with mock.patch.object(services, "default_url_fetcher") as default_url_fetcher:
+            result = fetcher("http://testserver/staticfiles/css/styles.css")
+            fetcher("http://testserver/staticfiles/css/styles.css")
+
+        default_url_fetcher.assert_not_called()
+        self.assertIn(b"font-family", result["string"])
+        self.assertEqual(result["mime_type"], "text/css")
+        self.assertEqual(services.read_local_pdf_asset.cache_info().hits, 1)
+
+    def test_other_urls_are_fetched_over_http_once(self):
+        fetcher = services.get_pdf_url_fetcher(base_url="http://testserver/orders/")
+        urls = [
+            "https://fonts.googleapis.com/staticfiles/css/styles.css",
+            "http://testserver/staticfiles/css/missing.css",
+        ]
+
+        with mock.patch.object(
+            services, "default_url_fetcher", return_value={"string": b""}
+        ) as default_url_fetcher:
+            for url in urls + urls:
+                fetcher(url)
+
+        self.assertEqual(default_url_fetcher.call_count, len(urls))
+
+    def test_media_path_outside_media_root_is_refused(self):
+        with self.assertRaises(SuspiciousFileOperation):
+            services.get_local_pdf_asset_path(
+                url="http://testserver/mediafiles/../config/settings.py",
+                local_hosts=("testserver",),
+            )
+
+
+class SyntheticDataTestMixin:
+    """ Seeded synthetic tenants, customers and orders from 2021 onwards, sized by class attributes """
+
+    tenants_count = 4
+    users_per_tenant = 3
+    orders_count = 40
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(0)
+        reference = synthetic.generate_reference_data(
+            rng=rng,
+            tenants_count=cls.tenants_count,
+            users_per_tenant=cls.users_per_tenant,
+            menu_items_count=10,
+        )
+        synthetic.generate_orders(
+            rng=rng,
+            reference=reference,
+            count=cls.orders_count,
+            start_date=dt.date(2021, 1, 1),
+        )
+
+
+class SyntheticDataTests(TestCase):
+    def test_generated_billing_records_match_order_costs(self):
+        rng = random.Random(0)
+        reference = synthetic.generate_reference_data(
+            rng=rng, tenants_count=5, users_per_tenant=2, menu_items_count=20
+        )
+
+        created = synthetic.generate_orders(
+            rng=rng, reference=reference, count=30, start_date=dt.date(2021, 1, 1)
+        )
+
+        self.assertEqual(created, 30)
+        self.assertEqual(models.OrderBase.objects.count(), 30)
+        billing_record = models.BillingRecord.objects.select_related("order").first()
+        self.assertEqual(
+            billing_record.total_cost,
+            services.calculate_order_total_cost(
+                order=billing_record.order, status="is_active"
+            )["total_estimated_cost"],
+        )
+
+
+class OrderCurrentStatusTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.order = models.OrderBase.objects.create(
+            event_date=dt.date(2021, 1, 4), flag_active=True
+        )
+
+    def get_listed_orders(self):
+        return filters.OrderFilterSimple(queryset=models.OrderBase.objects.all()).qs
+
+    def test_status_changes_are_mirrored_onto_order(self):
+        changed = timezone.now()
+        status = models.OrderStatus.objects.create(
+            order=self.order, status="CONFIRMED", date_changed=changed
+        )
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.current_status, "CONFIRMED")
+        self.assertEqual(self.order.date_status_changed, changed)
+        self.assertIn(self.order, self.get_listed_orders())
+
+        status.status = "CANCELLED"
+        status.save()
+        self.assertEqual(status.order.current_status, "CANCELLED")
+        self.assertNotIn(self.order, self.get_listed_orders())
+
+        status.delete()
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.current_status, "")
+        self.assertIsNone(self.order.date_status_changed)
+
+    def test_queryset_delete_clears_current_status(self):
+        models.OrderStatus.objects.create(
+            order=self.order, status="CONFIRMED", date_changed=timezone.now()
+        )
+
+        models.OrderStatus.objects.filter(order=self.order).delete()
+
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.current_status, "")
+        self.assertIsNone(self.order.date_status_changed)
+
+    def test_history_entries_leave_current_status_alone(self):
+        models.OrderStatus.objects.create(
+            order=self.order, status="CONFIRMED", date_changed=timezone.now()
+        )
+
+        history = models.OrderHistory.objects.create(
+            order=self.order, date_changed=timezone.now()
+        )
+        history.delete()
+
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.current_status, "CONFIRMED")
+
+    def test_order_list_filters_without_status_join(self):
+        self.assertNotIn("orders_orderstatus", str(self.get_listed_orders().query))
+
+
+class OrderListPageTests(SyntheticDataTestMixin, TestCase):
+    tenants_count = 3
+    users_per_tenant = 2
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = users_models.User.objects.create(
+            email="staff@example.com", is_staff=True
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def get_listed_orders(self):
+        return list(
+            filters.OrderFilterSimple(queryset=models.OrderBase.objects.all())
+            .qs.order_by("event_date", "invoice_number")
+            .values_list("invoice_number", flat=True)
+        )
+
+    def test_pages_walk_all_orders_in_both_directions(self):
+        expected = self.get_listed_orders()
+        self.assertGreater(len(expected), 14)
+        self.client.force_login(self.user)
+        url = reverse("apps.orders:order_filter")
+
+        pages, params, query_counts = [], {}, []
+        while True:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, params)
+                [str(order) for order in response.context["data"]]
+            query_counts.append(len(queries))
+            pages.append([order.invoice_number for order in response.context["data"]])
+            self.assertEqual(response.context["count"], len(expected))
+            if not response.context["page"]["next_cursor"]:
+                break
+            params = {"after": response.context["page"]["next_cursor"]}
+
+        self.assertEqual([number for page in pages for number in page], expected)
+        # the first page also counts the orders
+        self.assertEqual(len(set(query_counts[1:])), 1)
+        self.assertLess(query_counts[1], query_counts[0])
+
+        response = self.client.get(url, {"last": "1"})
+        self.assertEqual(
+            [order.invoice_number for order in response.context["data"]],
+            expected[-len(response.context["data"]) :],
+        )
+        backwards = []
+        while response.context["page"]["previous_cursor"]:
+            response = self.client.get(
+                url, {"before": response.context["page"]["previous_cursor"]}
+            )
+            backwards.append(
+                [order.invoice_number for order in response.context["data"]]
+            )
+        self.assertEqual(backwards[-1], expected[: len(backwards[-1])])
+
+    def test_malformed_cursor_returns_first_page(self):
+        orders = models.OrderBase.objects.all()
+        first = services.get_order_list_page(orders=orders, page_size=7)
+
+        page = services.get_order_list_page(
+            orders=orders, page_size=7, before="not-a-cursor"
+        )
+
+        self.assertEqual(page["records"], first["records"])
+        self.assertIsNone(page["previous_cursor"])
+
+
+class OrderSearchTests(SyntheticDataTestMixin, TestCase):
+    tenants_count = 3
+    users_per_tenant = 2
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = users_models.User.objects.create(
+            email="staff@example.com", is_staff=True
+        )
+
+    def test_every_term_matches_a_word_prefix(self):
+        order = models.OrderBase.objects.filter(notes__isnull=False).first()
+        note = order.notes.first().note
+
+        found = services.search_orders(
+            query=f"{order.customer.last_name} {note.split()[0][:4]}"
+        )
+
+        self.assertIn(order, found)
+        for other in found:
+            document = other.search_document.document.lower()
+            self.assertIn(order.customer.last_name.lower(), document)
+        self.assertFalse(services.search_orders(query="nosuchword").exists())
+        self.assertFalse(services.search_orders(query="  ' * ").exists())
+
+    @skipUnless(connection.vendor == "sqlite", "FTS5 index is SQLite-only")
+    def test_index_rows_follow_their_documents(self):
+        first, second = models.OrderSearchDocument.objects.all()[:2]
+        first.document = "Relabelled"
+        first.save()
+        second.delete()
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT order_id, document FROM {services.ORDER_SEARCH_FTS_TABLE}"
+            )
+            indexed = {
+                (str(order_id), document) for order_id, document in cursor.fetchall()
+            }
+
+        self.assertEqual(
+            indexed,
+            {
+                (order_id.hex, document)
+                for order_id, document in models.OrderSearchDocument.objects.values_list(
+                    "order_id", "document"
+                )
+            },
+        )
+
+    def test_documents_follow_orders_notes_and_customers(self):
+        order = models.OrderBase.objects.first()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            order.nickname = "Quarterly Symposium"
+            order.save()
+            models.OrderNote.objects.create(order=order, note="Bring the gelato cart")
+        with self.captureOnCommitCallbacks(execute=True):
+            order.customer.last_name = "Zanzibar"
+            order.customer.save()
+
+        for query in ["symposium", "gelato"]:
+            self.assertEqual(list(services.search_orders(query=query)), [order])
+        self.assertEqual(
+            set(services.search_orders(query="zanzibar")),
+            set(models.OrderBase.objects.filter(customer=order.customer)),
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            order.customer.email = "caterer@quincemail.example"
+            order.customer.save()
+        self.assertIn(order, services.search_orders(query="quincemail"))
+
+    def test_list_view_shows_ranked_results_with_filters(self):
+        self.client.force_login(self.user)
+        order = models.OrderBase.objects.filter(
+            status__status="CONFIRMED", notes__isnull=False
+        ).first()
+
+        response = self.client.get(
+            reverse("apps.orders:order_filter"), {"search": order.invoice_number}
+        )
+
+        self.assertEqual(list(response.context["data"]), [order])
+        self.assertNotIn("page", response.context)
+
+
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+# QUERY PLANS
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+
+
+@skipUnless(connection.vendor == "sqlite", "plans are checked against SQLite")
+class OrderQueryPlanTests(SyntheticDataTestMixin, TestCase):
+    tenants_count = 3
+    users_per_tenant = 2
+    orders_count = 20
+
+    def assertNoFullScans(self, queryset):
+        self.assertEqual(common_services.get_full_scans(queryset=queryset), [])
+
+    def test_order_list_pages(self):
+        orders = (
+            filters.OrderFilterSimple(queryset=models.OrderBase.objects.all())
+            .qs.select_related("customer__tenant")
+            .order_by(*services.ORDER_LIST_ORDERING)
+        )
+        order = orders.first()
+
+        self.assertNoFullScans(orders[:11])
+        self.assertNoFullScans(
+            orders.filter(event_date__gte=order.event_date).exclude(id=order.id)[:11]
+        )
+        self.assertNoFullScans(orders.filter(customer=order.customer))
+
+        active_orders = models.OrderBase.objects.is_active().filter(
+            event_date__range=(dt.date(2021, 1, 1), dt.date(2021, 3, 31))
+        )
+        self.assertNoFullScans(active_orders)
+        self.assertIn(
+            "orders_active_event_date_idx",
+            "\n".join(common_services.get_query_plan(queryset=active_orders)),
+        )
+
+    def test_order_tree_children_are_read_in_index_order(self):
+        package = models.OrderPackage.objects.filter(items__isnull=False).first()
+        logistics = package.logistics
+
+        for queryset in [
+            logistics.order.logistics.all(),
+            logistics.packages.all(),
+            package.items.all(),
+            models.BillingRecord.objects.filter(order=logistics.order),
+        ]:
+            self.assertNoFullScans(queryset)
+        for queryset in [logistics.order.logistics.all(), logistics.packages.all()]:
+            self.assertNotIn(
+                "TEMP B-TREE FOR ORDER BY",
+                "\n".join(common_services.get_query_plan(queryset=queryset)),
+            )
+
+    def test_full_scan_is_reported(self):
+        self.assertEqual(
+            common_services.get_full_scans(
+                queryset=models.OrderBase.objects.filter(nickname="Gala")
+            ),
+            ["orders_orderbase"],
+        )
@@ -24,6 +24,11 @@ urlpatterns = [
         views.export_order_as_pdf,
         name="export_as_pdf",
     ),
+    path(
+        "export/pdf/<uuid:pk>/status/",
+        views.export_order_as_pdf_status,
+        name="export_as_pdf_status",
+    ),
     path(
         "export/csv/",
         views.export_orders_as_csv,
@@ -1,5 +1,8 @@
 # ––– DJANGO IMPORTS
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import FileResponse, JsonResponse
+from django.shortcuts import get_object_or_404, render
+from django.urls import reverse
 from django.views.generic import (
     TemplateView,
 )
@@ -40,13 +43,48 @@ class IndexView(LoginRequiredMixin, TemplateView):
 
 
 def export_order_as_pdf(request, **kwargs):
-    base_url = request.build_absolute_uri()
-    order_id = kwargs["pk"]
+    """ Serves stored PDF for current order state, otherwise enqueues a render and returns 202 """
+
+    order = get_object_or_404(models.OrderBase, id=kwargs["pk"])
 
-    pdf_data = services.order_generate_pdf(base_url=base_url, order_id=order_id)
-    response = pdf_data[0]
+    billed_pdf = services.get_billed_order_pdf(order=order)
+    if billed_pdf:
+        return FileResponse(
+            billed_pdf.open("rb"),
+            filename=billed_pdf.name.split("/")[-1],
+            content_type="application/pdf",
+        )
 
-    return response
+    base_url = request.build_absolute_uri()
+    order_pdf = services.request_order_pdf(order=order, base_url=base_url)
+    if order_pdf.status == "DONE":
+        return FileResponse(
+            order_pdf.pdf.open("rb"),
+            filename=order_pdf.filename,
+            content_type="application/pdf",
+        )
+
+    status = services.get_order_pdf_status(order_pdf=order_pdf)
+    status["status_url"] = reverse(
+        "apps.orders:export_as_pdf_status", kwargs={"pk": order.id}
+    )
+    status["download_url"] = request.path
+    if "application/json" in request.headers.get("Accept", ""):
+        return JsonResponse(status, status=202)
+    return render(request, "order_pdf_pending.html", {"data": status}, status=202)
+
+
+def export_order_as_pdf_status(request, **kwargs):
+    order = get_object_or_404(models.OrderBase, id=kwargs["pk"])
+    order_pdf = order.pdfs.first()
+    if order_pdf is None:
+        return JsonResponse({"status": None}, status=404)
+
+    status = services.get_order_pdf_status(order_pdf=order_pdf)
+    status["download_url"] = reverse(
+        "apps.orders:export_as_pdf", kwargs={"pk": order.id}
+    )
+    return JsonResponse(status)
 
 
 def export_orders_as_csv(request):
@@ -70,14 +108,11 @@ class OrderDetailView(LoginRequiredMixin, TemplateView):
             context["total_estimated_cost"] = None
             context["packages_estimated_cost"] = None
         else:
-            total_estimated_cost = services.calculate_order_total_cost(
-                order=obj, status="is_active"
-            )["total_estimated_cost"]
+            (
+                total_estimated_cost,
+                packages_estimated_cost,
+            ) = services.get_order_cost_snapshot(order=obj)
             context["total_estimated_cost"] = total_estimated_cost
-
-            packages_estimated_cost = services.calculate_order_packages_cost(
-                order=obj, status="is_active"
-            )
             context["packages_estimated_cost"] = packages_estimated_cost
 
         if (
@@ -109,3 +144,23 @@ class OrderFilterView(LoginRequiredMixin, common_views.GenericFilteredListView):
     def get_context_data(self, **kwargs):
         context = super(OrderFilterView, self).get_context_data(**kwargs)
         return context
+
+    def get_page_context(self, queryset, page_size):
+        if self.filterset.is_bound and self.filterset.form.cleaned_data.get("search"):
+            # ranked results are bounded by ORDERS_SEARCH_LIMIT, so numbered pages stay cheap
+            return super().get_page_context(
+                queryset.select_related("customer__tenant"), page_size
+            )
+
+        page = services.get_order_list_page(
+            orders=queryset,
+            page_size=page_size,
+            after=self.request.GET.get("after"),
+            before=self.request.GET.get("before"),
+            last="last" in self.request.GET,
+        )
+        return {
+            "data": page["records"],
+            "page": page,
+            "count": services.get_order_list_count(orders=queryset),
+        }
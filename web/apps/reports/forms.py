@@ -9,7 +9,7 @@ from django_select2 import forms as s2forms
 
 # ––– APPLICATION IMPORTS
 from apps.api import select_views
-from apps.common import models as common_models
+from apps.common import filters as common_filters, models as common_models
 from apps.common.forms import BaseModelForm
 from apps.orders import models as orders_models
 from apps.reports import models
@@ -81,6 +81,19 @@ class ReportForm(forms.Form):
 
     range_date = forms.CharField(max_length=32)
 
+    project = forms.CharField(max_length=96, required=False, label=u"PTAEO Project")
+
+    award = forms.CharField(max_length=96, required=False, label=u"PTAEO Award")
+
+    def clean_range_date(self):
+        # "YYYY-MM-DD to YYYY-MM-DD" or a preset key such as "fiscal_prior_year"
+        range_date = self.cleaned_data["range_date"]
+        try:
+            common_filters.get_date_range(value=range_date)
+        except ValueError:
+            raise forms.ValidationError("Enter a date range or a preset range.")
+        return range_date
+
     class Meta:
         fields = (
             "cost_type",
@@ -88,6 +101,8 @@ class ReportForm(forms.Form):
             "tenant_group",
             "user",
             "range_date",
+            "project",
+            "award",
         )
         widgets = {
             "cost_type": CostTypeWidget,
@@ -0,0 +1,16 @@
+# ––– DJANGO IMPORTS
+from django.core.management.base import BaseCommand
+
+
+# ––– APPLICATION IMPORTS
+from apps.reports import services
+
+
+class Command(BaseCommand):
+    help = "Deletes background report exports, and their files, past expires_at"
+
+    def handle(self, *args, **options):
+        deleted = services.delete_expired_report_exports()
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} expired report exports")
+        )
@@ -0,0 +1,27 @@
+# ––– DJANGO IMPORTS
+from django.core.management.base import BaseCommand
+
+
+# ––– APPLICATION IMPORTS
+from apps.reports import services
+
+
+class Command(BaseCommand):
+    help = (
+        "Writes every billing record to a Parquet dataset partitioned by event month, "
+        "readable with reports.services.read_billing_history"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Dataset directory, replaced if it exists")
+
+    def handle(self, *args, **options):
+        rows_by_month = services.write_billing_history_dataset(path=options["path"])
+        for month, rows in rows_by_month.items():
+            self.stdout.write(f"  {month}: {rows} rows")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {sum(rows_by_month.values())} billing records "
+                f"in {len(rows_by_month)} months to {options['path']}"
+            )
+        )
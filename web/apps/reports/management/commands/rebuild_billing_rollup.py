@@ -0,0 +1,32 @@
+# ––– DJANGO IMPORTS
+from django.core.management.base import BaseCommand, CommandError
+
+
+# ––– APPLICATION IMPORTS
+from apps.reports import services
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the billing rollup from billing records and verifies it against live sums"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify-only",
+            action="store_true",
+            help="Compare the existing rollup against live sums without rebuilding",
+        )
+
+    def handle(self, *args, **options):
+        if not options["verify_only"]:
+            created = services.rebuild_billing_rollup()
+            self.stdout.write(f"Rebuilt billing rollup with {created} rows")
+
+        mismatches = services.verify_billing_rollup()
+        for event_date, customer_id, stored, live in mismatches[:20]:
+            self.stdout.write(
+                f"  {event_date} {customer_id}: rollup {stored}, live {live}"
+            )
+
+        if mismatches:
+            raise CommandError(f"{len(mismatches)} rollup rows differ from live sums")
+        self.stdout.write(self.style.SUCCESS("Billing rollup matches live sums"))
@@ -0,0 +1,94 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:24
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+# fills the rollup from existing billing records, as rebuild_billing_rollup does; kept inline
+# since migrations can't import services, which work on the current models
+
+BILLING_ROLLUP_SUM_FIELDS = [
+    "total_cost",
+    "food_internal",
+    "food_external",
+    "alcohol_beverages",
+    "labor",
+    "rentals",
+]
+
+
+def fill_billing_rollup(apps, schema_editor):
+    OrderBase = apps.get_model("orders", "OrderBase")
+    BillingRecord = apps.get_model("orders", "BillingRecord")
+    BillingRollup = apps.get_model("reports", "BillingRollup")
+
+    reportable_orders = OrderBase.objects.filter(
+        flag_active=True, status__status__in=["CONFIRMED", "CHANGE_REQUEST"]
+    )
+    rows = (
+        BillingRecord.objects.filter(order__in=reportable_orders)
+        .order_by()
+        .values("order__event_date", "order__customer_id", "order__customer__tenant_id")
+        .annotate(
+            order_count=models.Count("id"),
+            **{field: models.Sum(field) for field in BILLING_ROLLUP_SUM_FIELDS},
+        )
+    )
+    BillingRollup.objects.bulk_create(
+        (
+            BillingRollup(
+                event_date=row["order__event_date"],
+                customer_id=row["order__customer_id"],
+                tenant_id=row["order__customer__tenant_id"],
+                order_count=row["order_count"],
+                **{field: row[field] for field in BILLING_ROLLUP_SUM_FIELDS},
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('users', '0001_initial'),
+        ('reports', '0001_initial'),
+        ('orders', '0004_order_pdfs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BillingRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+                ('event_date', models.DateField()),
+                ('total_cost', models.DecimalField(decimal_places=2, default=0.0, max_digits=14)),
+                ('food_internal', models.DecimalField(decimal_places=2, default=0.0, max_digits=14)),
+                ('food_external', models.DecimalField(decimal_places=2, default=0.0, max_digits=14)),
+                ('alcohol_beverages', models.DecimalField(decimal_places=2, default=0.0, max_digits=14)),
+                ('labor', models.DecimalField(decimal_places=2, default=0.0, max_digits=14)),
+                ('rentals', models.DecimalField(decimal_places=2, default=0.0, max_digits=14)),
+                ('order_count', models.PositiveIntegerField(default=0)),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('tenant', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='users.tenant')),
+            ],
+            options={
+                'ordering': ['event_date'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='billingrollup',
+            index=models.Index(fields=['tenant', 'event_date'], name='reports_bil_tenant__106414_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='billingrollup',
+            constraint=models.UniqueConstraint(fields=('event_date', 'customer'), name='unique_billing_rollup_key'),
+        ),
+        migrations.RunPython(fill_billing_rollup, migrations.RunPython.noop),
+    ]
@@ -3,7 +3,13 @@ from django.core.exceptions import ValidationError
 from django.db import models, transaction
 from django.db.models import Q
 from django.db.models.enums import Choices
-from django.db.models.signals import post_delete, post_save, pre_save
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_save,
+    pre_save,
+)
 from django.dispatch import receiver, Signal
 from django.urls import reverse, reverse_lazy
 
@@ -18,6 +24,7 @@ from django_pandas.managers import DataFrameManager
 
 # ––– APPLICATION IMPORTS
 from apps.common import models as common_models
+from apps.orders import models as orders_models
 from apps.users import models as users_models
 
 
@@ -27,10 +34,179 @@ from apps.users import models as users_models
 # ––– MODELS
 
 """
+BillingRollup
+ReportExport
 Settings
 """
 
 
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+# BILLING
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+
+
+class BillingRollup(common_models.AbstractBaseModel):
+    """ Billing records of reportable orders, pre-summed per event date and customer """
+
+    event_date = models.DateField()
+
+    total_cost = models.DecimalField(max_digits=14, decimal_places=2, default=0.00)
+    food_internal = models.DecimalField(max_digits=14, decimal_places=2, default=0.00)
+    food_external = models.DecimalField(max_digits=14, decimal_places=2, default=0.00)
+    alcohol_beverages = models.DecimalField(
+        max_digits=14, decimal_places=2, default=0.00
+    )
+    labor = models.DecimalField(max_digits=14, decimal_places=2, default=0.00)
+    rentals = models.DecimalField(max_digits=14, decimal_places=2, default=0.00)
+    order_count = models.PositiveIntegerField(default=0)
+
+    customer = models.ForeignKey(
+        users_models.User, on_delete=models.CASCADE, related_name="+"
+    )
+    tenant = models.ForeignKey(
+        users_models.Tenant,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        null=True,
+        blank=True,
+    )
+
+    def __str__(self):
+        return f"{self.event_date} {self.customer_id}"
+
+    class Meta:
+        ordering = ["event_date"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event_date", "customer"], name="unique_billing_rollup_key"
+            )
+        ]
+        indexes = [models.Index(fields=["tenant", "event_date"])]
+
+
+"""
+Rollup maintenance
+Saved or deleted billing records, statuses and orders recompute the (event date, customer) rows they
+touch, on commit and once per row; tenant groups are resolved through tenant membership at query time,
+so group changes need no update
+Queryset update()/bulk_create() bypass signals: run the rebuild_billing_rollup command afterwards
+"""
+
+
+def get_rollup_keys(*, order_id) -> list:
+    return list(
+        orders_models.OrderBase.objects.filter(id=order_id).values_list(
+            "event_date", "customer_id"
+        )
+    )
+
+
+@receiver([post_save, post_delete], sender=orders_models.BillingRecord)
+@receiver([post_save, post_delete], sender=orders_models.OrderStatus)
+def update_billing_rollup(sender, instance, **kwargs):
+    from apps.reports import services
+
+    for event_date, customer_id in get_rollup_keys(order_id=instance.order_id):
+        services.schedule_billing_rollup_update(
+            event_date=event_date, customer_id=customer_id
+        )
+
+
+@receiver(post_init, sender=orders_models.OrderBase)
+def stash_order_rollup_fields(sender, instance, **kwargs):
+    # __dict__ avoids loading deferred fields
+    instance._rollup_fields = (
+        instance.__dict__.get("event_date"),
+        instance.__dict__.get("customer_id"),
+        instance.__dict__.get("flag_active"),
+    )
+
+
+@receiver(post_save, sender=orders_models.OrderBase)
+@receiver(post_delete, sender=orders_models.OrderBase)
+def update_order_billing_rollup(sender, instance, **kwargs):
+    from apps.reports import services
+
+    rollup_fields = (instance.event_date, instance.customer_id, instance.flag_active)
+    if rollup_fields == instance._rollup_fields and kwargs.get("signal") is post_save:
+        return
+
+    keys = {instance._rollup_fields, rollup_fields}
+    for event_date, customer_id, flag_active in keys:
+        if event_date and customer_id:
+            services.schedule_billing_rollup_update(
+                event_date=event_date, customer_id=customer_id
+            )
+    instance._rollup_fields = rollup_fields
+
+
+@receiver(post_save, sender=users_models.User)
+def update_customer_billing_rollup_tenant(sender, instance, **kwargs):
+    updated = (
+        BillingRollup.objects.filter(customer=instance)
+        .exclude(tenant_id=instance.tenant_id)
+        .update(tenant_id=instance.tenant_id)
+    )
+    if updated:
+        from apps.reports import services
+
+        services.invalidate_report_cache(all_reports=True)
+
+
+@receiver(m2m_changed, sender=users_models.TenantGroup.tenants.through)
+@receiver([post_save, post_delete], sender=users_models.Tenant)
+@receiver([post_save, post_delete], sender=orders_models.CostType)
+def invalidate_report_cache(sender, **kwargs):
+    from apps.reports import services
+
+    # m2m_changed is also sent before changes
+    if kwargs.get("action", "post_").startswith("post_"):
+        services.invalidate_report_cache(all_reports=True)
+
+
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+# EXPORTS
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+
+
+class ReportExport(common_models.AbstractBaseModel):
+    """ Report export run as a background job; the file is kept until expires_at """
+
+    STATUS_CHOICES = (
+        ("PENDING", "Pending"),
+        ("RUNNING", "Running"),
+        ("DONE", "Done"),
+        ("FAILED", "Failed"),
+    )
+    FORMAT_CHOICES = (
+        ("csv", "CSV"),
+        ("xlsx", "XLSX"),
+        ("parquet", "Parquet"),
+    )
+
+    export_format = models.CharField(max_length=16, choices=FORMAT_CHOICES)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default="PENDING")
+    phase = models.CharField(max_length=32, blank=True, default="queued")
+    rows_total = models.PositiveIntegerField(null=True, blank=True)
+    rows_processed = models.PositiveIntegerField(default=0)
+    file = models.FileField(upload_to="report_exports/", null=True, blank=True)
+    filename = models.CharField(max_length=128, blank=True)
+    filter_condition_str = models.TextField(blank=True)
+    error = models.TextField(blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    requested_by = models.ForeignKey(
+        users_models.User, on_delete=models.CASCADE, related_name="report_exports"
+    )
+
+    def __str__(self):
+        return "{0}".format(self.filename or self.id)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+
 # –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
 # SETTINGS
 # –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
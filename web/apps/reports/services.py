@@ -1,6 +1,14 @@
 # ––– DJANGO IMPORTS
-from django.db.models import Model, Q, QuerySet, Sum
-from django.http import HttpResponse
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files import File
+from django.db import transaction
+from django.db.models import CharField, Count, F, IntegerField, Model, Q, QuerySet, Sum
+from django.db.models.functions import Cast, Round
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
 
 
 # ––– PYTHON UTILITY IMPORTS
@@ -9,30 +17,54 @@ import csv
 import datetime
 import datetime as dt
 import decimal
+import hashlib
+import itertools
 from decimal import Decimal as D
 from io import BytesIO as IO
 import json
+import logging
+import os
 import re
-from tempfile import NamedTemporaryFile
-from typing import Tuple
+import shutil
+import threading
+import time
+from tempfile import NamedTemporaryFile, TemporaryFile
+from typing import Iterator, Tuple
+import zipfile
 
 
 # ––– THIRD-PARTY IMPORTS
+import numpy as np
 import pandas
 import pandas as pd
 import xlsxwriter
 
 
 # ––– APPLICATION IMPORTS
+from apps.common import filters as common_filters, jobs
 from apps.orders import models as orders_models
+from apps.orders import services as orders_services
+from apps.reports import models
 from apps.users import models as users_models
 
 
+logger = logging.getLogger(__name__)
+
+
 # –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
 # REPORTS
 # –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
 
 
+BILLING_RECORD_FIELDS_BY_COST_BUCKET = {
+    "food_internal": "food_internal",
+    "food_external": "food_external",
+    "beverage": "alcohol_beverages",
+    "labor": "labor",
+    "rentals": "rentals",
+}
+
+
 def filter_billing_records(
     *,
     tenant_id: str = None,
@@ -40,6 +72,8 @@ def filter_billing_records(
     user_id: str = None,
     cost_type_id: str = None,
     range_date: str = None,
+    project: str = None,
+    award: str = None,
 ) -> Tuple[
     QuerySet[orders_models.OrderBase],
     QuerySet[orders_models.BillingRecord],
@@ -53,16 +87,15 @@ def filter_billing_records(
     tenant_flag = None
     filter_conditions = []
 
-    # convert range_date str to datetime
+    # convert range_date str (custom range or preset) to half-open dates
     if range_date:
-        range_date_start, range_date_end = range_date.split(" to ")
-        range_date_start = dt.datetime.strptime(range_date_start, "%Y-%m-%d")
-        range_date_end = dt.datetime.strptime(range_date_end, "%Y-%m-%d")
+        range_date_start, range_date_end = common_filters.get_date_range(
+            value=range_date
+        )
+        range_date_last = range_date_end - dt.timedelta(days=1)
 
     # define base queryset
-    qs = orders_models.OrderBase.objects.is_active().filter(
-        Q(status__status="CONFIRMED") | Q(status__status="CHANGE_REQUEST")
-    )
+    qs = get_reportable_orders()
 
     # filter based on tenant, tenant group or user (mutually-exclusive)
     if any([tenant_id, tenant_group_id, user_id]):
@@ -91,49 +124,58 @@ def filter_billing_records(
 
     # filter based on date
     if range_date:
-        qs = qs.filter(event_date__gte=range_date_start, event_date__lte=range_date_end)
-        if range_date_start.year == range_date_end.year:
+        qs = common_filters.filter_date_range(
+            queryset=qs, field="event_date", start=range_date_start, end=range_date_end
+        )
+        if range_date_start.year == range_date_last.year:
             filter_conditions.append(
-                f"between <strong>{range_date_start.strftime('%B %d')} and {range_date_end.strftime('%B %d, %Y')}</strong>"
+                f"between <strong>{range_date_start.strftime('%B %d')} and {range_date_last.strftime('%B %d, %Y')}</strong>"
             )
         else:
             filter_conditions.append(
-                f"between <strong>{range_date_start.strftime('%B %d, %Y')} and {range_date_end.strftime('%B %d, %Y')}</strong>"
+                f"between <strong>{range_date_start.strftime('%B %d, %Y')} and {range_date_last.strftime('%B %d, %Y')}</strong>"
             )
 
     # filter based on cost type
     if cost_type_id:
         cost_type = orders_models.CostType.objects.get(id=cost_type_id)
-        if cost_type.name == "Food (Internal)":
-            qs = qs.filter(billing_record__food_internal__gt=0)
-        if cost_type.name == "Food (External)":
-            qs = qs.filter(billing_record__food_external__gt=0)
-        if cost_type.name == "Alcohol and NA Beverages":
-            qs = qs.filter(billing_record__alcohol_beverages__gt=0)
-        if cost_type.name == "Labor":
-            qs = qs.filter(billing_record__labor__gt=0)
-        if cost_type.name == "Rentals":
-            qs = qs.filter(billing_record__rentals__gt=0)
+        cost_bucket = orders_services.get_cost_bucket(cost_type_id=cost_type.id)
+        if cost_bucket:
+            billing_record_field = BILLING_RECORD_FIELDS_BY_COST_BUCKET[cost_bucket]
+            qs = qs.filter(**{f"billing_record__{billing_record_field}__gt": 0})
         filter_conditions.append(
             f"including charges of cost type <strong>{cost_type.name}</strong>"
         )
 
-    # select billing records for orders matching filter
-    billing_records = (
-        orders_models.BillingRecord.objects.filter(order__in=qs)
-        .select_related("order")
-        .only("order__customer")
-    )
+    # filter based on parsed PTAEO payment reference
+    project, award = (value.strip() if value else None for value in (project, award))
+    if project:
+        qs = qs.filter(billing_record__project=project)
+        filter_conditions.append(f"charged to project <strong>{project}</strong>")
+    if award:
+        qs = qs.filter(billing_record__award=award)
+        filter_conditions.append(f"charged to award <strong>{award}</strong>")
 
-    # calculate summary of costs for filtered billing records
-    summary = billing_records.aggregate(
-        Sum("total_cost"),
-        Sum("food_internal"),
-        Sum("food_external"),
-        Sum("alcohol_beverages"),
-        Sum("labor"),
-        Sum("rentals"),
-    )
+    # select billing records for orders matching filter
+    billing_records = orders_models.BillingRecord.objects.filter(order__in=qs)
+
+    # calculate summary of costs and count of filtered billing records
+    if (
+        cost_type_id
+        or project
+        or award
+        or not getattr(settings, "REPORTS_USE_BILLING_ROLLUP", True)
+    ):
+        # cost type and PTAEO filter on individual records, which the rollup cannot answer
+        summary = get_billing_records_summary(records=billing_records)
+    else:
+        summary = get_billing_rollup_summary(
+            tenant_id=tenant_id,
+            tenant_group_id=tenant_group_id,
+            user_id=user_id,
+            range_date_start=range_date_start if range_date else None,
+            range_date_end=range_date_last if range_date else None,
+        )
 
     # generate message string based on parameters provided
     filter_condition_str = ""
@@ -146,6 +188,463 @@ def filter_billing_records(
     return (qs, billing_records, summary, filter_condition_str, error_flag, tenant_flag)
 
 
+def get_reportable_orders() -> QuerySet[orders_models.OrderBase]:
+    return orders_models.OrderBase.objects.is_active().filter(
+        current_status__in=orders_models.REPORTABLE_ORDER_STATUSES
+    )
+
+
+def get_billing_summary_sums() -> list:
+    return [Sum(field) for field in BILLING_ROLLUP_SUM_FIELDS]
+
+
+def get_billing_records_summary(*, records: QuerySet) -> dict:
+    """ Cost sums and record count in one aggregate query """
+
+    return records.aggregate(*get_billing_summary_sums(), count=Count("id"))
+
+
+def get_billing_records_summary_by(
+    *, records: QuerySet, field: str, limit: int = None
+) -> list:
+    """ Cost sums and record count per value of field (e.g. "project", "award"), largest total first """
+
+    rows = (
+        records.exclude(**{field: ""})
+        .order_by()
+        .values(field)
+        .annotate(
+            count=Count("id"),
+            **{f"{name}__sum": Sum(name) for name in BILLING_ROLLUP_SUM_FIELDS},
+        )
+        .order_by("-total_cost__sum", field)
+    )
+    return list(rows[:limit] if limit else rows)
+
+
+"""
+Billing rollup
+- reports.BillingRollup holds billing records of reportable orders pre-summed per (event date, customer),
+  with the customer's tenant, so date-range summaries for a tenant, tenant group or customer read a few
+  rows per day instead of joining every record
+- rows are recomputed from live records on commit, once per key, when records, statuses or orders change
+- rebuild_billing_rollup recreates the table; verify_billing_rollup reports keys that differ from live sums
+"""
+
+BILLING_ROLLUP_SUM_FIELDS = [
+    "total_cost",
+    "food_internal",
+    "food_external",
+    "alcohol_beverages",
+    "labor",
+    "rentals",
+]
+
+_pending_rollup_updates = threading.local()
+
+
+def get_live_billing_rollup_rows(**filters) -> QuerySet:
+    """ Live sums per (event date, customer) in rollup shape, for reportable orders matching filters """
+
+    return (
+        orders_models.BillingRecord.objects.filter(
+            order__in=get_reportable_orders().filter(**filters)
+        )
+        .order_by()
+        .values("order__event_date", "order__customer_id", "order__customer__tenant_id")
+        .annotate(
+            order_count=Count("id"),
+            **{field: Sum(field) for field in BILLING_ROLLUP_SUM_FIELDS},
+        )
+    )
+
+
+def get_billing_rollup_fields(*, row: dict) -> dict:
+    return {
+        "tenant_id": row["order__customer__tenant_id"],
+        "order_count": row["order_count"],
+        **{field: row[field] for field in BILLING_ROLLUP_SUM_FIELDS},
+    }
+
+
+def update_billing_rollup(*, event_date: dt.date, customer_id) -> None:
+    row = get_live_billing_rollup_rows(
+        event_date=event_date, customer_id=customer_id
+    ).first()
+    if row is None:
+        models.BillingRollup.objects.filter(
+            event_date=event_date, customer_id=customer_id
+        ).delete()
+        return
+
+    models.BillingRollup.objects.update_or_create(
+        event_date=event_date,
+        customer_id=customer_id,
+        defaults=get_billing_rollup_fields(row=row),
+    )
+
+
+def flush_billing_rollup_updates() -> None:
+    pending = getattr(_pending_rollup_updates, "keys", set())
+    _pending_rollup_updates.keys = set()
+
+    for event_date, customer_id in pending:
+        update_billing_rollup(event_date=event_date, customer_id=customer_id)
+
+    invalidate_report_cache(event_dates={event_date for event_date, _ in pending})
+
+
+def schedule_billing_rollup_update(*, event_date: dt.date, customer_id) -> None:
+    """ Queues update_billing_rollup until commit; repeated keys within a transaction run once """
+
+    if not hasattr(_pending_rollup_updates, "keys"):
+        _pending_rollup_updates.keys = set()
+    _pending_rollup_updates.keys.add((event_date, customer_id))
+
+    transaction.on_commit(flush_billing_rollup_updates)
+
+
+@transaction.atomic
+def rebuild_billing_rollup(*, batch_size: int = 1000) -> int:
+    models.BillingRollup.objects.all().delete()
+    created = models.BillingRollup.objects.bulk_create(
+        (
+            models.BillingRollup(
+                event_date=row["order__event_date"],
+                customer_id=row["order__customer_id"],
+                **get_billing_rollup_fields(row=row),
+            )
+            for row in get_live_billing_rollup_rows().iterator()
+        ),
+        batch_size=batch_size,
+    )
+    return len(created)
+
+
+def verify_billing_rollup() -> list:
+    """ (event date, customer id, rollup fields, live fields) for every key where the two differ """
+
+    rollup = {
+        (rollup_row.event_date, rollup_row.customer_id): {
+            "tenant_id": rollup_row.tenant_id,
+            "order_count": rollup_row.order_count,
+            **{
+                field: getattr(rollup_row, field) for field in BILLING_ROLLUP_SUM_FIELDS
+            },
+        }
+        for rollup_row in models.BillingRollup.objects.all()
+    }
+
+    mismatches = []
+    for row in get_live_billing_rollup_rows().iterator():
+        key = (row["order__event_date"], row["order__customer_id"])
+        live = get_billing_rollup_fields(row=row)
+        stored = rollup.pop(key, None)
+        if stored != live:
+            mismatches.append((*key, stored, live))
+    for key, stored in rollup.items():
+        mismatches.append((*key, stored, None))
+
+    return mismatches
+
+
+def get_billing_rollup_summary(
+    *,
+    tenant_id: str = None,
+    tenant_group_id: str = None,
+    user_id: str = None,
+    range_date_start: dt.date = None,
+    range_date_end: dt.date = None,
+) -> dict:
+    """ Same result as get_billing_records_summary over the filtered billing records, read from the rollup """
+
+    rows = models.BillingRollup.objects.all()
+    if tenant_id:
+        rows = rows.filter(tenant_id=tenant_id)
+    elif tenant_group_id:
+        rows = rows.filter(tenant__groups__in=[tenant_group_id])
+    elif user_id:
+        rows = rows.filter(customer_id=user_id)
+    if range_date_start:
+        rows = rows.filter(event_date__gte=range_date_start)
+    if range_date_end:
+        rows = rows.filter(event_date__lte=range_date_end)
+
+    summary = rows.aggregate(*get_billing_summary_sums(), count=Sum("order_count"))
+    summary["count"] = summary["count"] or 0
+    return summary
+
+
+"""
+Report result cache
+- results of filter_billing_records (billing record ids, summary and descriptions) are cached under a hash
+  of the normalized parameters, so viewing results and exporting them run the filtering queries once
+- each entry key also carries a version per event-date month in its range (or the all-dates version for
+  reports without a range); a rollup update bumps the versions of the months it touched, so only entries
+  overlapping a changed record, status or order are invalidated
+- tenant, tenant group and cost type changes bump the epoch, which every key carries
+- on a hit, orders are those of the cached billing records
+- results with more than REPORTS_CACHE_MAX_IDS records are not cached
+- versions live in the cache, so a locmem cache would only invalidate its own process; reports are not
+  cached there unless REPORTS_CACHE_LOCMEM
+"""
+
+REPORT_CACHE_KEY_PREFIX = "report_cache"
+
+
+def normalize_report_params(
+    *,
+    tenant_id: str = None,
+    tenant_group_id: str = None,
+    user_id: str = None,
+    cost_type_id: str = None,
+    range_date: str = None,
+    project: str = None,
+    award: str = None,
+) -> dict:
+    """ Parameters as filter_billing_records applies them: tenant, tenant group and user exclusive """
+
+    tenant_id = str(tenant_id) if tenant_id else None
+    tenant_group_id = (
+        str(tenant_group_id) if tenant_group_id and not tenant_id else None
+    )
+    user_id = str(user_id) if user_id and not (tenant_id or tenant_group_id) else None
+
+    range_date_start, range_date_end = None, None
+    if range_date:
+        range_date_start, range_date_end = common_filters.get_date_range(
+            value=range_date
+        )
+        range_date_end -= dt.timedelta(days=1)
+
+    return {
+        "tenant_id": tenant_id,
+        "tenant_group_id": tenant_group_id,
+        "user_id": user_id,
+        "cost_type_id": str(cost_type_id) if cost_type_id else None,
+        "range_date_start": range_date_start,
+        "range_date_end": range_date_end,
+        "project": project.strip() if project else None,
+        "award": award.strip() if award else None,
+    }
+
+
+def is_report_cache_enabled() -> bool:
+    return getattr(settings, "REPORTS_CACHE_LOCMEM", False) or not isinstance(
+        caches["default"], LocMemCache
+    )
+
+
+def get_report_cache_version_keys(
+    *, range_date_start=None, range_date_end=None
+) -> list:
+    keys = [f"{REPORT_CACHE_KEY_PREFIX}:epoch"]
+    if range_date_start is None:
+        return keys + [f"{REPORT_CACHE_KEY_PREFIX}:version:all"]
+
+    year, month = range_date_start.year, range_date_start.month
+    while (year, month) <= (range_date_end.year, range_date_end.month):
+        keys.append(f"{REPORT_CACHE_KEY_PREFIX}:version:{year}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return keys
+
+
+def get_report_cache_versions(*, keys: list) -> list:
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # start from the clock, so an evicted version never returns to an earlier value
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_report_cache_versions(*, keys: list) -> None:
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+
+def invalidate_report_cache(*, event_dates=(), all_reports: bool = False) -> None:
+    """ Invalidates cached reports overlapping event_dates, or every cached report """
+
+    if all_reports:
+        bump_report_cache_versions(keys=[f"{REPORT_CACHE_KEY_PREFIX}:epoch"])
+        return
+
+    months = {(event_date.year, event_date.month) for event_date in event_dates}
+    if months:
+        bump_report_cache_versions(
+            keys=[f"{REPORT_CACHE_KEY_PREFIX}:version:all"]
+            + [
+                f"{REPORT_CACHE_KEY_PREFIX}:version:{year}-{month:02d}"
+                for year, month in sorted(months)
+            ]
+        )
+
+
+def get_report_cache_key(*, params: dict) -> str:
+    versions = get_report_cache_versions(
+        keys=get_report_cache_version_keys(
+            range_date_start=params["range_date_start"],
+            range_date_end=params["range_date_end"],
+        )
+    )
+    digest = hashlib.sha256(
+        json.dumps([params, versions], sort_keys=True, default=str).encode()
+    )
+    return f"{REPORT_CACHE_KEY_PREFIX}:result:{digest.hexdigest()}"
+
+
+def get_cached_billing_records_report(**report_params) -> Tuple[tuple, bool]:
+    """ (filter_billing_records result, hit) for report parameters, cached per normalized parameters """
+
+    if not is_report_cache_enabled():
+        return (filter_billing_records(**report_params), False)
+
+    params = normalize_report_params(**report_params)
+    key = get_report_cache_key(params=params)
+
+    entry = cache.get(key)
+    if entry is not None:
+        billing_records = orders_models.BillingRecord.objects.filter(
+            id__in=entry["record_ids"]
+        )
+        orders = orders_models.OrderBase.objects.filter(
+            billing_record__id__in=entry["record_ids"]
+        )
+        result = (
+            orders,
+            billing_records,
+            entry["summary"],
+            entry["filter_condition_str"],
+            entry["error_flag"],
+            entry["tenant_flag"],
+        )
+        return (result, True)
+
+    result = filter_billing_records(**report_params)
+    (
+        orders,
+        billing_records,
+        summary,
+        filter_condition_str,
+        error_flag,
+        tenant_flag,
+    ) = result
+
+    record_ids = list(billing_records.order_by().values_list("id", flat=True))
+    if len(record_ids) <= getattr(settings, "REPORTS_CACHE_MAX_IDS", 20000):
+        cache.set(
+            key,
+            {
+                "record_ids": record_ids,
+                "summary": summary,
+                "filter_condition_str": filter_condition_str,
+                "error_flag": error_flag,
+                "tenant_flag": tenant_flag,
+            },
+            timeout=getattr(settings, "REPORTS_CACHE_TIMEOUT", 15 * 60),
+        )
+
+    return (result, False)
+
+
+"""
+Report results pages
+- results are shown a page at a time with keyset pagination on (event date, invoice number), which is
+  unique per record, so later pages cost the same as the first instead of an ever larger OFFSET
+- a cursor is the "<event date>:<invoice number>" of the last (next page) or first (previous page) row
+- each page is one query joining orders and customers; the total count comes with the summary
+"""
+
+REPORT_RESULTS_ORDERING = ["order__event_date", "order__invoice_number"]
+
+REPORT_RESULTS_FIELDS = [
+    "event_date",
+    "payment_reference",
+    *orders_models.PTAEO_FIELDS,
+    *BILLING_ROLLUP_SUM_FIELDS,
+    "order__event_date",
+    "order__invoice_number",
+    "order__customer__first_name",
+    "order__customer__last_name",
+]
+
+
+def get_report_results_cursor(*, record: orders_models.BillingRecord) -> str:
+    return f"{record.order.event_date.isoformat()}:{record.order.invoice_number}"
+
+
+def parse_report_results_cursor(*, cursor: str) -> Tuple[dt.date, str]:
+    """ (event date, invoice number) of cursor; raises ValueError if malformed """
+
+    event_date, separator, invoice_number = cursor.partition(":")
+    if not separator or not invoice_number:
+        raise ValueError(f"Malformed cursor {cursor!r}")
+    return (dt.date.fromisoformat(event_date), invoice_number)
+
+
+def get_report_results_page(
+    *,
+    billing_records: QuerySet[orders_models.BillingRecord],
+    after: str = None,
+    before: str = None,
+    page_size: int = None,
+) -> dict:
+    """
+    Page of billing_records after (or before) a cursor, with cursors of neighbouring pages
+    A malformed cursor returns the first page
+    """
+
+    page_size = page_size or getattr(settings, "REPORTS_RESULTS_PAGE_SIZE", 100)
+    records = (
+        billing_records.select_related("order__customer")
+        .only(*REPORT_RESULTS_FIELDS)
+        .order_by(*REPORT_RESULTS_ORDERING)
+    )
+
+    cursor = None
+    if after or before:
+        try:
+            cursor = parse_report_results_cursor(cursor=after or before)
+        except ValueError:
+            before = None
+
+    if cursor:
+        event_date, invoice_number = cursor
+        following = Q(order__event_date__gt=event_date) | Q(
+            order__event_date=event_date, order__invoice_number__gt=invoice_number
+        )
+        preceding = Q(order__event_date__lt=event_date) | Q(
+            order__event_date=event_date, order__invoice_number__lt=invoice_number
+        )
+
+    if before and cursor:
+        # walk backwards from the cursor, then restore display order
+        page = list(records.filter(preceding).reverse()[: page_size + 1])
+        has_previous, has_next = len(page) > page_size, True
+        page = page[:page_size][::-1]
+    else:
+        if cursor:
+            records = records.filter(following)
+        page = list(records[: page_size + 1])
+        has_previous, has_next = cursor is not None, len(page) > page_size
+        page = page[:page_size]
+
+    return {
+        "records": page,
+        "previous_cursor": get_report_results_cursor(record=page[0])
+        if page and has_previous
+        else None,
+        "next_cursor": get_report_results_cursor(record=page[-1])
+        if page and has_next
+        else None,
+    }
+
+
 COLUMNS_GENERAL = [
     "Event Date",
     "Inv. Number",
@@ -197,9 +696,13 @@ COLUMNS_MAPPING = {
 }
 
 
+PTAEO_COLUMNS = ["Project", "Task", "Award", "Expenditure", "Organization"]
+
+
 FIELDS = [
     "order__invoice_number",
     "payment_reference",
+    *orders_models.PTAEO_FIELDS,
     "order__customer__first_name",
     "order__customer__last_name",
     "event_date",
@@ -228,25 +731,75 @@ def combine_and_drop_customer(*, dataframe: pandas.DataFrame) -> pandas.DataFram
     return dataframe
 
 
-def expand_ptaeo(*, dataframe: pandas.DataFrame) -> pandas.DataFrame:
-    dataframe["Project"] = (
-        dataframe["Payment Ref."].apply(lambda row: row.split("-")[0]).astype(str)
-    )
-    dataframe["Task"] = (
-        dataframe["Payment Ref."].apply(lambda row: row.split("-")[1]).astype(str)
-    )
-    dataframe["Award"] = (
-        dataframe["Payment Ref."].apply(lambda row: row.split("-")[2]).astype(str)
-    )
-    dataframe["Expenditure"] = (
-        dataframe["Payment Ref."].apply(lambda row: row.split("-")[3]).astype(str)
+"""
+Typed DataFrames
+- get_billing_records_frame reads values_list tuples in chunks straight into typed columns: integer cents for
+  money, datetime64 for event dates, categorical customer names joined in one vectorized step
+- cents and ISO date strings come from the database, skipping per-row Decimal and date conversion
+- report frames are built from it unless REPORTS_DATAFRAME_VERBOSE selects the previous
+  to_dataframe(verbose=True) path, which resolves display values row by row into object columns of Decimals;
+  both give the same report layout and export bytes
+"""
+
+DATAFRAME_CHUNK_SIZE = 5000
+
+FRAME_EXPRESSIONS = {
+    "event_date": Cast("event_date", CharField()),
+    **{
+        field: Cast(Round(F(field) * 100), IntegerField())
+        for field in BILLING_ROLLUP_SUM_FIELDS
+    },
+}
+
+FRAME_DTYPES = {
+    "event_date": "datetime64[D]",
+    **{field: "int64" for field in BILLING_ROLLUP_SUM_FIELDS},
+}
+
+
+def get_billing_records_frame(
+    *, records: QuerySet[orders_models.BillingRecord]
+) -> pandas.DataFrame:
+    """ FIELDS of records as typed columns, money in integer cents; customer names replace first/last names """
+
+    chunks = {field: [] for field in FIELDS}
+    rows = records.values_list(
+        *[FRAME_EXPRESSIONS.get(field, field) for field in FIELDS]
+    ).iterator(chunk_size=DATAFRAME_CHUNK_SIZE)
+    while True:
+        chunk = list(itertools.islice(rows, DATAFRAME_CHUNK_SIZE))
+        if not chunk:
+            break
+        for field, values in zip(FIELDS, zip(*chunk)):
+            chunks[field].append(
+                np.array(values, dtype=FRAME_DTYPES.get(field, "object"))
+            )
+
+    frame = pd.DataFrame(
+        {
+            field: np.concatenate(arrays)
+            if arrays
+            else np.empty(0, dtype=FRAME_DTYPES.get(field, "object"))
+            for field, arrays in chunks.items()
+        }
     )
-    dataframe["Organization"] = (
-        dataframe["Payment Ref."].apply(lambda row: row.split("-")[4]).astype(str)
+    frame["customer"] = (
+        frame.pop("order__customer__first_name")
+        .str.cat(frame.pop("order__customer__last_name"), sep=" ")
+        .astype("category")
     )
-    dataframe.drop(columns="Payment Ref.", inplace=True)
+    return frame
 
-    return dataframe
+
+def get_billing_records_report_values(*, frame: pandas.DataFrame) -> pandas.DataFrame:
+    """ Typed frame as written by the verbose path: dates as date objects, money as two-decimal strings """
+
+    values = frame.copy()
+    values["event_date"] = values["event_date"].dt.date
+    for field in BILLING_ROLLUP_SUM_FIELDS:
+        values[field] = (values[field] / 100).map("{:.2f}".format)
+    values["customer"] = values["customer"].astype("object")
+    return values
 
 
 def generate_billing_records_dataframe(
@@ -254,18 +807,26 @@ def generate_billing_records_dataframe(
     records: QuerySet[orders_models.BillingRecord],
     filter_condition_str: str,
     tenant_flag: str,
+    verbose: bool = None,
 ) -> pandas.DataFrame:
+    """ Report layout of records; verbose defaults to settings.REPORTS_DATAFRAME_VERBOSE """
+
     if tenant_flag == "university":
         columns = COLUMNS_UNIVERSITY
     else:
         columns = COLUMNS_GENERAL
     base_row = dict.fromkeys(columns, "")
 
-    df = records.to_dataframe(fieldnames=FIELDS, verbose=True)
-    df = combine_and_drop_customer(dataframe=df)
+    if verbose is None:
+        verbose = getattr(settings, "REPORTS_DATAFRAME_VERBOSE", False)
+    if verbose:
+        df = records.to_dataframe(fieldnames=FIELDS, verbose=True)
+        df = combine_and_drop_customer(dataframe=df)
+    else:
+        df = get_billing_records_report_values(
+            frame=get_billing_records_frame(records=records)
+        )
     df.rename(columns=COLUMNS_MAPPING, inplace=True)
-    if tenant_flag == "university":
-        df = expand_ptaeo(dataframe=df)
     df = df[columns]
     df_concat = []
     counter_rows = 0
@@ -303,21 +864,7 @@ def generate_billing_records_dataframe(
     return df_complete
 
 
-def generate_billing_records_xlsx_from_dataframe(
-    *, dataframe: pandas.DataFrame, tenant_flag: str
-) -> HttpResponse:
-    xlsx_stream = IO()
-    writer = pd.ExcelWriter(
-        xlsx_stream,
-        engine="xlsxwriter",
-        options={"remove_timezone": True, "strings_to_numbers": True},
-    )
-
-    workbook = writer.book
-
-    dataframe.to_excel(writer, sheet_name="Orders", index=False, header=False)
-
-    # XLSX FORMATTING STEPS
+def add_billing_records_xlsx_formats(*, workbook) -> dict:
     basic_format = workbook.add_format(
         {
             "num_format": "General",
@@ -365,6 +912,14 @@ def generate_billing_records_xlsx_from_dataframe(
         }
     )
 
+    date_format = workbook.add_format(
+        {
+            "num_format": "yyyy-mm-dd",
+            "font_size": 14,
+            "align": "left",
+        }
+    )
+
     total_row_numeric_format = workbook.add_format(
         {
             "bold": "True",
@@ -375,36 +930,74 @@ def generate_billing_records_xlsx_from_dataframe(
         }
     )
 
-    ws_c = writer.sheets["Orders"]
+    return {
+        "basic": basic_format,
+        "centered": centered_format,
+        "numeric": numeric_format,
+        "currency": currency_format,
+        "title": title_format,
+        "header": header_format,
+        "date": date_format,
+        "total_row_numeric": total_row_numeric_format,
+    }
+
+
+def set_billing_records_xlsx_columns(*, worksheet, formats: dict, tenant_flag: str):
+    basic_format = formats["basic"]
+    currency_format = formats["currency"]
 
     if tenant_flag == "university":
         # Event Date, Invoice number, Project
-        ws_c.set_column("A:C", 15, basic_format)
+        worksheet.set_column("A:C", 15, basic_format)
 
         # Task
-        ws_c.set_column("D:D", 6, basic_format)
+        worksheet.set_column("D:D", 6, basic_format)
 
         # Award, Expenditure, Organization
-        ws_c.set_column("E:G", 15, basic_format)
+        worksheet.set_column("E:G", 15, basic_format)
 
         # Customer
-        ws_c.set_column("H:H", 25, basic_format)
+        worksheet.set_column("H:H", 25, basic_format)
 
         # Total Charges, Food (Internal), Food (External), Alcohol/Bev, Labor, Rentals
-        ws_c.set_column("I:N", 15, currency_format)
+        worksheet.set_column("I:N", 15, currency_format)
 
     else:
         # Event Date, Invoice number
-        ws_c.set_column("A:B", 15, basic_format)
+        worksheet.set_column("A:B", 15, basic_format)
 
         # Payment reference
-        ws_c.set_column("C:C", 35, basic_format)
+        worksheet.set_column("C:C", 35, basic_format)
 
         # Customer
-        ws_c.set_column("D:D", 25, basic_format)
+        worksheet.set_column("D:D", 25, basic_format)
 
         # Total Charges, Food (Internal), Food (External), Alcohol/Bev, Labor, Rentals
-        ws_c.set_column("E:J", 15, currency_format)
+        worksheet.set_column("E:J", 15, currency_format)
+
+
+def generate_billing_records_xlsx_from_dataframe(
+    *, dataframe: pandas.DataFrame, tenant_flag: str
+) -> HttpResponse:
+    xlsx_stream = IO()
+    writer = pd.ExcelWriter(
+        xlsx_stream,
+        engine="xlsxwriter",
+        options={"remove_timezone": True, "strings_to_numbers": True},
+    )
+
+    workbook = writer.book
+
+    dataframe.to_excel(writer, sheet_name="Orders", index=False, header=False)
+
+    formats = add_billing_records_xlsx_formats(workbook=workbook)
+    header_format = formats["header"]
+    title_format = formats["title"]
+
+    ws_c = writer.sheets["Orders"]
+    set_billing_records_xlsx_columns(
+        worksheet=ws_c, formats=formats, tenant_flag=tenant_flag
+    )
 
     ws_c.set_row(2, 19, header_format)
     ws_c.set_row(0, 24, title_format)
@@ -439,4 +1032,586 @@ def generate_billing_records_csv_from_dataframe(
         float_format="%.2f",
     )
 
-    return response
\ No newline at end of file
+    return response
+
+
+"""
+Parquet export
+- typed columns (dates as date32, charges as decimal128(12, 2)) rather than the formatted cells of the
+  CSV/XLSX exports, so billing history loads into analytics tools without re-parsing
+- rows are read in event date order and written one row group per event month, so readers filtering on
+  dates skip whole months from the row group statistics
+- the billing history dataset holds one directory per month (event_month=YYYY-MM, hive partitioning);
+  read_billing_history memory-maps only the months and columns asked for
+- requires pyarrow, imported on first use so the rest of the reports app does not depend on it
+"""
+
+PARQUET_EXPORT_CHUNK_SIZE = 2000
+
+PARQUET_FIELDS = [
+    "event_date",
+    "order__invoice_number",
+    "payment_reference",
+    *orders_models.PTAEO_FIELDS,
+    "order__customer__first_name",
+    "order__customer__last_name",
+    *BILLING_ROLLUP_SUM_FIELDS,
+]
+
+
+def import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ImproperlyConfigured("Parquet export requires pyarrow") from exc
+    return pyarrow
+
+
+def get_billing_records_arrow_schema(*, metadata: dict = None):
+    pa = import_pyarrow()
+    money = pa.decimal128(12, 2)
+    return pa.schema(
+        [
+            ("event_date", pa.date32()),
+            ("invoice_number", pa.string()),
+            ("payment_reference", pa.string()),
+            *[(field, pa.string()) for field in orders_models.PTAEO_FIELDS],
+            ("customer", pa.string()),
+            *[(field, money) for field in BILLING_ROLLUP_SUM_FIELDS],
+        ],
+        metadata=metadata,
+    )
+
+
+def iterate_billing_records_month_tables(
+    *, records: QuerySet[orders_models.BillingRecord], schema, on_progress=None
+) -> Iterator[Tuple[str, object]]:
+    """ (event month "YYYY-MM", pyarrow Table of its records) in event date order """
+
+    pa = import_pyarrow()
+    rows = (
+        records.order_by("event_date", "order__invoice_number")
+        .values_list(*PARQUET_FIELDS)
+        .iterator(chunk_size=PARQUET_EXPORT_CHUNK_SIZE)
+    )
+    count = 0
+    for month, month_rows in itertools.groupby(
+        rows, key=lambda values: values[0].strftime("%Y-%m")
+    ):
+        columns = [[] for _ in schema.names]
+        for values in month_rows:
+            row = dict(zip(PARQUET_FIELDS, values))
+            row["invoice_number"] = row.pop("order__invoice_number")
+            row["customer"] = (
+                f"{row.pop('order__customer__first_name')} "
+                f"{row.pop('order__customer__last_name')}"
+            )
+            for column, name in zip(columns, schema.names):
+                column.append(row[name])
+        table = pa.Table.from_pydict(dict(zip(schema.names, columns)), schema=schema)
+        yield (month, table)
+        count += table.num_rows
+        if on_progress:
+            on_progress(count)
+
+
+def generate_billing_records_parquet(
+    *,
+    records: QuerySet[orders_models.BillingRecord],
+    filter_condition_str: str,
+    on_progress=None,
+) -> FileResponse:
+    pa = import_pyarrow()
+    schema = get_billing_records_arrow_schema(
+        metadata={"filter": re.sub("<[^<]+?>", "", filter_condition_str)}
+    )
+
+    parquet_file = TemporaryFile()
+    with pa.parquet.ParquetWriter(parquet_file, schema) as writer:
+        for month, table in iterate_billing_records_month_tables(
+            records=records, schema=schema, on_progress=on_progress
+        ):
+            writer.write_table(table, row_group_size=table.num_rows)
+    parquet_file.seek(0)
+
+    return FileResponse(
+        parquet_file,
+        as_attachment=True,
+        filename="orders.parquet",
+        content_type="application/vnd.apache.parquet",
+    )
+
+
+def write_billing_history_dataset(
+    *, path: str, records: QuerySet[orders_models.BillingRecord] = None
+) -> dict:
+    """
+    Writes records (default: every billing record) to path as one event_month=YYYY-MM directory per month
+    An existing dataset at path is replaced once the new one is complete; returns rows written per month
+    """
+
+    pa = import_pyarrow()
+    if records is None:
+        records = orders_models.BillingRecord.objects.all()
+    schema = get_billing_records_arrow_schema()
+
+    path = os.path.abspath(path)
+    staging_path = f"{path}.partial"
+    shutil.rmtree(staging_path, ignore_errors=True)
+
+    rows_by_month = {}
+    for month, table in iterate_billing_records_month_tables(
+        records=records, schema=schema
+    ):
+        month_path = os.path.join(staging_path, f"event_month={month}")
+        os.makedirs(month_path)
+        pa.parquet.write_table(
+            table,
+            os.path.join(month_path, "part-0.parquet"),
+            row_group_size=table.num_rows,
+        )
+        rows_by_month[month] = table.num_rows
+    os.makedirs(staging_path, exist_ok=True)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(staging_path, path)
+
+    return rows_by_month
+
+
+def read_billing_history(
+    *, path: str, start_month: str = None, end_month: str = None, columns: list = None
+):
+    """ pyarrow Table of the dataset at path, memory-mapped, limited to months and columns given """
+
+    pa = import_pyarrow()
+    filters = []
+    if start_month:
+        filters.append(("event_month", ">=", start_month))
+    if end_month:
+        filters.append(("event_month", "<=", end_month))
+
+    return pa.parquet.read_table(
+        path,
+        columns=columns,
+        filters=filters or None,
+        memory_map=True,
+        partitioning=pa.dataset.partitioning(
+            pa.schema([("event_month", pa.string())]), flavor="hive"
+        ),
+    )
+
+
+"""
+Streaming CSV export
+- rows are formatted straight from a values_list iterator, so memory stays flat regardless of row count
+- output is byte-identical to generate_billing_records_csv_from_dataframe: same heading rows, PTAEO columns,
+  quoting and line terminator
+"""
+
+CSV_EXPORT_CHUNK_SIZE = 2000
+
+
+class CsvEchoBuffer:
+    """ Pseudo-buffer returning what csv.writer writes, so each row can be yielded """
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def get_billing_records_heading_rows(
+    *, columns: list, filter_condition_str: str
+) -> list:
+    filter_condition_clean = re.sub("<[^<]+?>", "", filter_condition_str)
+    billing_heading = f"Orders - {filter_condition_clean}"
+
+    top_row = [billing_heading] + [""] * (len(columns) - 1)
+    empty_row = [""] * len(columns)
+
+    return [top_row, empty_row, list(columns)]
+
+
+def iterate_billing_records_rows(
+    *,
+    records: QuerySet[orders_models.BillingRecord],
+    tenant_flag: str,
+    on_progress=None,
+) -> Iterator[list]:
+    """ Export rows; on_progress, if given, is called with the running row count once per chunk """
+
+    if tenant_flag == "university":
+        columns = COLUMNS_UNIVERSITY
+    else:
+        columns = COLUMNS_GENERAL
+
+    rows = records.values_list(*FIELDS).iterator(chunk_size=CSV_EXPORT_CHUNK_SIZE)
+    for count, values in enumerate(rows, start=1):
+        row = {
+            COLUMNS_MAPPING.get(field, field): value
+            for field, value in zip(FIELDS, values)
+        }
+        row["Customer"] = (
+            f"{row.pop('order__customer__first_name')} "
+            f"{row.pop('order__customer__last_name')}"
+        )
+        yield [row[column] for column in columns]
+        if on_progress and count % CSV_EXPORT_CHUNK_SIZE == 0:
+            on_progress(count)
+
+
+def generate_billing_records_csv_stream(
+    *,
+    records: QuerySet[orders_models.BillingRecord],
+    filter_condition_str: str,
+    tenant_flag: str,
+    on_progress=None,
+) -> StreamingHttpResponse:
+    if tenant_flag == "university":
+        columns = COLUMNS_UNIVERSITY
+    else:
+        columns = COLUMNS_GENERAL
+
+    writer = csv.writer(
+        CsvEchoBuffer(), quoting=csv.QUOTE_ALL, lineterminator=os.linesep
+    )
+    rows = itertools.chain(
+        get_billing_records_heading_rows(
+            columns=columns, filter_condition_str=filter_condition_str
+        ),
+        iterate_billing_records_rows(
+            records=records, tenant_flag=tenant_flag, on_progress=on_progress
+        ),
+    )
+
+    response = StreamingHttpResponse(
+        (writer.writerow(row) for row in rows), content_type="text/csv"
+    )
+    response["Content-Disposition"] = "attachment; filename=orders.csv"
+
+    return response
+
+
+"""
+Constant-memory XLSX export
+- xlsxwriter constant_memory mode flushes each row to disk once the next one starts, and the rows come from
+  the same chunked iterator as the CSV stream, so memory stays bounded however many rows are exported
+- cells are written typed (dates, numbers, text) rather than re-parsed with strings_to_numbers, so
+  PTAEO segments and payment references stay text and keep leading zeros
+- the workbook is assembled in an anonymous temp file, served with FileResponse and deleted when closed
+"""
+
+
+def generate_billing_records_xlsx_stream(
+    *,
+    records: QuerySet[orders_models.BillingRecord],
+    filter_condition_str: str,
+    tenant_flag: str,
+    on_progress=None,
+) -> FileResponse:
+    if tenant_flag == "university":
+        columns = COLUMNS_UNIVERSITY
+    else:
+        columns = COLUMNS_GENERAL
+
+    xlsx_file = TemporaryFile()
+    workbook = xlsxwriter.Workbook(
+        xlsx_file, {"constant_memory": True, "remove_timezone": True}
+    )
+    worksheet = workbook.add_worksheet("Orders")
+    formats = add_billing_records_xlsx_formats(workbook=workbook)
+    set_billing_records_xlsx_columns(
+        worksheet=worksheet, formats=formats, tenant_flag=tenant_flag
+    )
+
+    # rows must be formatted before they are written in constant_memory mode
+    top_row, empty_row, heading_row = get_billing_records_heading_rows(
+        columns=columns, filter_condition_str=filter_condition_str
+    )
+    worksheet.set_row(0, 24, formats["title"])
+    worksheet.write_string(0, 0, top_row[0], formats["title"])
+    worksheet.set_row(2, 19, formats["header"])
+    worksheet.write_row(2, 0, heading_row, formats["header"])
+
+    for row_idx, row in enumerate(
+        iterate_billing_records_rows(
+            records=records, tenant_flag=tenant_flag, on_progress=on_progress
+        ),
+        start=3,
+    ):
+        for col_idx, value in enumerate(row):
+            if isinstance(value, dt.date):
+                worksheet.write_datetime(row_idx, col_idx, value, formats["date"])
+            elif isinstance(value, (D, int, float)):
+                worksheet.write_number(row_idx, col_idx, float(value))
+            elif value is None:
+                continue
+            else:
+                worksheet.write_string(row_idx, col_idx, str(value))
+
+    workbook.close()
+    xlsx_file.seek(0)
+
+    return FileResponse(
+        xlsx_file,
+        as_attachment=True,
+        filename="orders.xlsx",
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
+
+
+"""
+Background exports
+- exports of more than REPORTS_BACKGROUND_EXPORT_ROWS records run as a job (see apps.common.jobs) rather
+  than within the request, reusing filter_billing_records and the CSV, XLSX and Parquet writers above
+- the job records its phase (queued, filtering, writing, done) and rows processed on its ReportExport
+- finished files are kept in storage for REPORTS_EXPORT_EXPIRY seconds; expired exports are deleted
+  whenever a new one is requested, or by the delete_expired_report_exports command
+"""
+
+REPORT_EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def generate_billing_records_export(
+    *,
+    export_format: str,
+    records: QuerySet[orders_models.BillingRecord],
+    filter_condition_str: str,
+    tenant_flag: str,
+    on_progress=None,
+):
+    """ Streaming response of records in export_format ("csv", "xlsx" or "parquet") """
+
+    if export_format == "parquet":
+        return generate_billing_records_parquet(
+            records=records,
+            filter_condition_str=filter_condition_str,
+            on_progress=on_progress,
+        )
+    if export_format == "xlsx":
+        return generate_billing_records_xlsx_stream(
+            records=records,
+            filter_condition_str=filter_condition_str,
+            tenant_flag=tenant_flag,
+            on_progress=on_progress,
+        )
+    return generate_billing_records_csv_stream(
+        records=records,
+        filter_condition_str=filter_condition_str,
+        tenant_flag=tenant_flag,
+        on_progress=on_progress,
+    )
+
+
+def exceeds_background_export_rows(*, summary: dict) -> bool:
+    threshold = getattr(settings, "REPORTS_BACKGROUND_EXPORT_ROWS", 20000)
+    return threshold is not None and (summary.get("count") or 0) > threshold
+
+
+def request_report_export(*, user: Model, export_format: str, params: dict) -> Model:
+    """ ReportExport for filter_billing_records keyword arguments params, enqueued as a job """
+
+    delete_expired_report_exports()
+
+    report_export = models.ReportExport.objects.create(
+        requested_by=user,
+        export_format=export_format,
+        params={key: str(value) for key, value in params.items() if value},
+    )
+    jobs.enqueue_job(
+        "apps.reports.services.run_report_export_job",
+        report_export_id=str(report_export.id),
+    )
+    return report_export
+
+
+def set_report_export_progress(*, report_export_id: str, **fields) -> None:
+    models.ReportExport.objects.filter(id=report_export_id).update(
+        updated_at=timezone.now(), **fields
+    )
+
+
+def write_report_export(*, report_export: Model) -> None:
+    (
+        orders,
+        billing_records,
+        summary,
+        filter_condition_str,
+        error_flag,
+        tenant_flag,
+    ) = filter_billing_records(**report_export.params)
+    set_report_export_progress(
+        report_export_id=report_export.id,
+        phase="writing",
+        rows_total=summary["count"] or 0,
+        filter_condition_str=filter_condition_str,
+    )
+
+    def on_progress(rows: int):
+        set_report_export_progress(
+            report_export_id=report_export.id, rows_processed=rows
+        )
+
+    response = generate_billing_records_export(
+        export_format=report_export.export_format,
+        records=orders_models.BillingRecord.objects.filter(order__in=orders),
+        filter_condition_str=filter_condition_str,
+        tenant_flag=tenant_flag,
+        on_progress=on_progress,
+    )
+
+    filename = (
+        f"orders-{report_export.created_at:%Y%m%d-%H%M%S}.{report_export.export_format}"
+    )
+    with TemporaryFile() as export_file:
+        for chunk in response.streaming_content:
+            export_file.write(chunk)
+        response.close()
+        export_file.seek(0)
+        report_export.file.save(
+            f"{report_export.id}/{filename}", File(export_file), save=False
+        )
+
+    report_export.filename = filename
+    report_export.filter_condition_str = filter_condition_str
+    report_export.rows_total = summary["count"] or 0
+    report_export.rows_processed = report_export.rows_total
+    report_export.phase = "done"
+    report_export.status = "DONE"
+    report_export.expires_at = timezone.now() + dt.timedelta(
+        seconds=getattr(settings, "REPORTS_EXPORT_EXPIRY", 24 * 60 * 60)
+    )
+    report_export.save()
+
+
+def run_report_export_job(*, report_export_id: str) -> None:
+    claimed = models.ReportExport.objects.filter(
+        id=report_export_id, status="PENDING"
+    ).update(status="RUNNING", phase="filtering", updated_at=timezone.now())
+    if not claimed:
+        return
+
+    report_export = models.ReportExport.objects.get(id=report_export_id)
+    try:
+        write_report_export(report_export=report_export)
+    except Exception as exc:
+        logger.exception(f"Report export {report_export_id} failed")
+        set_report_export_progress(
+            report_export_id=report_export_id, status="FAILED", error=repr(exc)
+        )
+
+
+def get_report_export_status(*, report_export: Model) -> dict:
+    return {
+        "id": str(report_export.id),
+        "format": report_export.export_format,
+        "status": report_export.status,
+        "phase": report_export.phase,
+        "rows_total": report_export.rows_total,
+        "rows_processed": report_export.rows_processed,
+        "filename": report_export.filename,
+        "expires_at": report_export.expires_at.isoformat()
+        if report_export.expires_at
+        else None,
+        "error": report_export.error,
+    }
+
+
+def delete_expired_report_exports() -> int:
+    expired = models.ReportExport.objects.filter(expires_at__lt=timezone.now())
+    for report_export in expired:
+        report_export.file.delete(save=False)
+    return expired.delete()[0]
+
+
+"""
+Batch PDF export
+- orders matched by filter_billing_records, one PDF each, streamed as a ZIP as PDFs become available;
+  at most one PDF is held in memory, entries are stored uncompressed as PDFs are compressed already
+- progress (total/done/cached/failed) is kept in the default cache under the export id; shared across
+  workers with a shared cache, per process with locmem
+- invoice numbers of orders that failed to render are listed in failed.txt inside the archive
+"""
+
+EXPORT_PROGRESS_KEY_PREFIX = "reports_pdf_export"
+EXPORT_PROGRESS_TIMEOUT = 60 * 60
+
+
+class ZipStreamBuffer:
+    """ Write-only file object collecting zipfile output between yields """
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def set_export_progress(*, export_id: str, progress: dict) -> None:
+    cache.set(
+        f"{EXPORT_PROGRESS_KEY_PREFIX}:{export_id}",
+        progress,
+        timeout=EXPORT_PROGRESS_TIMEOUT,
+    )
+
+
+def get_export_progress(*, export_id: str) -> dict:
+    return cache.get(f"{EXPORT_PROGRESS_KEY_PREFIX}:{export_id}")
+
+
+def generate_orders_pdfs_zip(
+    *, orders: QuerySet, base_url: str, export_id: str = None
+) -> Iterator[bytes]:
+    progress = {
+        "total": orders.count(),
+        "done": 0,
+        "cached": 0,
+        "failed": 0,
+        "finished": False,
+    }
+    if export_id:
+        set_export_progress(export_id=export_id, progress=progress)
+
+    buffer = ZipStreamBuffer()
+    failed = []
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        for order, pdf_file, cached in orders_services.render_orders_pdfs(
+            orders=orders.order_by("invoice_number"), base_url=base_url
+        ):
+            if pdf_file is None:
+                failed.append(str(order.invoice_number))
+                progress["failed"] += 1
+            else:
+                filename = f"{order.invoice_number}-{order.event_date:%Y-%m-%d}.pdf"
+                with pdf_file.open("rb") as source, archive.open(
+                    filename, "w"
+                ) as target:
+                    shutil.copyfileobj(source, target)
+                progress["cached"] += cached
+
+            progress["done"] += 1
+            if export_id:
+                set_export_progress(export_id=export_id, progress=progress)
+            yield buffer.drain()
+
+        if failed:
+            archive.writestr("failed.txt", "\n".join(failed) + "\n")
+
+    progress["finished"] = True
+    if export_id:
+        set_export_progress(export_id=export_id, progress=progress)
+    yield buffer.drain()
@@ -1,5 +1,699 @@
 # --- DJANGO IMPORTS
-from django.test import TestCase
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
 
 
-# Create your tests here.
+# ––– PYTHON UTILITY IMPORTS
+import datetime as dt
+import importlib
+from io import BytesIO
+import shutil
+import tempfile
+from unittest import mock, skipIf, skipUnless
+import uuid
+import zipfile
+
+
+# ––– THIRD-PARTY IMPORTS
+from openpyxl import load_workbook
+
+try:
+    import pyarrow.parquet as pyarrow_parquet
+except ImportError:
+    pyarrow_parquet = None
+
+
+# ––– APPLICATION IMPORTS
+from apps.common import filters, middleware, services as common_services
+from apps.orders import models as orders_models
+from apps.orders.tests import SyntheticDataTestMixin
+from apps.reports import forms, models, services
+from apps.users import models as users_models
+
+
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+# EXPORTS
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+
+
+class BillingRollupTests(SyntheticDataTestMixin, TestCase):
+    range_date = "2021-03-01 to 2021-09-30"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        services.rebuild_billing_rollup()
+
+    def assertRollupMatchesLive(self):
+        self.assertEqual(services.verify_billing_rollup(), [])
+
+        tenant = users_models.Tenant.objects.first()
+        filters = [
+            {},
+            {"tenant_id": tenant.id},
+            {"tenant_group_id": users_models.TenantGroup.objects.first().id},
+            {"user_id": users_models.User.objects.filter(tenant=tenant).first().id},
+        ]
+        for filter_kwargs in filters:
+            with self.subTest(**filter_kwargs):
+                (
+                    orders,
+                    billing_records,
+                    summary,
+                    filter_condition_str,
+                    error_flag,
+                    tenant_flag,
+                ) = services.filter_billing_records(
+                    range_date=self.range_date, **filter_kwargs
+                )
+                self.assertEqual(
+                    summary,
+                    services.get_billing_records_summary(records=billing_records),
+                )
+
+    def test_rebuilt_rollup_matches_live_sums(self):
+        self.assertTrue(models.BillingRollup.objects.exists())
+        self.assertRollupMatchesLive()
+
+    def test_migration_fills_rollup_from_existing_records(self):
+        migration = importlib.import_module(
+            "apps.reports.migrations.0002_billing_rollup"
+        )
+        models.BillingRollup.objects.all().delete()
+
+        migration.fill_billing_rollup(apps, None)
+
+        self.assertTrue(models.BillingRollup.objects.exists())
+        self.assertRollupMatchesLive()
+
+    def test_rollup_follows_record_status_and_order_changes(self):
+        billing_record = orders_models.BillingRecord.objects.select_related(
+            "order__status"
+        ).first()
+        order = billing_record.order
+
+        with self.captureOnCommitCallbacks(execute=True):
+            billing_record.total_cost += 100
+            billing_record.save()
+        self.assertRollupMatchesLive()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            order.event_date = dt.date(2021, 6, 15)
+            order.save()
+        self.assertRollupMatchesLive()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            order.status.status = "CANCELLED"
+            order.status.save()
+        self.assertRollupMatchesLive()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            order.delete()
+        self.assertRollupMatchesLive()
+
+
+@override_settings(REPORTS_CACHE_LOCMEM=True)
+class ReportCacheTests(SyntheticDataTestMixin, TestCase):
+    range_date = "2021-03-01 to 2021-04-30"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        services.rebuild_billing_rollup()
+        cls.user = users_models.User.objects.create(
+            email="staff@example.com", is_staff=True
+        )
+
+    def setUp(self):
+        cache.clear()
+        # keys queued by rolled-back transactions of earlier tests
+        services._pending_rollup_updates.keys = set()
+
+    def get_report(self):
+        result, hit = services.get_cached_billing_records_report(
+            range_date=self.range_date, tenant_id=""
+        )
+        return (result, hit)
+
+    def change_record_in_month(self, month):
+        billing_record = orders_models.BillingRecord.objects.filter(
+            order__event_date__month=month
+        ).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            billing_record.total_cost += 1
+            billing_record.save()
+
+    def test_repeated_report_is_served_from_cache(self):
+        result, hit = self.get_report()
+        self.assertFalse(hit)
+
+        with self.assertNumQueries(0):
+            cached_result, hit = self.get_report()
+        self.assertTrue(hit)
+
+        self.assertEqual(cached_result[2], result[2])
+        self.assertEqual(set(cached_result[1]), set(result[1]))
+        self.assertTrue(result[1].exists())
+
+    @override_settings(REPORTS_CACHE_LOCMEM=False)
+    def test_locmem_cache_is_skipped(self):
+        self.get_report()
+        result, hit = self.get_report()
+
+        self.assertFalse(hit)
+        self.assertEqual(
+            result[2], services.get_billing_records_summary(records=result[1])
+        )
+
+    def test_only_overlapping_changes_invalidate(self):
+        self.get_report()
+
+        self.change_record_in_month(8)
+        self.assertTrue(self.get_report()[1])
+
+        self.change_record_in_month(4)
+        result, hit = self.get_report()
+        self.assertFalse(hit)
+        self.assertEqual(
+            result[2], services.get_billing_records_summary(records=result[1])
+        )
+
+    @override_settings(QUERY_INSTRUMENTATION_ENABLED=True, QUERY_BUDGETS={})
+    def test_hits_and_misses_are_instrumented(self):
+        middleware.clear_query_records()
+        self.client.force_login(self.user)
+        self.client.post(
+            reverse("apps.reports:reports_index"), {"range_date": self.range_date}
+        )
+
+        self.client.get(reverse("apps.reports:reports_results"))
+        self.client.get(reverse("apps.reports:reports_export_csv"))
+
+        report = middleware.get_query_report()
+        cache_events = {}
+        for row in report:
+            for name, count in row["cache"].items():
+                cache_events[name] = cache_events.get(name, 0) + count
+        self.assertEqual(cache_events, {"report:hits": 1, "report:misses": 1})
+
+
+class ReportResultsPageTests(SyntheticDataTestMixin, TestCase):
+    range_date = "2021-01-01 to 2021-12-31"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        services.rebuild_billing_rollup()
+        cls.user = users_models.User.objects.create(
+            email="staff@example.com", is_staff=True
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_pages_walk_all_records_in_both_directions(self):
+        billing_records = services.filter_billing_records(range_date=self.range_date)[1]
+        expected = list(
+            billing_records.order_by(
+                "order__event_date", "order__invoice_number"
+            ).values_list("id", flat=True)
+        )
+        self.assertGreater(len(expected), 14)
+
+        pages, cursor = [], None
+        while True:
+            with self.assertNumQueries(1):
+                page = services.get_report_results_page(
+                    billing_records=billing_records, after=cursor, page_size=7
+                )
+                names = [
+                    record.order.customer.get_full_name for record in page["records"]
+                ]
+            self.assertTrue(all(names))
+            pages.append([record.id for record in page["records"]])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual([record_id for page in pages for record_id in page], expected)
+
+        cursor, backwards = page["previous_cursor"], []
+        while cursor:
+            page = services.get_report_results_page(
+                billing_records=billing_records, before=cursor, page_size=7
+            )
+            backwards.append([record.id for record in page["records"]])
+            cursor = page["previous_cursor"]
+        self.assertEqual(backwards, pages[-2::-1])
+
+    def test_malformed_cursor_returns_first_page(self):
+        billing_records = services.filter_billing_records(range_date=self.range_date)[1]
+        first = services.get_report_results_page(
+            billing_records=billing_records, page_size=7
+        )
+
+        page = services.get_report_results_page(
+            billing_records=billing_records, before="not-a-cursor", page_size=7
+        )
+
+        self.assertEqual(page["records"], first["records"])
+        self.assertIsNone(page["previous_cursor"])
+
+    def test_results_view_queries_do_not_grow_with_page_size(self):
+        self.client.force_login(self.user)
+        self.client.post(
+            reverse("apps.reports:reports_index"), {"range_date": self.range_date}
+        )
+        url = reverse("apps.reports:reports_results")
+
+        query_counts = []
+        for page_size in [5, 30]:
+            cache.clear()
+            with override_settings(REPORTS_RESULTS_PAGE_SIZE=page_size):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url)
+            self.assertEqual(len(response.context["billing_records"]), page_size)
+            query_counts.append(len(queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
+        self.assertEqual(
+            response.context["summary"]["count"],
+            orders_models.BillingRecord.objects.filter(
+                order__in=services.filter_billing_records(range_date=self.range_date)[0]
+            ).count(),
+        )
+
+
+class BillingRecordsCsvStreamTests(SyntheticDataTestMixin, TestCase):
+    range_date = "2021-01-01 to 2021-12-31"
+
+    def assertStreamMatchesDataframe(self, **filters):
+        (
+            orders,
+            billing_records,
+            summary,
+            filter_condition_str,
+            error_flag,
+            tenant_flag,
+        ) = services.filter_billing_records(range_date=self.range_date, **filters)
+
+        expected, typed = (
+            services.generate_billing_records_csv_from_dataframe(
+                dataframe=services.generate_billing_records_dataframe(
+                    records=orders_models.BillingRecord.frames.filter(order__in=orders),
+                    filter_condition_str=filter_condition_str,
+                    tenant_flag=tenant_flag,
+                    verbose=verbose,
+                ),
+                tenant_flag=tenant_flag,
+            ).content
+            for verbose in [True, False]
+        )
+        self.assertEqual(typed, expected)
+        streamed = b"".join(
+            services.generate_billing_records_csv_stream(
+                records=orders_models.BillingRecord.objects.filter(order__in=orders),
+                filter_condition_str=filter_condition_str,
+                tenant_flag=tenant_flag,
+            ).streaming_content
+        )
+
+        self.assertGreater(expected.count(b"\n"), 3)
+        self.assertEqual(streamed, expected)
+
+    def test_general_layout_is_byte_identical(self):
+        self.assertStreamMatchesDataframe()
+
+    def test_university_layout_is_byte_identical(self):
+        tenant = users_models.Tenant.objects.filter(name__contains="University").first()
+
+        self.assertStreamMatchesDataframe(tenant_id=tenant.id)
+
+    def test_typed_frame_columns(self):
+        records = orders_models.BillingRecord.objects.order_by("id")
+
+        frame = services.get_billing_records_frame(records=records)
+
+        self.assertEqual(len(frame), records.count())
+        self.assertEqual(frame["total_cost"].dtype, "int64")
+        self.assertEqual(frame["event_date"].dtype, "datetime64[ns]")
+        self.assertEqual(frame["customer"].dtype, "category")
+        record = records.select_related("order__customer").first()
+        self.assertEqual(frame["total_cost"].iloc[0], int(record.total_cost * 100))
+        self.assertEqual(
+            frame["customer"].iloc[0],
+            f"{record.order.customer.first_name} {record.order.customer.last_name}",
+        )
+        self.assertEqual(
+            len(services.get_billing_records_frame(records=records.none())), 0
+        )
+
+
+class BillingRecordsXlsxStreamTests(SyntheticDataTestMixin, TestCase):
+    range_date = "2021-01-01 to 2021-12-31"
+    orders_count = 20
+
+    def export(self, **filters):
+        (
+            orders,
+            billing_records,
+            summary,
+            filter_condition_str,
+            error_flag,
+            tenant_flag,
+        ) = services.filter_billing_records(range_date=self.range_date, **filters)
+        response = services.generate_billing_records_xlsx_stream(
+            records=orders_models.BillingRecord.objects.filter(order__in=orders),
+            filter_condition_str=filter_condition_str,
+            tenant_flag=tenant_flag,
+        )
+        workbook = load_workbook(BytesIO(b"".join(response.streaming_content)))
+        return (orders, list(workbook["Orders"].values))
+
+    def test_rows_are_written_typed_after_heading(self):
+        orders, rows = self.export()
+
+        self.assertTrue(rows[0][0].startswith("Orders - "))
+        self.assertEqual(list(rows[2]), services.COLUMNS_GENERAL)
+        self.assertEqual(len(rows), 3 + orders.count())
+
+        billing_record = orders_models.BillingRecord.objects.filter(
+            order__in=orders
+        ).first()
+        first_row = dict(zip(services.COLUMNS_GENERAL, rows[3]))
+        self.assertEqual(first_row["Event Date"].date(), billing_record.event_date)
+        self.assertEqual(first_row["Total Charges"], float(billing_record.total_cost))
+
+    def test_university_layout_keeps_ptaeo_as_text(self):
+        tenant = users_models.Tenant.objects.filter(name__contains="University").first()
+
+        orders, rows = self.export(tenant_id=tenant.id)
+
+        self.assertEqual(list(rows[2]), services.COLUMNS_UNIVERSITY)
+        first_row = dict(zip(services.COLUMNS_UNIVERSITY, rows[3]))
+        for column in services.PTAEO_COLUMNS:
+            self.assertIsInstance(first_row[column], str)
+
+    def test_filters_and_groups_by_ptaeo_columns(self):
+        tenant = users_models.Tenant.objects.filter(name__contains="University").first()
+        billing_record = orders_models.BillingRecord.objects.filter(
+            order__customer__tenant=tenant
+        ).first()
+
+        orders, billing_records, summary, *_ = services.filter_billing_records(
+            range_date=self.range_date, project=billing_record.project
+        )
+        self.assertEqual(list(billing_records), [billing_record])
+        self.assertEqual(summary["count"], 1)
+        self.assertEqual(
+            services.filter_billing_records(
+                range_date=self.range_date, award=billing_record.award
+            )[1].get(),
+            billing_record,
+        )
+
+        rows = services.get_billing_records_summary_by(
+            records=orders_models.BillingRecord.objects.all(), field="award"
+        )
+        self.assertEqual(
+            sum(row["count"] for row in rows),
+            orders_models.BillingRecord.objects.exclude(award="").count(),
+        )
+        self.assertEqual(
+            [row["total_cost__sum"] for row in rows],
+            sorted((row["total_cost__sum"] for row in rows), reverse=True),
+        )
+
+
+@skipIf(pyarrow_parquet is None, "Parquet export requires pyarrow")
+class BillingRecordsParquetTests(SyntheticDataTestMixin, TestCase):
+    range_date = "2021-01-01 to 2021-12-31"
+    orders_count = 20
+
+    def setUp(self):
+        self.dataset_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dataset_root, ignore_errors=True)
+
+    def test_export_is_typed_with_a_row_group_per_month(self):
+        (
+            orders,
+            billing_records,
+            summary,
+            filter_condition_str,
+            *_,
+        ) = services.filter_billing_records(range_date=self.range_date)
+        response = services.generate_billing_records_parquet(
+            records=billing_records, filter_condition_str=filter_condition_str
+        )
+        parquet_file = pyarrow_parquet.ParquetFile(
+            BytesIO(b"".join(response.streaming_content))
+        )
+
+        table = parquet_file.read()
+        self.assertEqual(table.num_rows, billing_records.count())
+        self.assertEqual(str(table.schema.field("event_date").type), "date32[day]")
+        self.assertEqual(
+            str(table.schema.field("total_cost").type), "decimal128(12, 2)"
+        )
+        self.assertEqual(
+            sum(table.column("total_cost").to_pylist()),
+            sum(billing_records.values_list("total_cost", flat=True)),
+        )
+
+        months = {record.event_date.strftime("%Y-%m") for record in billing_records}
+        self.assertEqual(parquet_file.num_row_groups, len(months))
+
+    def test_history_dataset_round_trips_by_month(self):
+        path = f"{self.dataset_root}/billing"
+        rows_by_month = services.write_billing_history_dataset(path=path)
+        self.assertEqual(
+            sum(rows_by_month.values()), orders_models.BillingRecord.objects.count()
+        )
+
+        month = sorted(rows_by_month)[1]
+        table = services.read_billing_history(
+            path=path, start_month=month, end_month=month, columns=["invoice_number"]
+        )
+        self.assertEqual(
+            sorted(table.column("invoice_number").to_pylist()),
+            sorted(
+                orders_models.BillingRecord.objects.filter(
+                    event_date__year=int(month[:4]), event_date__month=int(month[5:])
+                ).values_list("order__invoice_number", flat=True)
+            ),
+        )
+
+        # rewriting replaces the dataset instead of adding to it
+        services.write_billing_history_dataset(path=path)
+        self.assertEqual(
+            services.read_billing_history(path=path).num_rows,
+            sum(rows_by_month.values()),
+        )
+
+
+@override_settings(ORDER_PDF_PROCESSES=0)
+class OrdersPdfsZipTests(SyntheticDataTestMixin, TestCase):
+    range_date = "2021-01-01 to 2021-12-31"
+    tenants_count = 2
+    users_per_tenant = 2
+    orders_count = 6
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def export(self, export_id):
+        orders = services.filter_billing_records(range_date=self.range_date)[0]
+        content = b"".join(
+            services.generate_orders_pdfs_zip(
+                orders=orders, base_url="http://testserver/", export_id=export_id
+            )
+        )
+        return (orders, zipfile.ZipFile(BytesIO(content)))
+
+    def test_zip_has_one_pdf_per_order(self):
+        export_id = str(uuid.uuid4())
+
+        orders, archive = self.export(export_id)
+
+        self.assertTrue(orders.exists())
+        self.assertEqual(len(archive.namelist()), orders.count())
+        self.assertTrue(archive.read(archive.namelist()[0]).startswith(b"%PDF"))
+        progress = services.get_export_progress(export_id=export_id)
+        self.assertTrue(progress["finished"])
+        self.assertEqual(progress["done"], orders.count())
+        self.assertEqual(progress["cached"], 0)
+
+    def test_unchanged_orders_are_served_from_stored_pdfs(self):
+        self.export(str(uuid.uuid4()))
+        export_id = str(uuid.uuid4())
+
+        orders, archive = self.export(export_id)
+
+        progress = services.get_export_progress(export_id=export_id)
+        self.assertEqual(progress["cached"], orders.count())
+        self.assertEqual(len(archive.namelist()), orders.count())
+
+
+@override_settings(JOB_BACKEND="sync", REPORTS_BACKGROUND_EXPORT_ROWS=10)
+class ReportExportJobTests(SyntheticDataTestMixin, TestCase):
+    range_date = "2021-01-01 to 2021-12-31"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        services.rebuild_billing_rollup()
+        cls.user = users_models.User.objects.create(
+            email="staff@example.com", is_staff=True
+        )
+
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client.force_login(self.user)
+        self.client.post(
+            reverse("apps.reports:reports_index"), {"range_date": self.range_date}
+        )
+
+    def test_large_export_runs_in_background_and_downloads(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.get(reverse("apps.reports:reports_export_csv"))
+
+        self.assertRedirects(response, reverse("apps.reports:reports_exports"))
+        report_export = models.ReportExport.objects.get()
+        rows = orders_models.BillingRecord.objects.filter(
+            order__in=services.filter_billing_records(range_date=self.range_date)[0]
+        ).count()
+        self.assertEqual(report_export.status, "DONE")
+        self.assertEqual(report_export.rows_total, rows)
+        self.assertEqual(report_export.rows_processed, rows)
+
+        status = self.client.get(
+            reverse(
+                "apps.reports:reports_export_status", kwargs={"pk": report_export.id}
+            )
+        ).json()
+        self.assertEqual(status["phase"], "done")
+        download = self.client.get(
+            reverse(
+                "apps.reports:reports_export_download", kwargs={"pk": report_export.id}
+            )
+        )
+        streamed = services.generate_billing_records_csv_stream(
+            records=orders_models.BillingRecord.objects.filter(
+                order__in=services.filter_billing_records(range_date=self.range_date)[0]
+            ),
+            filter_condition_str=report_export.filter_condition_str,
+            tenant_flag=None,
+        )
+        self.assertEqual(
+            b"".join(download.streaming_content), b"".join(streamed.streaming_content)
+        )
+
+    def test_small_export_is_streamed(self):
+        with override_settings(REPORTS_BACKGROUND_EXPORT_ROWS=100000):
+            response = self.client.get(reverse("apps.reports:reports_export_csv"))
+
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertFalse(models.ReportExport.objects.exists())
+
+    def test_expired_exports_are_gone(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(reverse("apps.reports:reports_export_csv"))
+        report_export = models.ReportExport.objects.get()
+        models.ReportExport.objects.update(
+            expires_at=timezone.now() - dt.timedelta(seconds=1)
+        )
+
+        download = self.client.get(
+            reverse(
+                "apps.reports:reports_export_download", kwargs={"pk": report_export.id}
+            )
+        )
+
+        self.assertEqual(download.status_code, 410)
+        self.assertEqual(services.delete_expired_report_exports(), 1)
+        self.assertFalse(models.ReportExport.objects.exists())
+
+
+class ReportDateRangeTests(SyntheticDataTestMixin, TestCase):
+    tenants_count = 2
+    users_per_tenant = 2
+    orders_count = 20
+
+    @override_settings(FISCAL_YEAR_START_MONTH=7)
+    @mock.patch.object(filters, "localdate", return_value=dt.date(2022, 3, 1))
+    def test_preset_matches_custom_range(self, localdate):
+        custom = "2020-07-01 to 2021-06-30"
+
+        preset_results = services.filter_billing_records(range_date="fiscal_prior_year")
+        custom_results = services.filter_billing_records(range_date=custom)
+
+        self.assertTrue(preset_results[1].exists())
+        self.assertEqual(list(preset_results[1]), list(custom_results[1]))
+        self.assertEqual(preset_results[3], custom_results[3])
+        self.assertEqual(
+            services.normalize_report_params(range_date="fiscal_prior_year"),
+            services.normalize_report_params(range_date=custom),
+        )
+
+    def test_form_rejects_malformed_range(self):
+        self.assertTrue(
+            forms.ReportForm({"range_date": "past_years_plus_1"}).is_valid()
+        )
+        self.assertIn(
+            "range_date", forms.ReportForm({"range_date": "last spring"}).errors
+        )
+
+
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+# QUERY PLANS
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+
+
+@skipUnless(connection.vendor == "sqlite", "plans are checked against SQLite")
+class ReportQueryPlanTests(SyntheticDataTestMixin, TestCase):
+    range_date = "2021-01-01 to 2021-03-31"
+    orders_count = 20
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.customer = orders_models.OrderBase.objects.first().customer
+        cls.cost_type = orders_models.CostType.objects.first()
+
+    def test_report_filters_read_no_full_scans(self):
+        for params in [
+            {},
+            {"tenant_id": str(self.customer.tenant_id)},
+            {"tenant_group_id": str(self.customer.tenant.groups.first().id)},
+            {"user_id": str(self.customer.id)},
+            {"cost_type_id": str(self.cost_type.id)},
+        ]:
+            with self.subTest(**params):
+                orders, billing_records, *_ = services.filter_billing_records(
+                    range_date=self.range_date, **params
+                )
+                self.assertEqual(common_services.get_full_scans(queryset=orders), [])
+                self.assertEqual(
+                    common_services.get_full_scans(queryset=billing_records), []
+                )
+
+    def test_rollup_reads_no_full_scans(self):
+        rollup = models.BillingRollup.objects.filter(
+            tenant=self.customer.tenant,
+            event_date__range=(dt.date(2021, 1, 1), dt.date(2021, 3, 31)),
+        )
+
+        self.assertEqual(common_services.get_full_scans(queryset=rollup), [])
@@ -16,6 +16,24 @@ app_name = "apps.reports"
 urlpatterns = [
     path("export/csv/", views.report_export_csv, name="reports_export_csv"),
     path("export/xlsx/", views.report_export_xlsx, name="reports_export_xlsx"),
+    path("export/parquet/", views.report_export_parquet, name="reports_export_parquet"),
+    path("export/pdfs/", views.report_export_pdfs, name="reports_export_pdfs"),
+    path(
+        "export/pdfs/<uuid:export_id>/progress/",
+        views.report_export_pdfs_progress,
+        name="reports_export_pdfs_progress",
+    ),
+    path("exports/", views.report_exports, name="reports_exports"),
+    path(
+        "exports/<uuid:pk>/status/",
+        views.report_export_status,
+        name="reports_export_status",
+    ),
+    path(
+        "exports/<uuid:pk>/download/",
+        views.report_export_download,
+        name="reports_export_download",
+    ),
     path("results/", views.report_render_results, name="reports_results"),
     path("", views.report_select_parameters, name="reports_index"),
 ]
@@ -1,13 +1,21 @@
 # ––– DJANGO IMPORTS
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages import add_message
 from django.core import serializers
-from django.db.models import Q, Sum
-from django.http import HttpResponseRedirect
-from django.shortcuts import render
+from django.db.models import Q, QuerySet, Sum
+from django.http import (
+    FileResponse,
+    HttpResponse,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.shortcuts import get_object_or_404, render
 from django.urls import reverse, reverse_lazy
+from django.utils import timezone
 from django.views.generic import (
     TemplateView,
 )
@@ -15,14 +23,16 @@ from django.views.generic import (
 
 # ––– PYTHON UTILITY IMPORTS
 import datetime as dt
+import uuid
 
 
 # ––– THIRD-PARTY IMPORTS
 
 
 # ––– APPLICATION IMPORTS
+from apps.common import middleware as common_middleware
 from apps.orders import models as orders_models
-from apps.reports import forms, services
+from apps.reports import forms, models, services
 from apps.users import models as users_models
 
 
@@ -75,12 +85,6 @@ def report_render_results(request, **kwargs):
         tenant_flag = None
         filter_conditions = []
 
-        tenant_id = params.get("tenant", None)
-        tenant_group_id = params.get("tenant_group", None)
-        user_id = params.get("user", None)
-        cost_type_id = params.get("cost_type", None)
-        range_date = params.get("range_date", None)
-
         (
             orders,
             billing_records,
@@ -88,14 +92,26 @@ def report_render_results(request, **kwargs):
             filter_condition_str,
             error_flag,
             tenant_flag,
-        ) = services.filter_billing_records(
-            tenant_id=tenant_id,
-            tenant_group_id=tenant_group_id,
-            user_id=user_id,
-            cost_type_id=cost_type_id,
-            range_date=range_date,
+        ), cache_hit = services.get_cached_billing_records_report(
+            **get_report_params(params)
         )
+        common_middleware.record_cache_event(request, name="report", hit=cache_hit)
         print("tenant_flag:", tenant_flag)
+        page = services.get_report_results_page(
+            billing_records=billing_records,
+            after=request.GET.get("after"),
+            before=request.GET.get("before"),
+        )
+        summaries_by_ptaeo = None
+        if tenant_flag == "university":
+            summaries_by_ptaeo = {
+                field: services.get_billing_records_summary_by(
+                    records=billing_records,
+                    field=field,
+                    limit=getattr(settings, "REPORTS_PTAEO_SUMMARY_LIMIT", 10),
+                )
+                for field in ["project", "award"]
+            }
         add_message(
             request,
             messages.SUCCESS,
@@ -105,8 +121,9 @@ def report_render_results(request, **kwargs):
     else:
         error_flag = True
         tenant_flag = None
-        billing_records = None
+        page = None
         summary = None
+        summaries_by_ptaeo = None
         add_message(
             request,
             messages.ERROR,
@@ -119,21 +136,32 @@ def report_render_results(request, **kwargs):
         {
             "error_flag": error_flag,
             "tenant_flag": tenant_flag,
-            "billing_records": billing_records,
+            "billing_records": page["records"] if page else None,
+            "page": page,
             "summary": summary,
+            "summaries_by_ptaeo": summaries_by_ptaeo,
         },
     )
 
 
-@login_required
-def report_export_csv(request, **kwargs):
-    params = request.session["report_params"]
+def get_report_params(params) -> dict:
+    """ filter_billing_records keyword arguments from report parameters stored in the session """
+
+    return {
+        "tenant_id": params.get("tenant", None),
+        "tenant_group_id": params.get("tenant_group", None),
+        "user_id": params.get("user", None),
+        "cost_type_id": params.get("cost_type", None),
+        "range_date": params.get("range_date", None),
+        "project": params.get("project", None),
+        "award": params.get("award", None),
+    }
 
-    tenant_id = params.get("tenant", None)
-    tenant_group_id = params.get("tenant_group", None)
-    user_id = params.get("user", None)
-    cost_type_id = params.get("cost_type", None)
-    range_date = params.get("range_date", None)
+
+def export_report(request, *, export_format: str):
+    """ Streams the export, or hands it to a background job when the report is large """
+
+    params = get_report_params(request.session["report_params"])
 
     (
         orders,
@@ -142,37 +170,51 @@ def report_export_csv(request, **kwargs):
         filter_condition_str,
         error_flag,
         tenant_flag,
-    ) = services.filter_billing_records(
-        tenant_id=tenant_id,
-        tenant_group_id=tenant_group_id,
-        user_id=user_id,
-        cost_type_id=cost_type_id,
-        range_date=range_date,
-    )
+    ), cache_hit = services.get_cached_billing_records_report(**params)
+    common_middleware.record_cache_event(request, name="report", hit=cache_hit)
 
-    frames = orders_models.BillingRecord.frames.filter(order__in=orders)
+    if services.exceeds_background_export_rows(summary=summary):
+        services.request_report_export(
+            user=request.user, export_format=export_format, params=params
+        )
+        add_message(
+            request,
+            messages.SUCCESS,
+            f"{summary['count']} records will be exported as {export_format.upper()} "
+            f"in the background; download the file below once it is ready",
+        )
+        return HttpResponseRedirect(reverse("apps.reports:reports_exports"))
 
-    dataframe = services.generate_billing_records_dataframe(
-        records=frames,
+    response = services.generate_billing_records_export(
+        export_format=export_format,
+        records=orders_models.BillingRecord.objects.filter(order__in=orders),
         filter_condition_str=filter_condition_str,
         tenant_flag=tenant_flag,
     )
-    response = services.generate_billing_records_csv_from_dataframe(
-        dataframe=dataframe, tenant_flag=tenant_flag
-    )
 
     return response
 
 
+@login_required
+def report_export_csv(request, **kwargs):
+    return export_report(request, export_format="csv")
+
+
 @login_required
 def report_export_xlsx(request, **kwargs):
-    params = request.session["report_params"]
+    return export_report(request, export_format="xlsx")
 
-    tenant_id = params.get("tenant", None)
-    tenant_group_id = params.get("tenant_group", None)
-    user_id = params.get("user", None)
-    cost_type_id = params.get("cost_type", None)
-    range_date = params.get("range_date", None)
+
+@login_required
+def report_export_parquet(request, **kwargs):
+    return export_report(request, export_format="parquet")
+
+
+@login_required
+def report_export_pdfs(request, **kwargs):
+    """ Streams a ZIP of invoice PDFs; progress at reports_export_pdfs_progress with X-Export-Id """
+
+    params = get_report_params(request.session["report_params"])
 
     (
         orders,
@@ -181,23 +223,89 @@ def report_export_xlsx(request, **kwargs):
         filter_condition_str,
         error_flag,
         tenant_flag,
-    ) = services.filter_billing_records(
-        tenant_id=tenant_id,
-        tenant_group_id=tenant_group_id,
-        user_id=user_id,
-        cost_type_id=cost_type_id,
-        range_date=range_date,
+    ), cache_hit = services.get_cached_billing_records_report(**params)
+    common_middleware.record_cache_event(request, name="report", hit=cache_hit)
+
+    # client may pass its own id to poll progress before the response starts
+    try:
+        export_id = str(uuid.UUID(request.GET.get("export_id", "")))
+    except ValueError:
+        export_id = str(uuid.uuid4())
+
+    response = StreamingHttpResponse(
+        services.generate_orders_pdfs_zip(
+            orders=orders,
+            base_url=request.build_absolute_uri("/"),
+            export_id=export_id,
+        ),
+        content_type="application/zip",
     )
+    response["Content-Disposition"] = 'attachment; filename="invoices.zip"'
+    response["X-Export-Id"] = export_id
 
-    frames = orders_models.BillingRecord.frames.filter(order__in=orders)
+    return response
 
-    dataframe = services.generate_billing_records_dataframe(
-        records=frames,
-        filter_condition_str=filter_condition_str,
-        tenant_flag=tenant_flag,
+
+@login_required
+def report_export_pdfs_progress(request, **kwargs):
+    progress = services.get_export_progress(export_id=str(kwargs["export_id"]))
+    if progress is None:
+        return JsonResponse({"finished": None}, status=404)
+    return JsonResponse(progress)
+
+
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+# BACKGROUND EXPORTS
+# –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+
+
+def get_report_exports(request) -> QuerySet:
+    report_exports = models.ReportExport.objects.all()
+    if not request.user.is_superuser:
+        report_exports = report_exports.filter(requested_by=request.user)
+    return report_exports
+
+
+@login_required
+def report_exports(request, **kwargs):
+    template_name = "report_exports.html"
+
+    report_exports = list(get_report_exports(request)[:50])
+    in_progress = any(
+        report_export.status in ["PENDING", "RUNNING"]
+        for report_export in report_exports
     )
-    response = services.generate_billing_records_xlsx_from_dataframe(
-        dataframe=dataframe, tenant_flag=tenant_flag
+
+    return render(
+        request,
+        template_name,
+        {"report_exports": report_exports, "in_progress": in_progress},
     )
 
-    return response
+
+@login_required
+def report_export_status(request, **kwargs):
+    report_export = get_object_or_404(get_report_exports(request), id=kwargs["pk"])
+    status = services.get_report_export_status(report_export=report_export)
+    status["download_url"] = reverse(
+        "apps.reports:reports_export_download", kwargs={"pk": report_export.id}
+    )
+    return JsonResponse(status)
+
+
+@login_required
+def report_export_download(request, **kwargs):
+    report_export = get_object_or_404(get_report_exports(request), id=kwargs["pk"])
+    if report_export.status != "DONE":
+        return JsonResponse(
+            services.get_report_export_status(report_export=report_export), status=409
+        )
+    if report_export.expires_at < timezone.now():
+        return HttpResponse("This export has expired", status=410)
+
+    return FileResponse(
+        report_export.file.open("rb"),
+        as_attachment=True,
+        filename=report_export.filename,
+        content_type=services.REPORT_EXPORT_CONTENT_TYPES[report_export.export_format],
+    )
@@ -0,0 +1,7 @@
+# celery is only required when JOB_BACKEND = "celery"
+try:
+    from config.celery import app as celery_app
+except ImportError:
+    celery_app = None
+
+__all__ = ("celery_app",)
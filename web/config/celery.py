@@ -0,0 +1,11 @@
+""" Celery app for JOB_BACKEND = "celery"; worker: celery -A config worker """
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+app = Celery("config")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
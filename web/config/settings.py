@@ -64,6 +64,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "apps.common.middleware.QueryInstrumentationMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -109,6 +110,20 @@ DATABASES = {
     }
 }
 
+if os.getenv("DATABASE") == "postgres":
+    DATABASES["default"] = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.getenv("SQL_DATABASE", "postgres"),
+        "USER": os.getenv("SQL_USER", "postgres"),
+        "PASSWORD": os.getenv("SQL_PASSWORD", ""),
+        "HOST": os.getenv("SQL_HOST", "localhost"),
+        "PORT": os.getenv("SQL_PORT", "5432"),
+    }
+
+# no CACHES, so Django's per-process locmem cache is used; the report cache
+# (REPORTS_CACHE_*) stays off until CACHES names a backend shared by every process,
+# e.g. memcached or django-redis
+
 
 # –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
 # AUTH
@@ -191,3 +206,58 @@ MESSAGE_TAGS = {
 # –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
 # PACKAGE / APP-SPECIFIC SETTINGS
 # –––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––
+
+# ––– QUERY INSTRUMENTATION (apps.common.middleware)
+QUERY_INSTRUMENTATION_ENABLED = (
+    os.getenv("QUERY_INSTRUMENTATION_ENABLED", "False").lower() == "true"
+)
+QUERY_INSTRUMENTATION_BUFFER_SIZE = int(
+    os.getenv("QUERY_INSTRUMENTATION_BUFFER_SIZE", 1000)
+)
+QUERY_BUDGET_ACTION = os.getenv("QUERY_BUDGET_ACTION", "log")  # log | raise
+QUERY_BUDGETS = {
+    "apps.orders:order_detail": 60,
+    "apps.orders:order_filter": 20,
+    "apps.reports:reports_results": 20,
+    "apps.api:select_tenants": 5,
+    "apps.api:select_tenant_groups": 5,
+    "apps.api:select_users": 5,
+    "apps.api:select_costtypes": 5,
+}
+
+# ––– BACKGROUND JOBS (apps.common.jobs)
+JOB_BACKEND = os.getenv("JOB_BACKEND", "thread")  # thread | sync | celery
+JOB_THREAD_WORKERS = int(os.getenv("JOB_THREAD_WORKERS", 2))
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://cache:6379/0")
+CELERY_TASK_IGNORE_RESULT = True
+
+# ––– ORDER PDFS (apps.orders.services)
+ORDER_PDF_JOB_TIMEOUT = int(os.getenv("ORDER_PDF_JOB_TIMEOUT", 600))  # seconds
+ORDER_PDF_PROCESSES = int(os.getenv("ORDER_PDF_PROCESSES", 2))  # 0 renders in-process
+ORDER_PDF_STYLESHEETS = [  # parsed once per process; static paths or absolute URLs
+    "https://fonts.googleapis.com/icon?family=Material+Icons",
+    "https://fonts.googleapis.com/css2?family=Inter:wght@400;700&display=swap",
+    "https://fonts.googleapis.com/css2?family=Merriweather:ital,wght@0,400;0,700;1,400;1,700&display=swap",
+    "css/tailwind-output.css",
+    "css/styles.css",
+]
+ORDER_PDF_LOCAL_ASSETS = True  # STATIC_URL/MEDIA_URL assets read from disk, not HTTP
+ORDER_PDF_ASSET_CACHE_SIZE = 128  # fetched assets kept per process
+
+# ––– DATE RANGES (apps.common.filters)
+FISCAL_YEAR_START_MONTH = 7  # fiscal years run July through June
+
+# ––– ORDER LIST (apps.orders.services)
+ORDERS_LIST_COUNT_CACHE_TIMEOUT = 60  # seconds a filtered order count is reused
+ORDERS_SEARCH_LIMIT = 500  # best-ranked orders kept per search
+
+# ––– REPORTS (apps.reports.services)
+REPORTS_USE_BILLING_ROLLUP = True  # summaries from BillingRollup, unless by cost type
+REPORTS_CACHE_TIMEOUT = 15 * 60  # seconds
+REPORTS_CACHE_LOCMEM = False  # True caches in locmem, for single-process servers only
+REPORTS_CACHE_MAX_IDS = 20000  # larger results are not cached
+REPORTS_RESULTS_PAGE_SIZE = 100  # rows per page of report results
+REPORTS_PTAEO_SUMMARY_LIMIT = 10  # largest projects and awards in university summaries
+REPORTS_DATAFRAME_VERBOSE = False  # True builds frames with django_pandas verbose mode
+REPORTS_BACKGROUND_EXPORT_ROWS = 20000  # larger exports run as background jobs
+REPORTS_EXPORT_EXPIRY = 24 * 60 * 60  # seconds background export files are kept